@@ -0,0 +1,256 @@
+"""
+Benchmarks every routine against a synthetic subreddit
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+
+Run from the src directory:  python -m benchmarks.bench_routines --posts 500 --comments 8
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Dict, Tuple
+
+from helpers import config_helper
+from helpers.reddit_helper import RedditHelper
+from helpers.sqlite_helper import SQLiteDatabaseHelper
+from routines.check_comments import check_comments
+from routines.check_contested import check_contested
+from routines.check_messages import check_messages
+from routines.check_new import check_new
+from routines.check_unsolved import check_unsolved
+from routines.dispatch_notifications import dispatch_notifications
+from routines.archive_old_posts import archive_old_posts
+
+from .fake_database import InMemoryDatabase
+from .fake_reddit import FakeReddit, FakeRedditor, generate_subreddit
+
+SUBREDDIT = "WhatsTheWord"
+
+CONFIG = config_helper.from_dict({
+    "subreddit": SUBREDDIT,
+    "flairs": {status: {"text": status.capitalize(), "id": f"{status}-template"}
+               for status in ('unsolved', 'contested', 'solved', 'unknown', 'abandoned')},
+    "notifications": {"max_workers": 4, "batch_size": 100, "max_attempts": 5, "retry_delay": 60},
+    "solved_crawl": {"more_limit": 32, "max_depth": 4},
+    "mods_refresh_interval": 900,
+    "config_check_interval": 0,
+    # only read by the bot's main script
+    "scheduler": {"max_concurrent": 0, "intervals": {routine: 60 for routine in config_helper.ROUTINES}},
+    "rate_limit": {"reserves": {}, "priorities": {routine: "normal" for routine in config_helper.ROUTINES}},
+    "database": {"backend": "sqlite", "path": "", "pool_size": 1, "retries": 0},
+    "post_cache": {"size": 10000, "ttl": 300},
+    "metrics": {"host": "127.0.0.1", "port": 0},
+    "workers": {"lease_ttl": 30},
+    # every saved post is old enough for the aging sweeps
+    "unsolved_to_abandoned": 0,
+    "contested_to_unknown": 0,
+    "aging": {"retry_delay": 300},
+    # every terminal post is old enough to be archived
+    "retention": {"days": 0, "batch_size": 500},
+    "snapshot": {"path": "", "interval": 60},
+    "user_flairs": {"text": ":karma: Points: {}", "bounds": [5, 10, 25, 50, 100],
+                    **{tier: f"tier-{tier}" for tier in range(6)}},
+    "constants": {
+        "sub_comment": "[Click this link](https://reddit.com/message/compose?to={}&subject=subscribe&message={})",
+        "solved_message": "The {} post you subscribed to, [{}]({}), was just solved.",
+        "footer": "\n\n---\n\n*This is an automated message. Feedback? Message u/{}*",
+    },
+})
+
+
+class CountingSQLiteDatabase(SQLiteDatabaseHelper):
+    """SQLite backend which counts the statements it executes, as it has no round trips to count"""
+
+    def __init__(self, *args, **kwargs):
+        self.round_trips = 0
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        cnx = super()._open()
+        cnx.set_trace_callback(self._count)
+        return cnx
+
+    def _count(self, statement: str) -> None:
+        self.round_trips += 1
+
+
+class Scenario:
+    """A fake Reddit and a DB set up for one routine to have work to do"""
+
+    def __init__(self, args: argparse.Namespace, old: bool):
+        self.reddit = FakeReddit()
+        if args.database == 'sqlite':
+            self.db = CountingSQLiteDatabase(os.path.join(args.tmp_dir, f"bench-{time.perf_counter_ns()}.db"),
+                                             cache_size=10000)
+        else:
+            self.db = InMemoryDatabase()
+        self.reddit.subreddit(SUBREDDIT).moderators = [FakeRedditor(self.reddit, "a_mod")]
+
+        # items processed before the benchmark starts, which the streams stop at
+        anchor = self.reddit.add_submission(SUBREDDIT, "a_mod")
+        self.anchors = {
+            'new': anchor.fullname,
+            'comments': self.reddit.add_comment(anchor, FakeRedditor(self.reddit, "a_mod"), "Pinned").fullname,
+            'messages': self.reddit.add_message("a_mod", "hello", "Keep it up!").fullname,
+        }
+        self.reddit.inbox.mark_read(self.reddit.messages)
+        self.db.save_post(anchor.id, 'overridden', SUBREDDIT)
+
+        # the aging sweeps look at posts which have been around for a while
+        created_utc = time.time() - 3 * 86400 if old else None
+        self.submissions = generate_subreddit(self.reddit, SUBREDDIT, args.posts, args.comments,
+                                              solved_ratio=args.solved_ratio, created_utc=created_utc, seed=args.seed)
+
+        self.rh = RedditHelper(db=self.db, config=config_helper.ConfigStore(CONFIG), reddit=self.reddit)
+        self.rh.identity.refresh()
+        self.rh.workers.renew()
+
+    def save_posts(self, status: str) -> None:
+        with self.db.batch():
+            for submission in self.submissions:
+                self.db.save_post(submission.id, status, SUBREDDIT)
+
+    def start_stream(self, stream: str) -> None:
+        self.db.set_stream_position(stream, self.anchors[stream])
+
+
+def _setup_check_new(scenario: Scenario, args) -> int:
+    scenario.start_stream('new')
+    return len(scenario.submissions)
+
+
+def _setup_check_comments(scenario: Scenario, args) -> int:
+    scenario.save_posts('unsolved')
+    scenario.start_stream('comments')
+    return len(scenario.reddit.comments_in(SUBREDDIT)) - 1
+
+
+def _setup_check_messages(scenario: Scenario, args) -> int:
+    for number in range(args.messages):
+        submission = scenario.submissions[number % len(scenario.submissions)]
+        scenario.reddit.add_message(f"subscriber{number}", "subscribe", submission.id)
+    return args.messages
+
+
+def _setup_aging(status: str) -> Callable[[Scenario, argparse.Namespace], int]:
+    def setup(scenario: Scenario, args) -> int:
+        scenario.save_posts(status)
+        return len(scenario.submissions)
+    return setup
+
+
+def _setup_dispatch_notifications(scenario: Scenario, args) -> int:
+    with scenario.db.batch():
+        for number in range(args.messages):
+            scenario.db.add_subscriber(scenario.submissions[number % len(scenario.submissions)].id,
+                                       f"subscriber{number}")
+    for submission in scenario.submissions[:args.messages]:
+        scenario.db.queue_notifications(submission.id, "Solved!")
+    return min(args.messages, CONFIG.notifications.batch_size)
+
+
+def _setup_archive_old_posts(scenario: Scenario, args) -> int:
+    scenario.save_posts('solved')
+    with scenario.db.batch():
+        for number in range(args.messages):
+            scenario.db.add_subscriber(scenario.submissions[number % len(scenario.submissions)].id,
+                                       f"subscriber{number}")
+    return len(scenario.submissions)
+
+
+ROUTINES: Dict[str, Tuple[Callable, Callable]] = {
+    'check_new': (check_new, _setup_check_new),
+    'check_comments': (check_comments, _setup_check_comments),
+    'check_messages': (check_messages, _setup_check_messages),
+    'check_unsolved': (check_unsolved, _setup_aging('unsolved')),
+    'check_contested': (check_contested, _setup_aging('contested')),
+    'dispatch_notifications': (dispatch_notifications, _setup_dispatch_notifications),
+    'archive_old_posts': (archive_old_posts, _setup_archive_old_posts),
+}
+
+
+def run(name: str, args: argparse.Namespace) -> dict:
+    """Runs a routine ``args.repeat`` times, each time on a fresh scenario, and returns its median cost"""
+    routine, setup = ROUTINES[name]
+    runs = []
+
+    for _ in range(args.repeat):
+        # only the aging sweeps need posts old enough to be picked up
+        scenario = Scenario(args, old=name in ('check_unsolved', 'check_contested'))
+        items = setup(scenario, args)
+        scenario.reddit.calls.clear()
+        scenario.db.round_trips = 0
+
+        start = time.perf_counter()
+        routine(scenario.reddit, scenario.db, scenario.rh, CONFIG)
+        elapsed = time.perf_counter() - start
+
+        runs.append((elapsed, sum(scenario.reddit.calls.values()), scenario.db.round_trips, items,
+                     scenario.reddit.calls))
+
+    elapsed, api_calls, round_trips, items, calls = sorted(runs, key=lambda r: r[0])[len(runs) // 2]
+    return {
+        'routine': name,
+        'items': items,
+        'wall_ms': elapsed * 1000,
+        'api_calls': api_calls,
+        'db_round_trips': round_trips,
+        'endpoints': ', '.join(f"{endpoint}={count}" for endpoint, count in calls.most_common()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the bot's routines against a synthetic subreddit.")
+    parser.add_argument('routines', nargs='*', metavar='routine',
+                        help=f"routines to benchmark (all by default): {', '.join(ROUTINES)}")
+    parser.add_argument('--posts', type=int, default=200, help="submissions in the subreddit")
+    parser.add_argument('--comments', type=int, default=6, help="comments under every submission")
+    parser.add_argument('--messages', type=int, default=100, help="subscription messages / queued notifications")
+    parser.add_argument('--solved-ratio', type=float, default=0.3, help="share of threads where OP says !solved")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per routine; the median is reported")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--endpoints', action='store_true', help="break API calls down by endpoint")
+    parser.add_argument('--database', choices=('memory', 'sqlite'), default='memory',
+                        help="the in-memory stand-in, which counts round trips, or the SQLite backend, which counts "
+                             "statements")
+    args = parser.parse_args()
+
+    if unknown := [name for name in args.routines if name not in ROUTINES]:
+        parser.error(f"unknown routines: {', '.join(unknown)}")
+
+    # the routines log every post they touch
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as args.tmp_dir:
+        print(f"{'routine':<24}{'items':>8}{'wall ms':>12}{'API calls':>12}{'DB trips':>12}")
+        for name in args.routines or ROUTINES:
+            result = run(name, args)
+
+            print(f"{result['routine']:<24}{result['items']:>8}{result['wall_ms']:>12.1f}{result['api_calls']:>12}"
+                  f"{result['db_round_trips']:>12}")
+            if args.endpoints:
+                print(f"{'':<24}{result['endpoints']}")
+
+
+if __name__ == '__main__':
+    main()
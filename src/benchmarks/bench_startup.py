@@ -0,0 +1,151 @@
+"""
+Benchmarks how long the bot takes to start, cold and from a warm-start snapshot
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+
+Run from the src directory:  python -m benchmarks.bench_startup --posts 2000
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from helpers import config_helper
+from helpers.reddit_helper import RedditHelper
+from helpers.snapshot_helper import WarmStartSnapshot
+from routines.check_comments import check_comments
+
+from .bench_routines import CONFIG, SUBREDDIT, CountingSQLiteDatabase
+from .fake_reddit import FakeReddit, FakeRedditor, generate_subreddit
+
+# everything the bot's main script imports before it starts doing anything
+MODULES = ('praw', 'dotenv', 'yaml', 'helpers.config_helper', 'helpers.database_helper', 'helpers.metrics_helper',
+           'helpers.migration_helper', 'helpers.ratelimit_helper', 'helpers.reddit_helper', 'helpers.scheduler_helper',
+           'helpers.snapshot_helper', 'routines.check_new', 'routines.check_comments', 'routines.check_contested',
+           'routines.check_unsolved', 'routines.check_messages', 'routines.dispatch_notifications',
+           'routines.archive_old_posts')
+
+
+def import_time(repeat: int) -> float:
+    """Returns the median time (in ms) a fresh interpreter takes to import the bot's modules"""
+    script = ("import time; started = time.perf_counter(); "
+              + '; '.join(f"import {module}" for module in MODULES)
+              + "; print(time.perf_counter() - started)")
+    runs = [float(subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout)
+            for _ in range(repeat)]
+    return statistics.median(runs) * 1000
+
+
+def build_world(args: argparse.Namespace, path: str) -> FakeReddit:
+    """Sets up a subreddit whose posts are all saved in a new database at ``path``, with the streams started"""
+    reddit = FakeReddit()
+    reddit.subreddit(SUBREDDIT).moderators = [FakeRedditor(reddit, "a_mod")]
+    anchor = reddit.add_submission(SUBREDDIT, "a_mod")
+    anchor_comment = reddit.add_comment(anchor, FakeRedditor(reddit, "a_mod"), "Pinned")
+    submissions = generate_subreddit(reddit, SUBREDDIT, args.posts, args.comments, seed=args.seed)
+
+    db = CountingSQLiteDatabase(path, cache_size=10000)
+    with db.batch():
+        db.save_post(anchor.id, 'overridden', SUBREDDIT)
+        for number, submission in enumerate(submissions):
+            # some posts are done, so only part of them is preloaded on a cold start
+            db.save_post(submission.id, 'solved' if number % 2 else 'unsolved', SUBREDDIT)
+        db.set_stream_position('comments', anchor_comment.fullname)
+
+    return reddit
+
+
+def boot(reddit: FakeReddit, path: str, snapshot_path: str) -> tuple:
+    """Starts the bot the way its main script does and runs one pass of check_comments. Returns the DB, the snapshot,
+    the time it took to start and the time the pass took"""
+    started = time.perf_counter()
+
+    db = CountingSQLiteDatabase(path, cache_size=10000)
+    db.preload_posts()
+    rh = RedditHelper(db=db, config=config_helper.ConfigStore(CONFIG), reddit=reddit)
+
+    snapshot = WarmStartSnapshot(snapshot_path, db, rh, interval=60)
+    snapshot.load()
+    if rh.identity.stale:
+        rh.identity.refresh()
+    rh.workers.renew()
+    rh.deadlines.sync(db)
+    booted = time.perf_counter()
+
+    check_comments(reddit, db, rh, CONFIG)
+
+    return db, snapshot, booted - started, time.perf_counter() - booted
+
+
+def run(args: argparse.Namespace, warm: bool) -> dict:
+    """Boots ``args.repeat`` times on fresh databases and returns the median cost"""
+    runs = []
+
+    for number in range(args.repeat):
+        snapshot_path = ''
+        if warm:
+            # a previous run which saved its snapshot on shutdown
+            snapshot_path = os.path.join(args.tmp_dir, f"warm-{number}.json")
+            previous = os.path.join(args.tmp_dir, f"previous-{number}.db")
+            _, snapshot, _, _ = boot(build_world(args, previous), previous, snapshot_path)
+            snapshot.stop()
+
+        path = os.path.join(args.tmp_dir, f"{'warm' if warm else 'cold'}-{number}.db")
+        reddit = build_world(args, path)
+        # the database counts from the moment it's opened, so its own setup counts too
+        reddit.calls.clear()
+
+        db, _, boot_time, pass_time = boot(reddit, path, snapshot_path)
+        runs.append((boot_time + pass_time, boot_time, pass_time, sum(reddit.calls.values()), db.round_trips))
+
+    _, boot_time, pass_time, api_calls, round_trips = sorted(runs)[len(runs) // 2]
+    return {'start': 'warm' if warm else 'cold', 'boot_ms': boot_time * 1000, 'pass_ms': pass_time * 1000,
+            'api_calls': api_calls, 'db_round_trips': round_trips}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks starting the bot, cold and from a snapshot.")
+    parser.add_argument('--posts', type=int, default=1000, help="saved submissions")
+    parser.add_argument('--comments', type=int, default=2, help="comments under every submission")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per measurement; the median is reported")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # the routines log every post they touch
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"importing the bot's modules: {import_time(args.repeat):.1f} ms")
+
+    with tempfile.TemporaryDirectory() as args.tmp_dir:
+        print(f"{'start':<8}{'boot ms':>12}{'pass ms':>12}{'API calls':>12}{'DB trips':>12}")
+        for warm in (False, True):
+            result = run(args, warm)
+            print(f"{result['start']:<8}{result['boot_ms']:>12.1f}{result['pass_ms']:>12.1f}{result['api_calls']:>12}"
+                  f"{result['db_round_trips']:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+"""
+In-memory stand-in for the DatabaseHelper
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from contextlib import contextmanager
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class InMemoryDatabase:
+    """
+    Keeps everything the ``DatabaseHelper`` stores in dicts and counts the round trips the real helper would make to
+    MySQL. Like the real one, it caches post statuses and queues writes made inside ``batch()``, which are then sent as
+    one statement per kind of write once something has to be read or the batch ends.
+    """
+
+    def __init__(self, cache_posts: bool = True):
+        self._cache_posts = cache_posts
+
+        # post ID -> (status, timestamp, subreddit)
+        self.posts: Dict[str, Tuple[str, float, str]] = {}
+        # post ID -> (status, timestamp, subreddit, archived at)
+        self.archived_posts: Dict[str, Tuple[str, float, str, float]] = {}
+        # (post ID, subreddit, old status, new status, timestamp)
+        self.post_history: List[Tuple[str, str, Optional[str], str, float]] = []
+        # (subreddit, username) -> points
+        self.users: Dict[Tuple[str, str], int] = {}
+        # (subreddit, username, post ID, difference, timestamp)
+        self.points_ledger: List[Tuple[str, str, Optional[str], int, float]] = []
+        self.subscribers: Set[Tuple[str, str]] = set()
+        # (post ID, username) -> [message, attempts, next attempt]
+        self.notifications: Dict[Tuple[str, str], list] = {}
+        # name -> [fullname, covered since]
+        self.streams: Dict[str, list] = {}
+        self.solved_comments: Dict[str, str] = {}
+        # name -> [holder, expires]
+        self.leases: Dict[str, list] = {}
+
+        self._cached_posts: Set[str] = set()
+        self._depth = 0
+        # kinds of writes queued in the current batch
+        self._pending: Set[str] = set()
+        # whether the current batch wrote anything, so it has to be committed
+        self._wrote = False
+        self.round_trips = 0
+
+    def _round_trip(self, count: int = 1) -> None:
+        self.round_trips += count
+
+    def _flush(self) -> None:
+        self._round_trip(len(self._pending))
+        self._pending.clear()
+
+    def _read(self) -> None:
+        self._flush()
+        self._round_trip()
+
+    def _write(self, kind: str) -> None:
+        if self._depth:
+            self._pending.add(kind)
+            self._wrote = True
+        else:
+            # the statement and the commit
+            self._round_trip(2)
+
+    def _immediate_write(self, statements: int = 1) -> None:
+        self._flush()
+        self._round_trip(statements if self._depth else statements + 1)
+        if self._depth:
+            self._wrote = True
+
+    @contextmanager
+    def batch(self):
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth and self._wrote:
+                self._flush()
+                self._round_trip()
+                self._wrote = False
+
+    # posts
+
+    def save_post(self, post_id: str, status: str, subreddit: str) -> None:
+        self._write('post')
+        self.posts[post_id] = (status, time.time(), subreddit.lower())
+        if self._cache_posts:
+            self._cached_posts.add(post_id)
+
+    def check_post(self, post_id: str) -> Optional[str]:
+        if post_id not in self._cached_posts:
+            self._read()
+            if self._cache_posts:
+                self._cached_posts.add(post_id)
+
+        entry = self.posts.get(post_id)
+        return None if entry is None else entry[0]
+
+    def add_post_history(self, post_id: str, subreddit: str, old_status: Optional[str], new_status: str) -> None:
+        self._write('history')
+        self.post_history.append((post_id, subreddit.lower(), old_status, new_status, time.time()))
+
+    def get_post_history(self, post_id: str) -> Tuple[Tuple[Optional[str], str, float], ...]:
+        self._read()
+        return tuple((old_status, new_status, timestamp)
+                     for entry_id, _, old_status, new_status, timestamp in self.post_history if entry_id == post_id)
+
+    def check_posts(self, post_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        post_ids = list(post_ids)
+        self._read()
+        if self._cache_posts:
+            self._cached_posts.update(post_ids)
+        return {post_id: self.posts[post_id][0] if post_id in self.posts else None for post_id in post_ids}
+
+    def get_post_timestamps(self, status: str, subreddit: str, since: float = 0) -> Tuple[Tuple[str, float], ...]:
+        self._read()
+        return tuple((post_id, timestamp) for post_id, (post_status, timestamp, post_subreddit) in self.posts.items()
+                     if post_status == status and post_subreddit == subreddit.lower() and timestamp >= since)
+
+    def preload_posts(self, statuses: Iterable[str] = ('unsolved', 'contested')) -> int:
+        if not self._cache_posts:
+            return 0
+
+        statuses = tuple(statuses)
+        self._read()
+        loaded = [post_id for post_id, (status, _, _) in self.posts.items() if status in statuses]
+        self._cached_posts.update(loaded)
+        return len(loaded)
+
+    def snapshot_cache(self) -> List[Tuple[str, Optional[str], float]]:
+        now = time.time()
+        return [(post_id, self.posts[post_id][0] if post_id in self.posts else None, now)
+                for post_id in self._cached_posts]
+
+    def restore_cache(self, entries: Iterable[Sequence]) -> int:
+        if not self._cache_posts:
+            return 0
+
+        restored = {post_id for post_id, _, _ in entries} - self._cached_posts
+        self._cached_posts.update(restored)
+        return len(restored)
+
+    def archive_posts(self, statuses: Sequence[str], older_than: float, limit: int) -> int:
+        self._read()
+        cutoff = time.time() - older_than
+        archived = [post_id for post_id, (status, timestamp, _) in self.posts.items()
+                    if status in statuses and timestamp <= cutoff][:limit]
+        if not archived:
+            return 0
+
+        # the copy, the deletes from posts, subscribers and solved comments, and the commit
+        self._round_trip(5)
+        for post_id in archived:
+            self.archived_posts[post_id] = self.posts.pop(post_id) + (time.time(),)
+            self.solved_comments.pop(post_id, None)
+            self._cached_posts.discard(post_id)
+        self.subscribers = {entry for entry in self.subscribers if entry[0] not in self.archived_posts}
+        return len(archived)
+
+    # subscribers and notifications
+
+    def add_subscriber(self, post_id: str, username: str) -> None:
+        self._write('subscriber')
+        self.subscribers.add((post_id, username))
+
+    def remove_all_subs(self, post_id: str) -> None:
+        self._write('remove_subs')
+        self.subscribers = {entry for entry in self.subscribers if entry[0] != post_id}
+
+    def get_subscribers(self, post_id: str) -> Optional[Tuple[str]]:
+        self._read()
+        results = tuple(username for subscribed_to, username in self.subscribers if subscribed_to == post_id)
+        return results or None
+
+    def queue_notifications(self, post_id: str, message: str) -> int:
+        self._immediate_write()
+        queued = 0
+        for subscribed_to, username in self.subscribers:
+            if subscribed_to == post_id and (post_id, username) not in self.notifications:
+                self.notifications[(post_id, username)] = [message, 0, time.time()]
+                queued += 1
+        return queued
+
+    def get_due_notifications(self, limit: int) -> Tuple[Tuple[str, str, str, int], ...]:
+        self._read()
+        now = time.time()
+        due = sorted((entry for entry in self.notifications.items() if entry[1][2] <= now), key=lambda e: e[1][2])
+        return tuple((post_id, username, message, attempts)
+                     for (post_id, username), (message, attempts, _) in due[:limit])
+
+    def remove_notification(self, post_id: str, username: str) -> None:
+        self._write('remove_notification')
+        self.notifications.pop((post_id, username), None)
+
+    def postpone_notification(self, post_id: str, username: str, delay: int) -> None:
+        self._immediate_write()
+        if (entry := self.notifications.get((post_id, username))) is not None:
+            entry[1] += 1
+            entry[2] = time.time() + delay
+
+    # points
+
+    def check_points(self, username: str, subreddit: str) -> int:
+        self._read()
+        return self.users.get((subreddit.lower(), username), 0)
+
+    def modify_points(self, username: str, subreddit: str, difference: int, post_id: Optional[str] = None) -> int:
+        # reading the old points and updating them
+        self._immediate_write(statements=2)
+        self._write('ledger')
+        key = (subreddit.lower(), username)
+        old_points = self.users.get(key, 0)
+        self.users[key] = max(old_points + difference, 0)
+        self.points_ledger.append((*key, post_id, self.users[key] - old_points, time.time()))
+        return self.users[key]
+
+    def set_points(self, username: str, subreddit: str, amount: int) -> None:
+        if amount < 0:
+            raise ValueError("Amount of points cannot be negative.")
+
+        self._immediate_write(statements=2)
+        key = (subreddit.lower(), username)
+        self.points_ledger.append((*key, None, amount - self.users.get(key, 0), time.time()))
+        self.users[key] = amount
+
+    def recalculate_points(self, username: Optional[str] = None, subreddit: Optional[str] = None) -> None:
+        self._immediate_write()
+        totals: Dict[Tuple[str, str], int] = {}
+        for entry_subreddit, name, _, difference, _ in self.points_ledger:
+            if (username is None or name == username) and (subreddit is None or entry_subreddit == subreddit.lower()):
+                totals[(entry_subreddit, name)] = totals.get((entry_subreddit, name), 0) + difference
+        self.users.update({key: max(total, 0) for key, total in totals.items()})
+
+    def get_awarded_posts(self, username: str, subreddit: str) -> Tuple[str, ...]:
+        self._read()
+        return tuple(post_id for entry_subreddit, name, post_id, _, _ in self.points_ledger
+                     if (entry_subreddit, name) == (subreddit.lower(), username) and post_id is not None)
+
+    # streams
+
+    def get_stream_position(self, stream: str) -> Optional[str]:
+        self._read()
+        return self.streams.get(stream, [None])[0]
+
+    def set_stream_position(self, stream: str, fullname: str, covered_since: Optional[int] = None) -> None:
+        if covered_since is None:
+            self._write('stream')
+            self.streams.setdefault(stream, [None, None])[0] = fullname
+        else:
+            self._write('stream_coverage')
+            self.streams[stream] = [fullname, covered_since]
+
+    def get_stream_coverage(self, stream: str) -> Optional[int]:
+        self._read()
+        return self.streams.get(stream, [None, None])[1]
+
+    def add_solved_comment(self, post_id: str, comment_id: str) -> None:
+        self._write('solved_comment')
+        self.solved_comments.setdefault(post_id, comment_id)
+
+    def has_solved_comment(self, post_id: str) -> bool:
+        self._read()
+        return post_id in self.solved_comments
+
+    # leases
+
+    def acquire_lease(self, name: str, holder: str, duration: int) -> bool:
+        self._immediate_write(statements=3)
+        now = time.time()
+        lease = self.leases.setdefault(name, [holder, now + duration])
+        if lease[0] == holder or lease[1] < now:
+            lease[:] = [holder, now + duration]
+        return lease[0] == holder
+
+    def release_lease(self, name: str, holder: str) -> None:
+        self._immediate_write()
+        if self.leases.get(name, [None])[0] == holder:
+            del self.leases[name]
+
+    def get_lease_holders(self, prefix: str) -> Tuple[str, ...]:
+        self._read()
+        now = time.time()
+        return tuple(sorted(holder for name, (holder, expires) in self.leases.items()
+                            if name.startswith(prefix) and expires >= now))
+
+    # migrations
+
+    def get_schema_version(self) -> int:
+        self._read()
+        return 0
+
+    def apply_migration(self, version: int, statements: Sequence[str]) -> None:
+        self._immediate_write(statements=len(statements) + 1)
+
+    def assign_subreddit(self, subreddit: str) -> int:
+        # everything is saved with a subreddit already
+        self._immediate_write(statements=3)
+        return 0
@@ -0,0 +1,373 @@
+"""
+In-process stand-in for the parts of PRAW the bot uses
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from collections import Counter
+import random
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Reddit lists up to 100 items per request
+PAGE_SIZE = 100
+
+
+def _base36(number: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    result = ""
+    while number:
+        number, remainder = divmod(number, 36)
+        result = digits[remainder] + result
+    return result or "0"
+
+
+class FakeRedditor:
+    def __init__(self, reddit: 'FakeReddit', name: str):
+        self._reddit = reddit
+        self.name = name
+
+    def message(self, subject: str, message: str) -> None:
+        self._reddit.call('message')
+        self._reddit.sent_messages.append((self.name, subject, message))
+
+    def __str__(self):
+        return self.name
+
+
+class _Lazy:
+    """Stands in for an object PRAW hasn't fetched yet; the first attribute access (other than the ID) costs a
+    request, like it does in PRAW"""
+
+    def __init__(self, reddit: 'FakeReddit', target, endpoint: str):
+        self.__dict__.update(_reddit=reddit, _target=target, _endpoint=endpoint, _fetched=False, id=target.id)
+
+    def __getattr__(self, attribute):
+        # a submission is fetched along with its comments, so getting to them takes just the one request
+        if not self._fetched and not (self._endpoint == 'submission' and attribute == 'comments'):
+            self._reddit.call(self._endpoint)
+        self.__dict__['_fetched'] = True
+        return getattr(self._target, attribute)
+
+
+class FakeCommentModeration:
+    def __init__(self, comment: 'FakeComment'):
+        self._comment = comment
+
+    def distinguish(self, how: str = 'yes', sticky: bool = False) -> None:
+        self._comment.reddit.call('distinguish')
+        self._comment.distinguished = how
+        self._comment.stickied = sticky
+
+    def lock(self) -> None:
+        self._comment.reddit.call('lock')
+        self._comment.locked = True
+
+
+class FakeComment:
+    def __init__(self, reddit: 'FakeReddit', comment_id: str, submission: 'FakeSubmission', author: FakeRedditor,
+                 body: str, parent_id: str, created_utc: float):
+        self.reddit = reddit
+        self.id = comment_id
+        self.fullname = f"t1_{comment_id}"
+        self._submission = submission
+        self.author = author
+        self.body = body
+        self.parent_id = parent_id
+        # listings name the submission and its author, without fetching it
+        self.link_id = submission.fullname
+        self.link_author = submission.author.name if submission.author else '[deleted]'
+        self.created_utc = created_utc
+        self.replies: List[FakeComment] = []
+        self.distinguished = None
+        self.stickied = False
+        self.locked = False
+        self.mod = FakeCommentModeration(self)
+
+    @property
+    def submission(self):
+        # comments from listings only know their submission's ID until it's fetched
+        if not isinstance(self._submission, _Lazy):
+            self._submission = _Lazy(self.reddit, self._submission, 'submission')
+        return self._submission
+
+    @property
+    def subreddit(self) -> 'FakeSubreddit':
+        return self._submission.subreddit
+
+
+class FakeCommentForest:
+    def __init__(self, comments: List[FakeComment]):
+        self._comments = comments
+
+    def replace_more(self, limit: Optional[int] = 32) -> list:
+        # synthetic threads are loaded in full, so there's never anything more to load
+        return []
+
+    def list(self) -> List[FakeComment]:
+        flattened, queue = [], list(self._comments)
+        while queue:
+            comment = queue.pop(0)
+            flattened.append(comment)
+            queue.extend(comment.replies)
+        return flattened
+
+    def __iter__(self):
+        return iter(self._comments)
+
+    def __len__(self):
+        return len(self._comments)
+
+
+class FakeSubmissionModeration:
+    def __init__(self, submission: 'FakeSubmission'):
+        self._submission = submission
+
+    def flair(self, text: str = "", flair_template_id: Optional[str] = None) -> None:
+        self._submission.reddit.call('flair')
+        self._submission.link_flair_text = text
+        self._submission.link_flair_template_id = flair_template_id
+
+
+class FakeSubmission:
+    def __init__(self, reddit: 'FakeReddit', submission_id: str, subreddit: 'FakeSubreddit', author: FakeRedditor,
+                 title: str, created_utc: float):
+        self.reddit = reddit
+        self.id = submission_id
+        self.fullname = f"t3_{submission_id}"
+        self.subreddit = subreddit
+        self.author = author
+        self.title = title
+        self.permalink = f"/r/{subreddit.display_name}/comments/{submission_id}/"
+        self.created_utc = created_utc
+        self.link_flair_text: Optional[str] = None
+        self.link_flair_template_id: Optional[str] = None
+        self.top_level_comments: List[FakeComment] = []
+        self.mod = FakeSubmissionModeration(self)
+        self._comment_forest: Optional[FakeCommentForest] = None
+
+    @property
+    def num_comments(self) -> int:
+        # listings and info lookups come with the comment count
+        return len(FakeCommentForest(self.top_level_comments).list())
+
+    @property
+    def comments(self) -> FakeCommentForest:
+        # fetching the comment tree takes a request of its own, after which PRAW keeps it
+        if self._comment_forest is None:
+            self.reddit.call('comments')
+            self._comment_forest = FakeCommentForest(self.top_level_comments)
+        return self._comment_forest
+
+    def reply(self, body: str) -> FakeComment:
+        self.reddit.call('reply')
+        return self.reddit.add_comment(self, FakeRedditor(self.reddit, self.reddit.user.name), body)
+
+
+class FakeSubredditFlair:
+    def __init__(self, subreddit: 'FakeSubreddit'):
+        self._subreddit = subreddit
+
+    def set(self, redditor: str, text: str = "", flair_template_id: Optional[str] = None, **_) -> None:
+        self._subreddit.reddit.call('user_flair')
+        self._subreddit.user_flairs[str(redditor)] = (text, flair_template_id)
+
+
+class FakeSubreddit:
+    def __init__(self, reddit: 'FakeReddit', display_name: str):
+        self.reddit = reddit
+        self.display_name = display_name
+        self.moderators: List[FakeRedditor] = []
+        self.user_flairs: Dict[str, tuple] = {}
+        self.flair = FakeSubredditFlair(self)
+
+    def moderator(self) -> List[FakeRedditor]:
+        self.reddit.call('moderators')
+        return list(self.moderators)
+
+    def new(self, limit: Optional[int] = 100) -> Iterator[FakeSubmission]:
+        return self.reddit.listing('new', self.reddit.submissions_in(self.display_name), limit)
+
+    def comments(self, limit: Optional[int] = 100) -> Iterator[FakeComment]:
+        return self.reddit.listing('comments', self.reddit.comments_in(self.display_name), limit)
+
+
+class FakeMessage:
+    def __init__(self, message_id: str, author: FakeRedditor, subject: str, body: str, created_utc: float):
+        self.id = message_id
+        self.fullname = f"t4_{message_id}"
+        self.author = author
+        self.subject = subject
+        self.body = body
+        self.created_utc = created_utc
+        # whether the message is unread
+        self.new = True
+
+
+class FakeInbox:
+    def __init__(self, reddit: 'FakeReddit'):
+        self._reddit = reddit
+
+    def messages(self, limit: Optional[int] = 100) -> Iterator[FakeMessage]:
+        return self._reddit.listing('messages', list(self._reddit.messages), limit)
+
+    def unread(self, limit: Optional[int] = 100) -> Iterator[FakeMessage]:
+        return self._reddit.listing('unread', [message for message in self._reddit.messages if message.new], limit)
+
+    def mark_read(self, items: List[FakeMessage]) -> None:
+        # Reddit takes 25 items per request
+        for index, item in enumerate(items):
+            if index % 25 == 0:
+                self._reddit.call('read_message')
+            item.new = False
+
+
+class FakeUser:
+    def __init__(self, reddit: 'FakeReddit', name: str):
+        self._reddit = reddit
+        self.name = name
+
+    def me(self) -> FakeRedditor:
+        self._reddit.call('me')
+        return FakeRedditor(self._reddit, self.name)
+
+
+class FakeReddit:
+    """
+    Fake ``praw.Reddit`` holding a synthetic subreddit. Every call that would make a request to Reddit is counted in
+    ``calls`` by its endpoint.
+    """
+
+    def __init__(self, bot_name: str = "WhatsTheWordBot"):
+        self.calls = Counter()
+        self.read_only = False
+        self._next_id = 36 ** 5  # keeps IDs at 6 characters, like the real ones
+        self._subreddits: Dict[str, FakeSubreddit] = {}
+        self._submissions: Dict[str, FakeSubmission] = {}
+        self._comments: Dict[str, FakeComment] = {}
+        self.messages: List[FakeMessage] = []  # newest first
+        self.sent_messages: List[tuple] = []
+        self.inbox = FakeInbox(self)
+        self.user = FakeUser(self, bot_name)
+
+    def call(self, endpoint: str) -> None:
+        self.calls[endpoint] += 1
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return _base36(self._next_id)
+
+    def listing(self, endpoint: str, items: List, limit: Optional[int]) -> Iterator:
+        """Yields items newest first, counting a request for every page we get to"""
+        for index, item in enumerate(items if limit is None else items[:limit]):
+            if index % PAGE_SIZE == 0:
+                self.call(endpoint)
+            yield item
+
+    def submissions_in(self, subreddit: str) -> List[FakeSubmission]:
+        """Submissions in a subreddit, or in any of the subreddits of a multireddit like ``a+b``, newest first"""
+        names = set(subreddit.lower().split('+'))
+        return [submission for submission in reversed(list(self._submissions.values()))
+                if submission.subreddit.display_name.lower() in names]
+
+    def comments_in(self, subreddit: str) -> List[FakeComment]:
+        """Comments in a subreddit, or in any of the subreddits of a multireddit like ``a+b``, newest first"""
+        names = set(subreddit.lower().split('+'))
+        return [comment for comment in reversed(list(self._comments.values()))
+                if comment._submission.subreddit.display_name.lower() in names]
+
+    # PRAW's entry points
+
+    def subreddit(self, name: str) -> FakeSubreddit:
+        if name not in self._subreddits:
+            self._subreddits[name] = FakeSubreddit(self, name)
+        return self._subreddits[name]
+
+    def submission(self, id: str = None) -> _Lazy:
+        return _Lazy(self, self._submissions[id], 'submission')
+
+    def comment(self, id: str = None) -> _Lazy:
+        return _Lazy(self, self._comments[id], 'comment')
+
+    def redditor(self, name: str) -> FakeRedditor:
+        return FakeRedditor(self, name)
+
+    def info(self, fullnames: Iterable[str] = None) -> Iterator[FakeSubmission]:
+        fullnames = list(fullnames)
+        for index, fullname in enumerate(fullnames):
+            if index % PAGE_SIZE == 0:
+                self.call('info')
+            if (submission := self._submissions.get(fullname.split('_', 1)[1])) is not None:
+                yield submission
+
+    # building the synthetic subreddit
+
+    def add_submission(self, subreddit: str, author: str, title: str = "What's the word?",
+                       created_utc: Optional[float] = None) -> FakeSubmission:
+        submission = FakeSubmission(self, self._new_id(), self.subreddit(subreddit), FakeRedditor(self, author), title,
+                                    time.time() if created_utc is None else created_utc)
+        self._submissions[submission.id] = submission
+        return submission
+
+    def add_comment(self, submission: FakeSubmission, author: FakeRedditor, body: str,
+                    parent: Optional[FakeComment] = None, created_utc: Optional[float] = None) -> FakeComment:
+        comment = FakeComment(self, self._new_id(), submission, author, body,
+                              parent.fullname if parent else submission.fullname,
+                              time.time() if created_utc is None else created_utc)
+        (parent.replies if parent else submission.top_level_comments).append(comment)
+        self._comments[comment.id] = comment
+        return comment
+
+    def add_message(self, author: str, subject: str, body: str) -> FakeMessage:
+        message = FakeMessage(self._new_id(), FakeRedditor(self, author), subject, body, time.time())
+        self.messages.insert(0, message)
+        return message
+
+
+def generate_subreddit(reddit: FakeReddit, subreddit: str, posts: int, comments_per_post: int,
+                       solved_ratio: float = 0.3, reply_depth: int = 3, created_utc: Optional[float] = None,
+                       seed: int = 0) -> List[FakeSubmission]:
+    """
+    Fills the fake Reddit with submissions, each with a thread of comments. In ``solved_ratio`` of the threads, OP
+    replies with "!solved" at the bottom of the thread.
+
+    :param reply_depth: How deep the reply chains in each thread go
+    """
+    rng = random.Random(seed)
+    submissions = []
+
+    for number in range(posts):
+        op = f"asker{number}"
+        submission = reddit.add_submission(subreddit, op, created_utc=created_utc)
+        submissions.append(submission)
+
+        parent = None
+        for index in range(comments_per_post):
+            # starting a new reply chain every ``reply_depth`` comments
+            if index % reply_depth == 0:
+                parent = None
+            parent = reddit.add_comment(submission, FakeRedditor(reddit, f"helper{rng.randrange(posts * 2)}"),
+                                        "Could it be *serendipity*?", parent=parent, created_utc=created_utc)
+
+        if rng.random() < solved_ratio:
+            reddit.add_comment(submission, FakeRedditor(reddit, op), "That's it, thanks! !solved", parent=parent,
+                               created_utc=created_utc)
+
+    return submissions
@@ -0,0 +1,53 @@
+#  Copyright 2026 Xeoth
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  ---
+#
+#  Last modified by Xeoth on 18.10.2026
+#                   ^--------^ please change when modifying to comply with the license
+
+# Run the tests from the src directory with `python -m pytest`. This file being here puts src on the import path, so
+# the tests import the helpers the same way the bot does
+
+import pytest
+
+from helpers import config_helper
+from helpers.reddit_helper import RedditHelper
+from helpers.sqlite_helper import SQLiteDatabaseHelper
+
+from benchmarks.bench_routines import CONFIG, SUBREDDIT
+from benchmarks.fake_reddit import FakeReddit, FakeRedditor
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A database helper on a new SQLite database"""
+    return SQLiteDatabaseHelper(str(tmp_path / 'bot.db'), retries=0)
+
+
+@pytest.fixture
+def reddit():
+    """A fake Reddit with the benchmarks' subreddit, which a_mod moderates"""
+    reddit = FakeReddit()
+    reddit.subreddit(SUBREDDIT).moderators = [FakeRedditor(reddit, "a_mod")]
+    return reddit
+
+
+@pytest.fixture
+def rh(db, reddit):
+    """A RedditHelper set up like the bot's on startup. It's the only process, so it owns every post"""
+    rh = RedditHelper(db=db, config=config_helper.ConfigStore(CONFIG), reddit=reddit)
+    rh.identity.refresh()
+    rh.workers.renew()
+    return rh
@@ -0,0 +1,492 @@
+"""
+Helpers for reading the bot's config
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from bisect import bisect_right
+from copy import deepcopy
+from functools import wraps
+import logging
+import os
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Optional, Tuple, Union, get_args, get_origin
+
+import yaml
+
+from .ratelimit_helper import Priority
+
+logger = logging.getLogger(__name__)
+
+# statuses which posts leave on their own after a while -> setting with how long (in seconds) that takes
+AGING_SETTINGS = {'unsolved': 'unsolved_to_abandoned', 'contested': 'contested_to_unknown'}
+# statuses the bot flairs posts with
+FLAIR_STATUSES = ('unsolved', 'contested', 'solved', 'unknown', 'abandoned')
+
+# routines the bot schedules, each of which needs an interval and a priority
+ROUTINES = ('check_new', 'check_comments', 'check_messages', 'check_unsolved', 'check_contested',
+            'dispatch_notifications', 'archive_old_posts')
+# priorities requests can have, as they're written in the config
+PRIORITIES = tuple(priority.name.lower() for priority in Priority)
+# storage backends the bot can use
+BACKENDS = ('mysql', 'sqlite')
+
+# sections which are only read on startup, so changing them takes a restart
+_RESTART_ONLY = ('scheduler', 'rate_limit', 'database', 'post_cache', 'workers', 'metrics', 'snapshot',
+                 'mods_refresh_interval')
+
+
+class ConfigError(ValueError):
+    """Raised when the config is missing a setting, or has one of the wrong type or with a value the bot doesn't know"""
+
+
+class _Section:
+    """
+    Base of the config's sections. The settings a section has are its annotations, which are also what they're
+    checked against when the config is loaded. Sections can't be changed once they're built; to change the config,
+    a new one is loaded.
+    """
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} can't be changed, load the config again instead")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} can't be changed, load the config again instead")
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name)
+                                                 for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+
+class Flair(_Section):
+    """A post flair the bot sets"""
+    text: Optional[str]
+    id: Optional[str]
+    __slots__ = ('text', 'id')
+
+
+class SolvedCrawlConfig(_Section):
+    """How much of a thread is crawled for "!solved" when its comments weren't all seen by the bot"""
+    more_limit: int
+    max_depth: int
+    __slots__ = ('more_limit', 'max_depth')
+
+
+class ConstantsConfig(_Section):
+    """Texts of the bot's comments and messages"""
+    sub_comment: str
+    solved_message: str
+    footer: str
+    __slots__ = ('sub_comment', 'solved_message', 'footer')
+
+
+class UserFlairsConfig(_Section):
+    """User flairs showing how many points users have, with a template for every tier"""
+    text: str
+    # points at which users move up to the next tier, sorted, e.g. (5, 10, 25, 50, 100)
+    bounds: Tuple[int, ...]
+    # flair template ID of every tier, the first one being for users below the lowest bound
+    templates: Tuple[Optional[str], ...]
+    __slots__ = ('text', 'bounds', 'templates')
+
+    def tier(self, points: int) -> int:
+        """Returns the index of the tier a user with this many points belongs to"""
+        # the number of bounds the user has reached is exactly their tier
+        return bisect_right(self.bounds, points)
+
+    def render(self, points: int) -> Tuple[str, Optional[str]]:
+        """Returns the text and the template ID of the flair for a user with this many points"""
+        return self.text.format(points), self.templates[self.tier(points)]
+
+
+class SubredditConfig(_Section):
+    """Settings of a subreddit the bot runs in, with its overrides applied"""
+    name: str
+    flairs: Dict[str, Flair]
+    # template IDs of the flairs a non-OP comment doesn't change (solved, unsolved and contested)
+    steady_flair_ids: FrozenSet[Optional[str]]
+    # aging status -> how long (in seconds) posts stay in it
+    aging: Dict[str, float]
+    solved_crawl: SolvedCrawlConfig
+    user_flairs: UserFlairsConfig
+    constants: ConstantsConfig
+    __slots__ = ('name', 'flairs', 'steady_flair_ids', 'aging', 'solved_crawl', 'user_flairs', 'constants')
+
+
+class SchedulerConfig(_Section):
+    max_concurrent: int
+    # routine -> how often (in seconds) it's started
+    intervals: Dict[str, float]
+    __slots__ = ('max_concurrent', 'intervals')
+
+
+class RateLimitConfig(_Section):
+    # priority -> requests which have to be left in the window for a request with it to go through
+    reserves: Dict[str, int]
+    # routine -> priority of its requests
+    priorities: Dict[str, str]
+    __slots__ = ('reserves', 'priorities')
+
+
+class DatabaseConfig(_Section):
+    backend: str
+    path: str
+    pool_size: int
+    retries: int
+    __slots__ = ('backend', 'path', 'pool_size', 'retries')
+
+
+class PostCacheConfig(_Section):
+    size: int
+    ttl: float
+    __slots__ = ('size', 'ttl')
+
+
+class NotificationsConfig(_Section):
+    max_workers: int
+    batch_size: int
+    max_attempts: int
+    retry_delay: float
+    __slots__ = ('max_workers', 'batch_size', 'max_attempts', 'retry_delay')
+
+
+class WorkersConfig(_Section):
+    lease_ttl: float
+    __slots__ = ('lease_ttl',)
+
+
+class MetricsConfig(_Section):
+    host: str
+    port: int
+    __slots__ = ('host', 'port')
+
+
+class AgingConfig(_Section):
+    retry_delay: float
+    __slots__ = ('retry_delay',)
+
+
+class RetentionConfig(_Section):
+    days: float
+    batch_size: int
+    __slots__ = ('days', 'batch_size')
+
+
+class SnapshotConfig(_Section):
+    # empty to not keep one
+    path: str
+    interval: float
+    __slots__ = ('path', 'interval')
+
+
+class BotConfig(_Section):
+    """The whole config, as read from ``config.yaml``"""
+    # lower-cased name -> the subreddit's settings, in the order they're listed in
+    subreddits: Dict[str, SubredditConfig]
+    # all the subreddits as one listing, e.g. "WhatsTheWord+NameThatSong"
+    multireddit: str
+    # the first subreddit, which names the bot and gets rows from before it ran in several subreddits
+    home_subreddit: str
+    scheduler: SchedulerConfig
+    rate_limit: RateLimitConfig
+    database: DatabaseConfig
+    post_cache: PostCacheConfig
+    notifications: NotificationsConfig
+    workers: WorkersConfig
+    metrics: MetricsConfig
+    aging: AgingConfig
+    retention: RetentionConfig
+    snapshot: SnapshotConfig
+    mods_refresh_interval: float
+    # how often (in seconds) the config file is checked for changes; 0 means only on SIGHUP
+    config_check_interval: float
+    __slots__ = ('subreddits', 'multireddit', 'home_subreddit', 'scheduler', 'rate_limit', 'database', 'post_cache',
+                 'notifications', 'workers', 'metrics', 'aging', 'retention', 'snapshot',
+                 'mods_refresh_interval', 'config_check_interval')
+
+
+def _merge(base: dict, overrides: dict) -> dict:
+    """Returns a copy of ``base`` with values from ``overrides``. Nested sections are merged, not replaced"""
+    merged = deepcopy(base)
+
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = deepcopy(value)
+
+    return merged
+
+
+def subreddit_configs(config) -> Dict[str, dict]:
+    """
+    Returns the config of every subreddit the bot runs in, keyed by the subreddit's lower-cased name, in the order
+    they're listed in. Each one is the whole config with the subreddit's section from ``subreddits`` merged over it
+    and ``subreddit`` set to the subreddit's name.
+
+    A config with just ``subreddit`` (from before the bot ran in several subreddits) is read as a single subreddit.
+    """
+    if not (sections := config.get("subreddits") or ({config["subreddit"]: {}} if "subreddit" in config else None)):
+        raise ConfigError("subreddits must list at least one subreddit")
+    configs = {}
+
+    for name, overrides in sections.items():
+        subreddit_config = _merge(config, overrides or {})
+        subreddit_config.pop("subreddits", None)
+        subreddit_config["subreddit"] = name
+        configs[name.lower()] = subreddit_config
+
+    return configs
+
+
+def _convert(value, kind, path: str):
+    """Checks a setting against its annotation and returns it in the form the config keeps it in"""
+    origin = get_origin(kind)
+
+    if origin is Union:
+        for option in get_args(kind):
+            try:
+                return _convert(value, option, path)
+            except ConfigError:
+                pass
+        raise ConfigError(f"{path} has a value of the wrong type: {value!r}")
+    elif origin is dict:
+        if not isinstance(value, dict):
+            raise ConfigError(f"{path} must be a section")
+        return MappingProxyType({key: _convert(item, get_args(kind)[1], f"{path}.{key}")
+                                 for key, item in value.items()})
+    elif origin is tuple or origin is frozenset:
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            raise ConfigError(f"{path} must be a list")
+        return origin(_convert(item, get_args(kind)[0], f"{path}[]") for item in value)
+    elif isinstance(kind, type) and issubclass(kind, _Section):
+        return _section(kind, value, path)
+    elif kind is type(None):
+        if value is not None:
+            raise ConfigError(f"{path} must be empty")
+        return None
+
+    # YAML has no separate type for whole numbers which are meant as seconds
+    accepted = (int, float) if kind is float else kind
+    if not isinstance(value, accepted) or (isinstance(value, bool) and kind is not bool):
+        raise ConfigError(f"{path} must be a {'number' if kind is float else kind.__name__}, not {value!r}")
+    return value
+
+
+def _section(cls, section, path: str, **values):
+    """Builds a section out of the config's section at ``path``. Settings which aren't stored as they're written
+    in the file are passed in ``values``"""
+    if not isinstance(section, dict):
+        raise ConfigError(f"{path} must be a section")
+
+    for name, kind in cls.__annotations__.items():
+        if name in values:
+            continue
+        elif name not in section:
+            raise ConfigError(f"{path}.{name} is missing" if path else f"{name} is missing")
+        values[name] = _convert(section[name], kind, f"{path}.{name}" if path else name)
+
+    return cls(**values)
+
+
+def _subreddit(name: str, config: dict) -> SubredditConfig:
+    """Builds the settings of a subreddit out of its config, as returned by ``subreddit_configs()``"""
+    path = f"subreddits.{name}"
+    flairs = {}
+
+    for status in FLAIR_STATUSES:
+        if status not in config.get("flairs", {}):
+            raise ConfigError(f"{path}.flairs.{status} is missing")
+        flairs[status] = _section(Flair, config["flairs"][status], f"{path}.flairs.{status}")
+
+    for setting in AGING_SETTINGS.values():
+        if setting not in config:
+            raise ConfigError(f"{path}.{setting} is missing")
+
+    user_flairs = config.get("user_flairs")
+    if not isinstance(user_flairs, dict):
+        raise ConfigError(f"{path}.user_flairs must be a section")
+    bounds = tuple(sorted(_convert(user_flairs.get("bounds"), Tuple[int, ...], f"{path}.user_flairs.bounds")))
+    if (missing := [tier for tier in range(len(bounds) + 1) if tier not in user_flairs]):
+        raise ConfigError(f"{path}.user_flairs is missing tiers {', '.join(map(str, missing))}")
+    templates = tuple(_convert(user_flairs[tier], Optional[str], f"{path}.user_flairs.{tier}")
+                      for tier in range(len(bounds) + 1))
+
+    return _section(
+        SubredditConfig, config, path,
+        name=name,
+        flairs=MappingProxyType(flairs),
+        steady_flair_ids=frozenset(flairs[status].id for status in ('solved', 'unsolved', 'contested')),
+        aging=MappingProxyType({status: _convert(config[setting], float, f"{path}.{setting}")
+                                for status, setting in AGING_SETTINGS.items()}),
+        user_flairs=_section(UserFlairsConfig, user_flairs, f"{path}.user_flairs", bounds=bounds,
+                             templates=templates),
+    )
+
+
+def _check_names(names, allowed: Tuple[str, ...], path: str, required: bool = False) -> None:
+    """Checks that the names (e.g. the keys of a section) are all in ``allowed`` and, if they're ``required``, that
+    none of them is missing"""
+    if (unknown := [name for name in names if name not in allowed]):
+        raise ConfigError(f"{path} doesn't accept {', '.join(map(str, unknown))}. Must be one of: {', '.join(allowed)}")
+    elif required and (missing := [name for name in allowed if name not in names]):
+        raise ConfigError(f"{path} is missing {', '.join(missing)}")
+
+
+def from_dict(config: dict) -> BotConfig:
+    """Builds the config out of its parsed YAML, raising ``ConfigError`` if anything is missing, of the wrong type
+    or names something the bot doesn't know, like a routine"""
+    if not isinstance(config, dict):
+        raise ConfigError("The config must be a YAML mapping")
+
+    subreddits = MappingProxyType({key: _subreddit(sub_config["subreddit"], sub_config)
+                                   for key, sub_config in subreddit_configs(config).items()})
+
+    bot_config = _section(
+        BotConfig, config, '',
+        subreddits=subreddits,
+        multireddit='+'.join(sub_config.name for sub_config in subreddits.values()),
+        home_subreddit=next(iter(subreddits.values())).name,
+    )
+
+    # the bot looks these up by name when it starts, so a typo would only come up then
+    _check_names(bot_config.scheduler.intervals, ROUTINES, 'scheduler.intervals', required=True)
+    _check_names(bot_config.rate_limit.priorities, ROUTINES, 'rate_limit.priorities', required=True)
+    # priorities can be written in any case
+    for routine, priority in bot_config.rate_limit.priorities.items():
+        _check_names((priority.lower(),), PRIORITIES, f"rate_limit.priorities.{routine}")
+    _check_names([str(name).lower() for name in bot_config.rate_limit.reserves], PRIORITIES, 'rate_limit.reserves')
+    _check_names((bot_config.database.backend,), BACKENDS, 'database.backend')
+
+    return bot_config
+
+
+def load(path: str) -> BotConfig:
+    """Reads the config from a YAML file"""
+    with open(path) as file:
+        return from_dict(yaml.safe_load(file))
+
+
+class ConfigStore:
+    """
+    Holds the config the bot runs with and swaps it for a new one when the file changes or the process gets a SIGHUP.
+    A new config replaces the old one as a whole, so anything reading ``current`` sees either the old config or the
+    new one, never a mix of both.
+    """
+
+    def __init__(self, config: BotConfig, path: Optional[str] = None):
+        """
+        :param path: File the config was read from. Without one, the config is never reloaded
+        """
+        self.current = config
+        self._path = path
+        self._modified = self._modified_at()
+        self._reload_requested = threading.Event()
+        self._stopped = threading.Event()
+
+        # called with the old and the new config after a reload
+        self.on_reload: Optional[Callable[[BotConfig, BotConfig], None]] = None
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ConfigStore':
+        return cls(load(path), path)
+
+    def _modified_at(self) -> Optional[int]:
+        return os.stat(self._path).st_mtime_ns if self._path else None
+
+    def reload(self) -> bool:
+        """
+        Reads the config file again and swaps the new config in, returning whether it was. A config which doesn't
+        load or lists other subreddits is refused, and the old one is kept.
+        """
+        if not self._path:
+            return False
+
+        self._modified = self._modified_at()
+        try:
+            config = load(self._path)
+        except (OSError, yaml.YAMLError, ConfigError) as e:
+            logger.error(f"Couldn't reload the config, keeping the old one. {e}")
+            return False
+
+        old = self.current
+        if config.subreddits.keys() != old.subreddits.keys():
+            logger.error("Couldn't reload the config, keeping the old one. Changing the subreddits takes a restart.")
+            return False
+        elif config == old:
+            return False
+
+        if changed := [name for name in _RESTART_ONLY if getattr(config, name) != getattr(old, name)]:
+            logger.warning(f"Changes to {', '.join(changed)} only take effect after a restart.")
+
+        self.current = config
+        logger.info("Reloaded the config.")
+
+        if self.on_reload is not None:
+            self.on_reload(old, config)
+        return True
+
+    def request_reload(self, *_) -> None:
+        """Asks for the config to be reloaded in the background. Safe to call from a signal handler"""
+        self._reload_requested.set()
+
+    def passing_current(self, routine: Callable) -> Callable:
+        """Wraps a routine, so it's passed the config current when it starts as its last argument"""
+        @wraps(routine)
+        def wrapper(*args, **kwargs):
+            return routine(*args, self.current, **kwargs)
+        return wrapper
+
+    def start(self) -> None:
+        """Starts reloading the config in the background when it's requested or the file changes"""
+        threading.Thread(target=self._watch_loop, name="config-reload", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops the background reloading"""
+        self._stopped.set()
+        self._reload_requested.set()
+
+    def _watch_loop(self) -> None:
+        while True:
+            interval = self.current.config_check_interval
+            self._reload_requested.wait(interval or None)
+            if self._stopped.is_set():
+                return
+
+            requested = self._reload_requested.is_set()
+            self._reload_requested.clear()
+
+            try:
+                if requested or self._modified_at() != self._modified:
+                    self.reload()
+            except Exception as e:
+                # the old config is still good, we'll try again next time
+                logger.error(f"Couldn't check the config for changes. {e}")
@@ -18,148 +18,831 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 ---
 
-Last modified by Xeoth on 23.02.2021
+Last modified by Xeoth on 18.10.2026
                  ^--------^ please change when modifying to comply with the license
 """
 
 
-import mysql.connector
-from typing import Tuple, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from itertools import chain, groupby
+import logging
+from pathlib import Path
+import threading
+import time
+
+from typing import Dict, Tuple, Optional, Iterable, List, Set, Sequence, Type, TYPE_CHECKING
+
+from . import metrics_helper
+
+if TYPE_CHECKING:
+    from .config_helper import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# most calls are cache hits or queued writes, which take well under a millisecond
+_call_duration = metrics_helper.histogram(
+    'wtw_db_call_duration_seconds', "How long DatabaseHelper calls take, including waiting for a connection", ('call',),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+_cache_lookups = metrics_helper.counter(
+    'wtw_post_cache_lookups_total', "Post status lookups in the cache, by whether they were hits or misses",
+    ('result',))
+
+SQL_DIR = Path(__file__).resolve().parent.parent / 'sql'
+
+# writes which can be merged into a single multi-row statement while batching. backends add the ones which need
+# their own SQL dialect. name -> (statement, placeholder for a single row)
+_BATCHABLE_WRITES = {
+    'post': ('REPLACE INTO posts (id, status, subreddit, timestamp) VALUES {};', '(?, ?, ?, UNIX_TIMESTAMP())'),
+    'remove_subs': ('DELETE FROM subscribers WHERE id IN ({});', '?'),
+    'ledger': ('INSERT INTO points_ledger (subreddit, name, id, difference, timestamp) VALUES {};',
+               '(?, ?, ?, ?, UNIX_TIMESTAMP())'),
+    'history': ('INSERT INTO post_history (id, subreddit, old_status, new_status, timestamp) VALUES {};',
+                '(?, ?, ?, ?, UNIX_TIMESTAMP())'),
+}
+
+# keeps merged statements (and their packets) at a reasonable size
+_MAX_ROWS_PER_STATEMENT = 500
+
+# the longest we'll wait (in seconds) between reconnection attempts
+_MAX_BACKOFF = 30
+
+
+def _connected(method):
+    """
+    Runs the method with a connection checked out from the pool, unless the calling thread already holds one. If the
+    connection is lost (or the backend says the error is worth retrying, like a locked database), the call is retried
+    on a fresh connection with exponential backoff.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with _call_duration.time(call=method.__name__):
+            if self._state.cnx is not None:
+                return method(self, *args, **kwargs)
+
+            attempt = 0
+            while True:
+                try:
+                    with self._checkout():
+                        return method(self, *args, **kwargs)
+                except self._connection_errors as e:
+                    if attempt >= self._retries or not self._is_retryable(e):
+                        raise
+
+                    delay = min(2 ** attempt, _MAX_BACKOFF)
+                    attempt += 1
+                    logger.warning(f"Database call {method.__name__} failed, retrying in {delay}s "
+                                   f"({attempt}/{self._retries}). {e}")
+                    time.sleep(delay)
+    return wrapper
+
+
+class _Batch:
+    """State of a single (possibly nested) ``DatabaseHelper.batch()`` block"""
+    __slots__ = ('depth', 'start', 'savepoint', 'touched_posts')
+
+    def __init__(self, depth: int, start: int):
+        self.depth = depth
+        # position of the first write queued inside this batch
+        self.start = start
+        # nested batches get a savepoint as soon as anything queued before them reaches the DB
+        self.savepoint: Optional[str] = None
+        # posts saved inside this batch, so they can be dropped from the cache if the batch is rolled back
+        self.touched_posts: Set[str] = set()
+
+
+class _ThreadState(threading.local):
+    """Connection and batch held by a single thread"""
+
+    def __init__(self):
+        self.cnx = None
+        self.cur = None
+        self.batches: List[_Batch] = []
+        self.pending: List[Tuple[str, tuple]] = []
+        # how many queued writes were executed during the current transaction
+        self.flushed = 0
+        # whether anything was written to the DB directly during the current transaction
+        self.wrote = False
 
 
 class DatabaseHelper:
-    """Class made for easier interactions with MySQL, without the need for writing bare SQL inside the bot's code."""
+    """
+    Class made for easier interactions with the database, without the need for writing bare SQL inside the bot's code.
+
+    This is the storage interface the bot uses; the backends (``MySQLDatabaseHelper``, ``SQLiteDatabaseHelper``)
+    provide the connections and the parts of SQL which differ between them. Use ``from_config()`` to get the one
+    selected in the config.
+    """
+
+    # errors after which the call should be retried, e.g. because the connection was lost. ``_is_retryable`` can narrow
+    # them down
+    _connection_errors: Tuple[Type[Exception], ...] = ()
+    # errors raised by the backend's driver
+    _database_errors: Tuple[Type[Exception], ...] = ()
+    # batchable writes, as in ``_BATCHABLE_WRITES``, including the backend's own
+    _batchable_writes: Dict[str, Tuple[str, str]]
+    # how the backend spells an insert which skips rows that already exist
+    _insert_ignore: str
+    # directory with the backend's migrations
+    migrations_dir: Path
+
+    def __init__(self, cache_size: int = 0, cache_ttl: float = 300, pool_size: int = 5, retries: int = 5):
+        """
+        :param cache_size: How many post statuses can be kept in memory. 0 disables the cache
+        :param cache_ttl: How long (in seconds) a cached post status is considered up to date
+        :param pool_size: How many connections can be open at the same time
+        :param retries: How many times a call is retried after losing the connection or finding the database locked
+        """
+        # the pools raise instead of waiting when they're out of connections, so we do the waiting ourselves
+        self._available = threading.BoundedSemaphore(pool_size)
+        self._retries = retries
+        self._state = _ThreadState()
+
+        # post ID -> (status, time it was cached at), least recently used first
+        self._post_cache: OrderedDict[str, Tuple[Optional[str], float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # backend-specific parts
+
+    def _connect(self):
+        """Returns a connection, reusing an idle one if possible"""
+        raise NotImplementedError
+
+    def _cursor(self, cnx):
+        """Returns the cursor used for the bot's queries"""
+        raise NotImplementedError
+
+    def _release(self, cnx) -> None:
+        """Hands a connection back, so it can be reused"""
+        raise NotImplementedError
+
+    def _execute_raw(self, statement: str) -> None:
+        """Executes a statement without preparing it, e.g. one which manages savepoints"""
+        raise NotImplementedError
+
+    def _is_missing_table(self, error: Exception) -> bool:
+        """Checks whether an error was caused by querying a table which doesn't exist"""
+        raise NotImplementedError
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Checks whether a call which failed with one of the ``_connection_errors`` should be retried"""
+        return True
+
+    def _add_points(self, username: str, subreddit: str, difference: int) -> Tuple[int, int]:
+        """Atomically adds points to a user in a subreddit (creating them if needed), keeping the points from going
+        below 0, and returns the amounts from before and after"""
+        raise NotImplementedError
+
+    @property
+    def _cnx(self):
+        """Connection held by the calling thread"""
+        return self._state.cnx
+
+    @property
+    def _cur(self):
+        """Cursor of the connection held by the calling thread"""
+        return self._state.cur
+
+    @contextmanager
+    def _checkout(self):
+        """Checks a connection out of the pool and holds it in the calling thread until the block ends"""
+        state = self._state
+
+        with self._available:
+            cnx = self._connect()
+
+            try:
+                state.cnx, state.cur = cnx, self._cursor(cnx)
+                yield
+            finally:
+                cur, state.cnx, state.cur = state.cur, None, None
+
+                try:
+                    # the cursor is missing if getting it is what failed
+                    if cur is not None:
+                        cur.close()
+                    self._release(cnx)
+                except self._database_errors as e:
+                    # a broken connection is reconnected the next time it's checked out
+                    logger.warning(f"Couldn't return the connection to the pool cleanly. {e}")
+
+    @contextmanager
+    def batch(self):
+        """
+        Queues all writes made inside the block and executes them as multi-row statements in a single transaction
+        when the outermost batch ends. If an exception escapes a batch, the writes made inside it are rolled back (a
+        nested batch only rolls back its own writes) and the exception is re-raised.
+
+        Reads made inside a batch see the writes queued before them. A batch which didn't write anything isn't
+        committed. The calling thread holds onto its connection until the outermost batch ends. Losing the connection
+        inside a batch isn't retried, as the writes made before it are gone with it.
+        """
+        if self._state.cnx is not None:
+            with self._transaction():
+                yield
+        else:
+            with self._checkout(), self._transaction():
+                yield
+
+    @contextmanager
+    def _transaction(self):
+        state = self._state
+        frame = _Batch(depth=len(state.batches), start=state.flushed + len(state.pending))
+        state.batches.append(frame)
+
+        try:
+            yield
+            state.batches.pop()
+
+            if state.batches:
+                # the outer batch is the one committing, and it also has to know what to evict if it's rolled back
+                state.batches[-1].touched_posts |= frame.touched_posts
+            elif state.pending or state.flushed or state.wrote:
+                self._flush()
+                self._cnx.commit()
+                state.flushed = 0
+                state.wrote = False
+        except BaseException:
+            if state.batches and state.batches[-1] is frame:
+                state.batches.pop()
+            self._rollback(frame)
+            raise
+
+    def _rollback(self, frame: _Batch) -> None:
+        """Discards the writes made inside a batch"""
+        state = self._state
+        del state.pending[max(frame.start - state.flushed, 0):]
+
+        with self._cache_lock:
+            for post_id in frame.touched_posts:
+                self._post_cache.pop(post_id, None)
+
+        try:
+            if not state.batches:
+                state.pending.clear()
+                state.flushed = 0
+                state.wrote = False
+                self._cnx.rollback()
+            elif frame.savepoint:
+                self._execute_raw(f'ROLLBACK TO SAVEPOINT {frame.savepoint};')
+        except self._database_errors as e:
+            # if the connection is gone, the server has already thrown the transaction away
+            logger.warning(f"Couldn't roll back the batch. {e}")
+
+    def _write(self, kind: str, params: tuple) -> None:
+        """Executes and commits a write right away, or queues it if we're inside a batch"""
+        if self._state.batches:
+            self._state.pending.append((kind, params))
+        else:
+            self._execute_writes(kind, [params])
+            self._cnx.commit()
 
-    def __init__(self, username, password, hostname):
-        self._cnx = mysql.connector.connect(
-            user=username,
-            password=password,
-            host=hostname,
-            database="WTWbot"
-        )
+    def _execute_writes(self, kind: str, rows: List[tuple]) -> None:
+        """Executes writes of a single kind, merging them into as few statements as possible"""
+        statement, placeholder = self._batchable_writes[kind]
 
-        self._cur = self._cnx.cursor(prepared=True)
+        for i in range(0, len(rows), _MAX_ROWS_PER_STATEMENT):
+            chunk = rows[i:i + _MAX_ROWS_PER_STATEMENT]
+            self._cur.execute(statement.format(', '.join([placeholder] * len(chunk))),
+                              tuple(chain.from_iterable(chunk)))
 
-    def __del__(self):
-        self._cur.close()
-        self._cnx.close()
+    def _execute_pending(self, count: int) -> None:
+        """Executes the first ``count`` queued writes, merging consecutive writes of the same kind"""
+        if count <= 0:
+            return
 
-    def save_post(self, post_id: str, status: str) -> None:
-        """Adds or updates a post in the database and returns None"""
+        state = self._state
+        writes, state.pending = state.pending[:count], state.pending[count:]
+        state.flushed += count
+
+        for kind, group in groupby(writes, key=lambda write: write[0]):
+            self._execute_writes(kind, [params for _, params in group])
+
+    def _flush(self, savepoints: bool = False) -> None:
+        """
+        Executes queued writes without committing them, so they're visible to following statements.
+
+        :param savepoints: Whether nested batches need savepoints even if there's nothing to flush, which is the case
+                           before statements that write to the DB directly
+        """
+        state = self._state
+        if not state.pending and not savepoints:
+            return
+        elif savepoints and state.batches:
+            # the batch can't tell it has anything to commit otherwise
+            state.wrote = True
+
+        # a nested batch has to be able to roll back to the state from before it started, so we set its savepoint
+        # right after executing the writes queued before it
+        for frame in state.batches[1:]:
+            if frame.savepoint is None:
+                self._execute_pending(frame.start - state.flushed)
+                frame.savepoint = f'wtw_batch_{frame.depth}'
+                self._execute_raw(f'SAVEPOINT {frame.savepoint};')
+
+        self._execute_pending(len(state.pending))
+
+    def _commit(self) -> None:
+        """Commits the transaction, unless we're inside a batch, which commits on its own"""
+        if not self._state.batches:
+            self._cnx.commit()
+
+    def _cache_post(self, post_id: str, status: Optional[str]) -> None:
+        """Puts a post's status in the cache, evicting the least recently used one if the cache is full"""
+        if not self._cache_size:
+            return
+
+        with self._cache_lock:
+            self._post_cache[post_id] = (status, time.monotonic())
+            self._post_cache.move_to_end(post_id)
+
+            while len(self._post_cache) > self._cache_size:
+                self._post_cache.popitem(last=False)
+
+    def _cached_post(self, post_id: str) -> Tuple[bool, Optional[str]]:
+        """Looks a post up in the cache and returns whether it was found and its status"""
+        with self._cache_lock:
+            if (entry := self._post_cache.get(post_id)) is None:
+                self.cache_misses += 1
+                _cache_lookups.inc(result='miss')
+                return False, None
+
+            status, cached_at = entry
+            if time.monotonic() - cached_at > self._cache_ttl:
+                del self._post_cache[post_id]
+                self.cache_misses += 1
+                _cache_lookups.inc(result='miss')
+                return False, None
+
+            self._post_cache.move_to_end(post_id)
+            self.cache_hits += 1
+            _cache_lookups.inc(result='hit')
+            return True, status
+
+    @_connected
+    def save_post(self, post_id: str, status: str, subreddit: str) -> None:
+        """Adds or updates a post made in a subreddit in the database and returns None"""
         if status not in ('unsolved', 'abandoned', 'contested', 'unknown', 'overridden', 'solved'):
             raise ValueError(
                 "Invalid status provided. Must be one of: unsolved, abandoned, contested, unknown, overridden")
 
-        self._cur.execute(
-            'REPLACE INTO posts VALUES (?, ?, UNIX_TIMESTAMP());', (post_id, status))
-        self._cnx.commit()
+        self._write('post', (post_id, status, subreddit))
+        self._cache_post(post_id, status)
 
+        if self._state.batches:
+            self._state.batches[-1].touched_posts.add(post_id)
+
+    @_connected
     def check_post(self, post_id: str) -> Optional[str]:
-        """Fetches a post's status from the database and returns it or None if no results are found."""
+        """Fetches a post's status from the database (or the cache) and returns it or None if no results are found."""
+        if self._cache_size:
+            found, status = self._cached_post(post_id)
+            if found:
+                return status
+
+        self._flush()
         self._cur.execute('SELECT status FROM posts WHERE id=?;', (post_id,))
         results = self._cur.fetchone()
 
         # fetchone() returns a tuple with a string, or None if no results are found.
-        return None if not results else results[0]
+        status = None if not results else results[0]
+        self._cache_post(post_id, status)
+        return status
+
+    @_connected
+    def check_posts(self, post_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Fetches statuses of several posts from the database, bypassing the cache (which is refreshed with them),
+        and returns them by post ID. Posts which aren't in the database get None"""
+        post_ids = list(post_ids)
+        statuses: Dict[str, Optional[str]] = dict.fromkeys(post_ids)
+        self._flush()
+
+        for i in range(0, len(post_ids), _MAX_ROWS_PER_STATEMENT):
+            chunk = post_ids[i:i + _MAX_ROWS_PER_STATEMENT]
+            self._cur.execute(f'SELECT id, status FROM posts WHERE id IN ({", ".join("?" * len(chunk))});',
+                              tuple(chunk))
+            statuses.update(self._cur.fetchall())
+
+        for post_id, status in statuses.items():
+            self._cache_post(post_id, status)
+        return statuses
+
+    @_connected
+    def get_post_timestamps(self, status: str, subreddit: str, since: float = 0) -> Tuple[Tuple[str, int], ...]:
+        """Returns (post ID, time it was saved) of a subreddit's posts with a status which were saved at or after
+        ``since``"""
+        self._flush()
+        self._cur.execute('SELECT id, timestamp FROM posts WHERE subreddit=? AND status=? AND timestamp >= ?;',
+                          (subreddit, status, int(since)))
+
+        return tuple(tuple(result) for result in self._cur.fetchall())
+
+    @_connected
+    def add_post_history(self, post_id: str, subreddit: str, old_status: Optional[str], new_status: str) -> None:
+        """Records a post's status change and returns None"""
+        self._write('history', (post_id, subreddit, old_status, new_status))
+
+    @_connected
+    def get_post_history(self, post_id: str) -> Tuple[Tuple[Optional[str], str, int], ...]:
+        """Returns every status change of a post as (old status, new status, timestamp), oldest first"""
+        self._flush()
+        self._cur.execute(
+            'SELECT old_status, new_status, timestamp FROM post_history WHERE id=? ORDER BY entry_id;', (post_id,))
+
+        return tuple(tuple(result) for result in self._cur.fetchall())
+
+    @_connected
+    def preload_posts(self, statuses: Iterable[str] = ('unsolved', 'contested')) -> int:
+        """Loads all posts with the specified statuses into the cache and returns how many were loaded"""
+        if not self._cache_size:
+            return 0
+
+        self._flush()
+
+        loaded = 0
+        for status in statuses:
+            self._cur.execute('SELECT id FROM posts WHERE status=?;', (status,))
+            for (post_id,) in self._cur.fetchall():
+                self._cache_post(post_id, status)
+                loaded += 1
+
+        return loaded
+
+    def snapshot_cache(self) -> List[Tuple[str, Optional[str], float]]:
+        """Returns the cached post statuses as (post ID, status, time it was cached at as a UNIX timestamp), least
+        recently used first, for a warm start"""
+        # the cache keeps monotonic times, which don't mean anything to another process
+        offset = time.time() - time.monotonic()
+
+        with self._cache_lock:
+            return [(post_id, status, cached_at + offset) for post_id, (status, cached_at) in self._post_cache.items()]
+
+    def restore_cache(self, entries: Iterable[Sequence]) -> int:
+        """Puts post statuses from ``snapshot_cache()`` back into the cache and returns how many were put back. The
+        ones which would've expired by now are left out"""
+        if not self._cache_size:
+            return 0
+
+        offset = time.time() - time.monotonic()
+        oldest = time.monotonic() - self._cache_ttl
+        restored = 0
 
+        with self._cache_lock:
+            for post_id, status, cached_at in entries:
+                if (cached_at := cached_at - offset) <= oldest or post_id in self._post_cache:
+                    continue
+
+                self._post_cache[post_id] = (status, cached_at)
+                # entries come least recently used first, so the most recent ones end up at the end
+                self._post_cache.move_to_end(post_id)
+                restored += 1
+
+            while len(self._post_cache) > self._cache_size:
+                self._post_cache.popitem(last=False)
+
+        return restored
+
+    @_connected
     def add_subscriber(self, post_id: str, username: str) -> None:
-        """Adds a subscriber to a post and returns None"""
-        self._cur.execute(
-            'INSERT INTO subscribers (name, id) VALUES (?, ?);', (username, post_id))
-        self._cnx.commit()
+        """Adds a subscriber to a post, unless they're already subscribed to it, and returns None"""
+        self._write('subscriber', (username, post_id))
 
+    @_connected
     def remove_all_subs(self, post_id: str) -> None:
         """Removes all subscribers from a post and returns None"""
-        self._cur.execute("DELETE FROM subscribers WHERE id=?;", (post_id,))
-        self._cnx.commit()
+        self._write('remove_subs', (post_id,))
 
+    @_connected
     def get_subscribers(self, post_id: str) -> Optional[Tuple[str]]:
         """Returns all subscribers for a specified posts in a tuple"""
+        self._flush()
         self._cur.execute("SELECT name FROM subscribers WHERE id=?;", (post_id,))
         results = self._cur.fetchall()
     
         return None if not results else tuple(result[0] for result in results)
 
-    def check_subscription(self, post_id: str, username: str) -> bool:
-        """Checks if the specified user is subscribed to a post."""
-        self._cur.execute("SELECT 1 FROM subscribers WHERE name=? AND id=?;", (username, post_id))
-        return bool(self._cur.fetchone())
-
-    def check_points(self, username: str) -> int:
-        """Queries the database for amount of points a specified user has and returns it"""
+    @_connected
+    def check_points(self, username: str, subreddit: str) -> int:
+        """Queries the database for amount of points a specified user has in a subreddit and returns it"""
+        self._flush()
         self._cur.execute(
-            'SELECT points FROM users WHERE name=?;', (username,))
+            'SELECT points FROM users WHERE subreddit=? AND name=?;', (subreddit, username))
         results = self._cur.fetchone()
     
         return 0 if not results else results[0]
 
-    def modify_points(self, username: str, difference: int) -> int:
+    @_connected
+    def modify_points(self, username: str, subreddit: str, difference: int, post_id: Optional[str] = None) -> int:
         """
         Adds or removes specified amount of points from the user and returns None.
         Points can be both positive or negative, but score stored in DB cannot be negative.
-        Creates the user in DB if does not exist yet.
+        Creates the user in DB if does not exist yet. Every change is also recorded in the points ledger.
         
         **Caution!** This does **not** set the points to the specified amount. Only either adds or subtracts from
         existing ones. To set points to a desired amount directly, use ``set_points()``.
 
         :param username: Username of the user we want to modify points for
+        :param subreddit: Subreddit the points are for, as every subreddit has its own
         :param difference: The amount of points we can add to the user (or subtract from the user, if negative.)
+        :param post_id: ID of the post the points were awarded for, if any
         :returns Returns the new amount of user's points
         """
 
-        # I probably could've done it with pure SQL, but it'd be overly complicated. Python it is!
+        # the result has to be returned right away, so this can't be queued like other writes
+        self._flush(savepoints=True)
 
-        # first, we need to get the current amount of points (or 0)
-        self._cur.execute(
-            'SELECT points FROM users WHERE name=?;', (username,))
+        # the update happens atomically, so two solves landing at the same time can't race
+        old_points, modified_points = self._add_points(username, subreddit, difference)
 
-        # this returns either a tuple with the score or None
-        current_points = 0 if (points := self._cur.fetchone()) is None else points[0]
-    
-        # now that we have our points, we can add or subtract the desired amount
-        modified_points = current_points + difference
-    
-        # we're using unsigned ints, so the number cannot be smaller than 0
-        modified_points = max(modified_points, 0)
-    
-        self._cur.execute(
-            'REPLACE INTO users VALUES (?, ?);', (username, modified_points))
-        self._cnx.commit()
+        # points stop at 0, so the change made can be smaller than the one asked for. the ledger gets the one made, so
+        # it always adds up to the user's points
+        entry = (subreddit, username, post_id, modified_points - old_points)
+        if self._state.batches:
+            self._write('ledger', entry)
+        else:
+            self._execute_writes('ledger', [entry])
+            self._cnx.commit()
     
         return modified_points
 
-    def set_points(self, username: str, amount: int) -> None:
-        """Sets user's points in the DB to a specified amount"""
+    @_connected
+    def set_points(self, username: str, subreddit: str, amount: int) -> None:
+        """Sets user's points in a subreddit to a specified amount. The change is recorded in the points ledger"""
 
         # since we're dealing with unsigned ints, we cannot have negatives
         if amount < 0:
             raise ValueError("Amount of points cannot be negative.")
 
-        self._cur.execute("REPLACE INTO users VALUES (?, ?);",
-                          (username, amount))
-        self._cnx.commit()
+        self._flush(savepoints=True)
 
-    def get_old_posts(self, second_limit: float, status: str) -> Optional[Tuple[str, ...]]:
-        """Returns posts saved in the DB that are older than a specified amount of time and have the specified status.
-        
-        :param second_limit: Limit (in seconds) which the posts must surpass to be returned
-        :param status: Status of the post in the database (unsolved, overridden, solved, etc.)
-        :returns: If any posts with provided criteria exist, will return a tuple with their IDs
+        # the ledger has to add up to the user's points, so we record the difference from the current amount
+        self._cur.execute(
+            'INSERT INTO points_ledger (subreddit, name, id, difference, timestamp) '
+            'SELECT ?, ?, NULL, ? - COALESCE(SUM(points), 0), UNIX_TIMESTAMP() FROM users '
+            'WHERE subreddit=? AND name=?;', (subreddit, username, amount, subreddit, username))
+        self._cur.execute(
+            "REPLACE INTO users (subreddit, name, points) VALUES (?, ?, ?);", (subreddit, username, amount))
+        self._commit()
+
+    @_connected
+    def recalculate_points(self, username: Optional[str] = None, subreddit: Optional[str] = None) -> None:
         """
-        if status:
-            self._cur.execute(
-                'SELECT id FROM posts WHERE UNIX_TIMESTAMP()-timestamp >= ? AND status = ?;', (second_limit, status))
-        else:
+        Recalculates points from the points ledger and returns None
+
+        :param username: User whose points should be recalculated. If not provided, everyone's points are
+        :param subreddit: Subreddit whose points should be recalculated. If not provided, all subreddits' points are
+        """
+        self._flush(savepoints=True)
+
+        filters = {'name': username, 'subreddit': subreddit}
+        conditions = ' AND '.join(f'{column}=?' for column, value in filters.items() if value)
+
+        self._cur.execute(
+            'REPLACE INTO users (subreddit, name, points) SELECT subreddit, name, GREATEST(SUM(difference), 0) '
+            f'FROM points_ledger {"WHERE " + conditions if conditions else ""} GROUP BY subreddit, name;',
+            tuple(value for value in filters.values() if value))
+
+        self._commit()
+
+    @_connected
+    def get_awarded_posts(self, username: str, subreddit: str) -> Tuple[str, ...]:
+        """Returns IDs of the posts the user was awarded points for in a subreddit, oldest first"""
+        self._flush()
+        self._cur.execute(
+            'SELECT id FROM points_ledger WHERE subreddit=? AND name=? AND id IS NOT NULL ORDER BY entry_id;',
+            (subreddit, username))
+
+        return tuple(result[0] for result in self._cur.fetchall())
+
+    @_connected
+    def archive_posts(self, statuses: Sequence[str], older_than: float, limit: int) -> int:
+        """
+        Moves up to ``limit`` posts with the statuses, saved more than ``older_than`` seconds ago, to the archive, along
+        with removing their subscribers and recorded solved comments, and returns how many were moved. Every call is a
+        transaction of its own, so the live tables are only locked for as long as it takes to move one batch.
+        """
+        self._flush(savepoints=True)
+
+        status_marks = ', '.join('?' * len(statuses))
+        conditions = f'status IN ({status_marks}) AND timestamp <= UNIX_TIMESTAMP() - ?'
+        # picking the posts with a plain read first means only their rows get locked, not every row scanned
+        self._cur.execute(f'SELECT id FROM posts WHERE {conditions} LIMIT ?;', (*statuses, older_than, limit))
+        post_ids = tuple(result[0] for result in self._cur.fetchall())
+
+        if not post_ids:
+            return 0
+
+        # posts saved again in the meantime don't match the conditions anymore and are left alone
+        id_marks = ', '.join('?' * len(post_ids))
+        params = (*post_ids, *statuses, older_than)
+        self._cur.execute(
+            'REPLACE INTO posts_archive (id, subreddit, status, timestamp, archived_at) '
+            f'SELECT id, subreddit, status, timestamp, UNIX_TIMESTAMP() FROM posts WHERE id IN ({id_marks}) '
+            f'AND {conditions};', params)
+        self._cur.execute(f'DELETE FROM posts WHERE id IN ({id_marks}) AND {conditions};', params)
+        archived = self._cur.rowcount
+
+        for table in ('subscribers', 'solved_comments'):
             self._cur.execute(
-                'SELECT id FROM posts WHERE UNIX_TIMESTAMP()-timestamp >= ?;', (second_limit,))
+                f'DELETE FROM {table} WHERE id IN ({id_marks}) AND id NOT IN (SELECT id FROM posts WHERE id IN '
+                f'({id_marks}));', post_ids * 2)
 
-        results = self._cur.fetchall()
+        self._commit()
+
+        with self._cache_lock:
+            for post_id in post_ids:
+                self._post_cache.pop(post_id, None)
+
+        return archived
 
-        if not results:
-            # means there are no old posts
-            return None
+    @_connected
+    def get_stream_position(self, stream: str) -> Optional[str]:
+        """Returns the fullname of the last item processed in a stream or None if the stream wasn't processed yet"""
+        self._flush()
+        self._cur.execute('SELECT fullname FROM streams WHERE name=?;', (stream,))
+        results = self._cur.fetchone()
+
+        return None if not results else results[0]
+
+    @_connected
+    def set_stream_position(self, stream: str, fullname: str, covered_since: Optional[int] = None) -> None:
+        """
+        Saves the fullname of the last item processed in a stream and returns None
+
+        :param covered_since: If provided, also saves the creation time of the oldest item after which the stream
+                              hasn't missed anything
+        """
+        if covered_since is None:
+            self._write('stream', (stream, fullname))
         else:
-            # this query will return a list of tuples in which the only element will be post IDs, like [('ks72b',),
-            # ('jbdno3',)]
-            # this turns this hellspawned list-tuple-thing into a regular tuple with normal post IDs
-            return tuple([post[0] for post in results])
+            self._write('stream_coverage', (stream, fullname, covered_since))
+
+    @_connected
+    def get_stream_coverage(self, stream: str) -> Optional[int]:
+        """Returns the creation time of the oldest item after which the stream hasn't missed anything, or None if the
+        stream wasn't processed yet"""
+        self._flush()
+        self._cur.execute('SELECT covered_since FROM streams WHERE name=?;', (stream,))
+        results = self._cur.fetchone()
+
+        return None if not results else results[0]
+
+    @_connected
+    def add_solved_comment(self, post_id: str, comment_id: str) -> None:
+        """Records OP's comment containing the solved keyword and returns None"""
+        self._write('solved_comment', (post_id, comment_id))
+
+    @_connected
+    def has_solved_comment(self, post_id: str) -> bool:
+        """Checks whether OP was recorded commenting the solved keyword under a post"""
+        self._flush()
+        self._cur.execute('SELECT 1 FROM solved_comments WHERE id=? LIMIT 1;', (post_id,))
+        return bool(self._cur.fetchone())
+
+    @_connected
+    def queue_notifications(self, post_id: str, message: str) -> int:
+        """Queues a message for every subscriber of a post and returns how many were queued. A subscriber already
+        having a queued message about the post doesn't get another one"""
+        self._flush(savepoints=True)
+        self._cur.execute(
+            f'{self._insert_ignore} INTO notifications (id, name, message, attempts, next_attempt) '
+            'SELECT id, name, ?, 0, UNIX_TIMESTAMP() FROM subscribers WHERE id=?;', (message, post_id))
+        queued = self._cur.rowcount
+        self._commit()
+
+        return queued
+
+    @_connected
+    def get_due_notifications(self, limit: int) -> Tuple[Tuple[str, str, str, int], ...]:
+        """Returns up to ``limit`` queued notifications which are due to be sent as (post ID, username, message,
+        attempts made)"""
+        self._flush()
+        self._cur.execute(
+            'SELECT id, name, message, attempts FROM notifications WHERE next_attempt <= UNIX_TIMESTAMP() '
+            'ORDER BY next_attempt LIMIT ?;', (limit,))
+
+        return tuple(tuple(result) for result in self._cur.fetchall())
+
+    @_connected
+    def remove_notification(self, post_id: str, username: str) -> None:
+        """Removes a notification from the queue and returns None"""
+        self._write('remove_notification', (post_id, username))
+
+    @_connected
+    def postpone_notification(self, post_id: str, username: str, delay: int) -> None:
+        """Counts a failed attempt at sending a notification and postpones it by ``delay`` seconds"""
+        self._flush(savepoints=True)
+        self._cur.execute(
+            'UPDATE notifications SET attempts=attempts + 1, next_attempt=UNIX_TIMESTAMP() + ? WHERE id=? AND name=?;',
+            (delay, post_id, username))
+        self._commit()
+
+    @_connected
+    def assign_subreddit(self, subreddit: str) -> int:
+        """Assigns posts and points saved before the bot ran in several subreddits to a subreddit and returns how many
+        rows were assigned"""
+        self._flush(savepoints=True)
+
+        assigned = 0
+        for table in ('posts', 'users', 'points_ledger'):
+            self._cur.execute(f"UPDATE {table} SET subreddit=? WHERE subreddit='';", (subreddit,))
+            assigned += self._cur.rowcount
+
+        self._commit()
+        return assigned
+
+    @_connected
+    def acquire_lease(self, name: str, holder: str, duration: int) -> bool:
+        """
+        Takes a lease for ``duration`` seconds, or extends it if the holder already has it, and returns whether the
+        holder has it now. A lease held by someone else can only be taken once it expires.
+        """
+        self._flush(savepoints=True)
+
+        self._cur.execute(f'{self._insert_ignore} INTO leases VALUES (?, ?, UNIX_TIMESTAMP() + ?);',
+                          (name, holder, duration))
+        self._cur.execute(
+            'UPDATE leases SET holder=?, expires=UNIX_TIMESTAMP() + ? '
+            'WHERE name=? AND (holder=? OR expires < UNIX_TIMESTAMP());', (holder, duration, name, holder))
+        # the row count can't tell us, as extending a lease within the same second doesn't change the row
+        self._cur.execute('SELECT holder FROM leases WHERE name=?;', (name,))
+        held = self._cur.fetchone()[0] == holder
+
+        self._commit()
+        return held
+
+    @_connected
+    def release_lease(self, name: str, holder: str) -> None:
+        """Gives up a lease, if the holder still has it, so someone else can take it right away"""
+        self._flush(savepoints=True)
+        self._cur.execute('DELETE FROM leases WHERE name=? AND holder=?;', (name, holder))
+        self._commit()
+
+    @_connected
+    def get_lease_holders(self, prefix: str) -> Tuple[str, ...]:
+        """Returns the holders of unexpired leases whose names start with ``prefix``, sorted"""
+        self._flush()
+        self._cur.execute(
+            'SELECT holder FROM leases WHERE name LIKE ? AND expires >= UNIX_TIMESTAMP() ORDER BY holder;',
+            (prefix + '%',))
+
+        return tuple(result[0] for result in self._cur.fetchall())
+
+    @_connected
+    def get_schema_version(self) -> int:
+        """Returns the version of the last applied migration, or 0 if migrations were never applied"""
+        try:
+            self._cur.execute('SELECT MAX(version) FROM schema_migrations;')
+        except self._database_errors as e:
+            if self._is_missing_table(e):
+                return 0
+            raise
+
+        results = self._cur.fetchone()
+        return 0 if not results or results[0] is None else results[0]
+
+    @_connected
+    def apply_migration(self, version: int, statements: Sequence[str]) -> None:
+        """
+        Executes a migration's statements and marks it as applied.
+        MySQL commits schema changes right away, so a migration failing halfway has to be fixed by hand.
+        """
+        # some DDL statements can't be prepared, so they go through a regular cursor
+        cur = self._cnx.cursor()
+        try:
+            for statement in statements:
+                cur.execute(statement)
+        finally:
+            cur.close()
+
+        self._cur.execute('INSERT INTO schema_migrations VALUES (?, UNIX_TIMESTAMP());', (version,))
+        self._cnx.commit()
+
+
+def from_config(config: 'BotConfig', username: Optional[str] = None, password: Optional[str] = None,
+                hostname: Optional[str] = None) -> DatabaseHelper:
+    """
+    Creates the helper of the storage backend selected in the config
+
+    :param username: MySQL user, not used by SQLite
+    :param password: MySQL user's password, not used by SQLite
+    :param hostname: MySQL server's address, not used by SQLite
+    """
+    settings = config.database
+    options = dict(cache_size=config.post_cache.size, cache_ttl=config.post_cache.ttl,
+                   pool_size=settings.pool_size, retries=settings.retries)
+
+    # backends are imported only when used, so a deployment only needs the driver of the one it uses
+    if settings.backend == 'mysql':
+        from .mysql_helper import MySQLDatabaseHelper
+        return MySQLDatabaseHelper(username, password, hostname, **options)
+    elif settings.backend == 'sqlite':
+        from .sqlite_helper import SQLiteDatabaseHelper
+        return SQLiteDatabaseHelper(settings.path, **options)
+
+    raise ValueError(f"Unknown database backend: {settings.backend}. Must be one of: mysql, sqlite")
@@ -0,0 +1,206 @@
+"""
+Deadlines of posts waiting to age
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from heapq import heappop, heappush
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import metrics_helper
+from .config_helper import AGING_SETTINGS, ConfigStore
+from .database_helper import DatabaseHelper
+
+logger = logging.getLogger(__name__)
+
+# statuses which posts leave on their own after a while
+AGING = tuple(AGING_SETTINGS)
+
+# posts saved by other processes are picked up on the next sync, but a transaction could've been committed a bit
+# after its posts were saved, so every sync also looks this many seconds back
+_SYNC_OVERLAP = 300
+# how often (in seconds) all posts are loaded again, so posts taken out of the queue by a sweep which then failed
+# aren't forgotten
+_FULL_SYNC_INTERVAL = 3600
+
+_pending = metrics_helper.gauge('wtw_aging_posts', "Posts waiting to age, by their status", ('status',))
+
+
+class DeadlineQueue:
+    """
+    Keeps posts waiting to age in a heap ordered by the time they're due, so the aging sweeps know which posts are due
+    and when the next one will be without scanning the posts table. Posts are added as they're saved with an aging
+    status, and the ones saved by other processes are picked up by ``sync()``.
+    """
+
+    def __init__(self, config: ConfigStore):
+        """
+        :param config: Holds the config, whose subreddits have the times posts take to age
+        """
+        self._config = config
+
+        # status -> heap of (deadline, post ID). when a post's deadline changes, the old entry is left in the heap and
+        # skipped once it gets to the top, as it doesn't match the post's entry anymore
+        self._heaps: Dict[str, List[Tuple[float, str]]] = {status: [] for status in AGING}
+        # post ID -> (status, deadline) of every post waiting to age
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        # status -> when posts with it were last synced from and when they were all loaded
+        self._synced_since: Dict[str, float] = {}
+        self._fully_synced_at: Dict[str, float] = {}
+
+        # called with the status when a post becomes the next one due, so that status' sweep can be woken up
+        self.on_earlier: Optional[Callable[[str], None]] = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def schedule(self, post_id: str, status: str, subreddit: str, saved_at: Optional[float] = None) -> None:
+        """
+        Sets a post's deadline after it was saved with a status. A post saved with a status which doesn't age is
+        dropped from the queue.
+
+        :param saved_at: When the post was saved, if not just now
+        """
+        if status not in AGING:
+            with self._lock:
+                self._entries.pop(post_id, None)
+            return
+
+        threshold = self._config.current.subreddits[subreddit.lower()].aging[status]
+        deadline = (time.time() if saved_at is None else saved_at) + threshold
+        self._push(post_id, status, deadline)
+
+    def postpone(self, post_id: str, status: str, delay: float) -> None:
+        """Puts a post which was due back into the queue, to be due again in ``delay`` seconds"""
+        self._push(post_id, status, time.time() + delay)
+
+    def _push(self, post_id: str, status: str, deadline: float) -> None:
+        with self._lock:
+            if self._entries.get(post_id) == (status, deadline):
+                return
+
+            self._entries[post_id] = (status, deadline)
+            first = self._peek(status)
+            earlier = first is None or deadline < first
+            heappush(self._heaps[status], (deadline, post_id))
+
+        if earlier and self.on_earlier is not None:
+            self.on_earlier(status)
+
+    def _peek(self, status: str) -> Optional[float]:
+        """Returns the earliest deadline of a status, dropping outdated entries on the way. Needs the lock"""
+        heap = self._heaps[status]
+
+        while heap:
+            deadline, post_id = heap[0]
+            if self._entries.get(post_id) == (status, deadline):
+                return deadline
+            heappop(heap)
+
+        return None
+
+    def next_deadline(self, status: str) -> Optional[float]:
+        """Returns the time (as a UNIX timestamp) when the next post with a status is due, or None if there are none"""
+        with self._lock:
+            return self._peek(status)
+
+    def pop_due(self, status: str) -> List[str]:
+        """Takes all posts with a status which are due out of the queue and returns their IDs, earliest first"""
+        now = time.time()
+        due = []
+
+        with self._lock:
+            while (deadline := self._peek(status)) is not None and deadline <= now:
+                _, post_id = heappop(self._heaps[status])
+                del self._entries[post_id]
+                due.append(post_id)
+
+        return due
+
+    def snapshot(self) -> dict:
+        """Returns the posts waiting to age and how far they were synced, for a warm start"""
+        with self._lock:
+            entries = [(post_id, status, deadline) for post_id, (status, deadline) in self._entries.items()]
+
+        return {'entries': entries, 'synced_since': dict(self._synced_since),
+                'fully_synced_at': dict(self._fully_synced_at), 'aging': self._aging_times()}
+
+    def _aging_times(self) -> Dict[str, Dict[str, float]]:
+        """Returns how long posts take to age in every subreddit, by status"""
+        return {subreddit: dict(config.aging) for subreddit, config in self._config.current.subreddits.items()}
+
+    def restore(self, state: dict) -> int:
+        """Takes posts waiting to age over from a snapshot and returns how many were taken over. The next sync only
+        loads the posts saved since the snapshot was taken, unless a full one is due anyway. A snapshot taken with
+        other aging times isn't used, as its deadlines don't follow them"""
+        if state['aging'] != self._aging_times():
+            return 0
+
+        restored = 0
+
+        for post_id, status, deadline in state['entries']:
+            if status in AGING:
+                self._push(post_id, status, deadline)
+                restored += 1
+
+        for status in AGING:
+            if status in state['synced_since'] and status in state['fully_synced_at']:
+                self._synced_since[status] = state['synced_since'][status]
+                self._fully_synced_at[status] = state['fully_synced_at'][status]
+
+        return restored
+
+    def resync(self) -> None:
+        """Makes the next sync of every status load all of its posts again, e.g. so their deadlines follow changed
+        aging times"""
+        self._fully_synced_at.clear()
+
+    def sync(self, db: DatabaseHelper, statuses: Iterable[str] = AGING) -> int:
+        """Adds posts saved with the statuses since their last sync (or all of them, every once in a while) and
+        returns how many were added"""
+        added = 0
+
+        for status in statuses:
+            started = time.time()
+            since = self._synced_since.get(status)
+
+            if since is None or started - self._fully_synced_at.get(status, 0) >= _FULL_SYNC_INTERVAL:
+                since = 0
+                self._fully_synced_at[status] = started
+
+            for subreddit in self._config.current.subreddits:
+                for post_id, saved_at in db.get_post_timestamps(status, subreddit, since=since):
+                    self.schedule(post_id, status, subreddit, saved_at=saved_at)
+                    added += 1
+
+            self._synced_since[status] = started - _SYNC_OVERLAP
+
+        with self._lock:
+            counts = {status: 0 for status in AGING}
+            for status, _ in self._entries.values():
+                counts[status] += 1
+        for status, count in counts.items():
+            _pending.set(count, status=status)
+
+        return added
@@ -0,0 +1,113 @@
+"""
+Helpers for keeping user flairs in sync with their points
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from praw import Reddit
+from prawcore import PrawcoreException
+from praw.exceptions import PRAWException
+
+from .config_helper import ConfigStore
+
+logger = logging.getLogger(__name__)
+
+
+class UserFlairHelper:
+    """Collects user flair updates during a routine pass and applies only the ones that change the flair"""
+
+    def __init__(self, reddit: Reddit, config: ConfigStore):
+        """
+        :param config: Holds the config, whose subreddits have the flair tiers
+        """
+        self._reddit = reddit
+        self._config = config
+
+        # (subreddit, username) -> points, for flairs which weren't applied yet
+        self._pending: Dict[Tuple[str, str], int] = {}
+        # (subreddit, username) -> (text, template ID) of the flair applied last
+        self._applied: Dict[Tuple[str, str], Tuple[str, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def render(self, points: int, subreddit: str) -> Tuple[str, Optional[str]]:
+        """Returns the text and the template ID of a subreddit's flair for a user with this many points"""
+        return self._config.current.subreddits[subreddit.lower()].user_flairs.render(points)
+
+    def queue(self, username: str, points: int, subreddit: str) -> None:
+        """Queues a user's flair in a subreddit to be updated on the next ``flush()``. Only the last update of a user
+        is applied"""
+        with self._lock:
+            self._pending[(subreddit.lower(), username)] = points
+
+    def snapshot(self) -> dict:
+        """Returns the queued flairs and the ones applied last, for a warm start"""
+        with self._lock:
+            return {'pending': [(subreddit, username, points)
+                                for (subreddit, username), points in self._pending.items()],
+                    'applied': [(subreddit, username, text, template_id)
+                                for (subreddit, username), (text, template_id) in self._applied.items()]}
+
+    def restore(self, state: dict) -> None:
+        """Takes queued and applied flairs over from a snapshot. Flairs queued since are kept"""
+        subreddits = self._config.current.subreddits
+
+        with self._lock:
+            for subreddit, username, points in state['pending']:
+                if subreddit in subreddits:
+                    self._pending.setdefault((subreddit, username), points)
+            for subreddit, username, text, template_id in state['applied']:
+                if subreddit in subreddits:
+                    self._applied.setdefault((subreddit, username), (text, template_id))
+
+    def flush(self) -> int:
+        """
+        Applies queued flairs which differ from the ones applied last and returns how many were applied.
+        Flairs which couldn't be applied stay queued for the next flush.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        applied = 0
+
+        for (subreddit, username), points in pending.items():
+            flair = self.render(points, subreddit)
+
+            if self._applied.get((subreddit, username)) == flair:
+                continue
+
+            text, template_id = flair
+            try:
+                self._reddit.subreddit(self._config.current.subreddits[subreddit].name).flair.set(
+                    redditor=username, text=text, flair_template_id=template_id)
+            except (PRAWException, PrawcoreException) as e:
+                logger.error(f"Couldn't update {username}'s flair in r/{subreddit}. {e}")
+                with self._lock:
+                    # a newer update might have been queued in the meantime
+                    self._pending.setdefault((subreddit, username), points)
+                continue
+
+            self._applied[(subreddit, username)] = flair
+            applied += 1
+
+        return applied
@@ -0,0 +1,135 @@
+"""
+Cache of the accounts the bot has to recognise
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Union
+
+from praw import Reddit, models
+from praw.exceptions import PRAWException
+from prawcore import PrawcoreException
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(user: Union[str, models.Redditor, None]) -> str:
+    """Returns a user's name in the form used for comparisons. Reddit's usernames aren't case-sensitive"""
+    if user is None:
+        return ''
+    return (user if isinstance(user, str) else user.name).lower()
+
+
+class IdentityCache:
+    """Keeps the subreddits' moderators and the bot's own name, refreshing the moderators in the background"""
+
+    def __init__(self, reddit: Reddit, subreddits: Iterable[str], ttl: float):
+        """
+        :param subreddits: Subreddits whose moderators should be kept
+        :param ttl: How often (in seconds) the moderators are fetched again
+        """
+        self._reddit = reddit
+        self._subreddits = tuple(subreddits)
+        self._ttl = ttl
+
+        # normalized subreddit name -> its mods. replaced as a whole on every refresh, so readers never see a
+        # half-updated list
+        self._mods: Dict[str, FrozenSet[str]] = {}
+        self._bot_name: Optional[str] = None
+        # when (as a UNIX timestamp) the moderators were last fetched
+        self._refreshed_at = 0.0
+        self._stopped = threading.Event()
+
+    def mods(self, subreddit: str) -> FrozenSet[str]:
+        """Normalized names of a subreddit's moderators"""
+        return self._mods.get(subreddit.lower(), frozenset())
+
+    @property
+    def bot_name(self) -> str:
+        """Name of the bot's account, fetched only once"""
+        if self._bot_name is None:
+            self._bot_name = self._reddit.user.me().name
+        return self._bot_name
+
+    @property
+    def stale(self) -> bool:
+        """Whether the moderators are due to be fetched again"""
+        return time.time() - self._refreshed_at >= self._ttl
+
+    def is_mod(self, user: Union[str, models.Redditor, None], subreddit: str) -> bool:
+        """Checks whether a user (a name or a Redditor) moderates a subreddit"""
+        return normalize_name(user) in self.mods(subreddit)
+
+    def is_bot(self, user: Union[str, models.Redditor, None]) -> bool:
+        """Checks whether a user (a name or a Redditor) is the bot itself"""
+        return normalize_name(user) == normalize_name(self.bot_name)
+
+    def refresh(self) -> None:
+        """Fetches the subreddits' moderators again"""
+        all_mods = {}
+
+        # moderator lists can't be combined like listings can, so every subreddit takes a request
+        for subreddit in self._subreddits:
+            mods = frozenset(normalize_name(mod) for mod in self._reddit.subreddit(subreddit).moderator())
+
+            if mods != self._mods.get(subreddit.lower()):
+                logger.info(f"Moderators of r/{subreddit}: {', '.join(sorted(mods))}")
+            all_mods[subreddit.lower()] = mods
+
+        self._mods = all_mods
+        self._refreshed_at = time.time()
+
+    def snapshot(self) -> dict:
+        """Returns the bot's name and the moderators, for a warm start"""
+        return {'bot_name': self._bot_name, 'refreshed_at': self._refreshed_at,
+                'mods': {subreddit: sorted(mods) for subreddit, mods in self._mods.items()}}
+
+    def restore(self, state: dict) -> None:
+        """Takes the bot's name and the moderators over from a snapshot. Moderators of subreddits which aren't kept
+        anymore are left out, and if any are missing, the moderators are ``stale``"""
+        self._bot_name = self._bot_name or state['bot_name']
+
+        mods = {subreddit: frozenset(state['mods'][subreddit]) for subreddit in map(str.lower, self._subreddits)
+                if subreddit in state['mods']}
+        if len(mods) == len(self._subreddits):
+            self._mods = mods
+            self._refreshed_at = state['refreshed_at']
+
+    def start(self) -> None:
+        """Starts refreshing the moderators in the background every ``ttl`` seconds"""
+        threading.Thread(target=self._refresh_loop, name="identity-refresh", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops the background refresh"""
+        self._stopped.set()
+
+    def _refresh_loop(self) -> None:
+        # moderators taken over from a snapshot are only as fresh as the snapshot
+        delay = max(self._refreshed_at + self._ttl - time.time(), 0)
+        while not self._stopped.wait(delay):
+            delay = self._ttl
+            try:
+                self.refresh()
+            except (PRAWException, PrawcoreException) as e:
+                # the old list is still good enough, we'll try again next time
+                logger.error(f"Couldn't refresh the moderator list. {e}")
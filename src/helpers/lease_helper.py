@@ -0,0 +1,144 @@
+"""
+Coordination of several bot processes sharing one database
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from functools import wraps
+import logging
+from math import ceil
+import os
+import socket
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from . import metrics_helper
+from .database_helper import DatabaseHelper
+
+logger = logging.getLogger(__name__)
+
+LEADER_LEASE = 'leader'
+WORKER_LEASE_PREFIX = 'worker:'
+
+_leader = metrics_helper.gauge('wtw_leader', "Whether this process is the leader (1) or not (0)")
+_workers = metrics_helper.gauge('wtw_workers', "Bot processes sharing the database, as seen by this one")
+
+
+def default_worker_id() -> str:
+    """Returns an ID telling this process apart from the others: the machine's name and the process' ID"""
+    # the leases' holder column fits 64 characters
+    return f"{socket.gethostname()[:48]}-{os.getpid()}"
+
+
+class WorkerCoordinator:
+    """
+    Lets several bot processes share one database. Every process holds a lease on its own worker entry, which the
+    aging sweeps are split by, and one of them holds the leader lease, making it the only one which follows the
+    streams and sends notifications. Leases are renewed in the background; when a process stops renewing them, the
+    others take its work over once they expire.
+    """
+
+    def __init__(self, db: DatabaseHelper, ttl: float, worker_id: Optional[str] = None):
+        """
+        :param ttl: How long (in seconds) the leases last. They're renewed three times as often
+        :param worker_id: ID of this process, unique among the processes sharing the database
+        """
+        self._db = db
+        # UNIX_TIMESTAMP() only has a resolution of a second
+        self._ttl = max(ceil(ttl), 2)
+        self.worker_id = worker_id or default_worker_id()
+
+        # the leader lease is considered lost a second before it expires in the DB, when it could be taken over
+        self._leader_until = 0.0
+        # sorted IDs of the live processes, including this one
+        self._workers: Tuple[str, ...] = ()
+        self._stopped = threading.Event()
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process holds the leader lease"""
+        return time.monotonic() < self._leader_until
+
+    def partition(self) -> Tuple[int, int]:
+        """Returns the index of this process among the live ones and how many there are, or (0, 0) if this process
+        isn't registered yet"""
+        workers = self._workers
+        if self.worker_id not in workers:
+            return 0, 0
+        return workers.index(self.worker_id), len(workers)
+
+    def owns(self, post_id: str) -> bool:
+        """Checks whether a post falls into this process' share of the aging sweeps"""
+        index, count = self.partition()
+        # hash() of a string differs between processes, but the base 36 ID is already evenly spread
+        return count > 0 and int(post_id, 36) % count == index
+
+    def renew(self) -> None:
+        """Renews this process' leases, tries to become the leader if nobody is, and fetches the live processes"""
+        started = time.monotonic()
+
+        self._db.acquire_lease(WORKER_LEASE_PREFIX + self.worker_id, self.worker_id, self._ttl)
+
+        was_leader = self.is_leader
+        if self._db.acquire_lease(LEADER_LEASE, self.worker_id, self._ttl):
+            self._leader_until = started + self._ttl - 1
+            if not was_leader:
+                logger.info(f"{self.worker_id} is now the leader.")
+        else:
+            self._leader_until = 0.0
+            if was_leader:
+                logger.warning(f"{self.worker_id} lost the leader lease.")
+
+        workers = self._db.get_lease_holders(WORKER_LEASE_PREFIX)
+        if workers != self._workers:
+            logger.info(f"Processes sharing the database: {', '.join(workers)}")
+        self._workers = workers
+
+        _leader.set(int(self.is_leader))
+        _workers.set(len(workers))
+
+    def leader_only(self, routine: Callable) -> Callable:
+        """Wraps a routine, so it only runs while this process is the leader"""
+        @wraps(routine)
+        def wrapper(*args, **kwargs):
+            if self.is_leader:
+                return routine(*args, **kwargs)
+        return wrapper
+
+    def start(self) -> None:
+        """Starts renewing the leases in the background"""
+        threading.Thread(target=self._renew_loop, name="lease-renewal", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops renewing the leases and gives them up, so the other processes take over right away"""
+        self._stopped.set()
+        self._leader_until = 0.0
+
+        self._db.release_lease(LEADER_LEASE, self.worker_id)
+        self._db.release_lease(WORKER_LEASE_PREFIX + self.worker_id, self.worker_id)
+
+    def _renew_loop(self) -> None:
+        while not self._stopped.wait(self._ttl / 3):
+            try:
+                self.renew()
+            except Exception as e:
+                # the leases are still good for a while, we'll try again next time
+                logger.error(f"Couldn't renew the leases. {e}")
@@ -0,0 +1,78 @@
+"""
+Schema migrations
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import logging
+from pathlib import Path
+import re
+from typing import List, Optional, Tuple
+
+from .database_helper import DatabaseHelper
+
+logger = logging.getLogger(__name__)
+
+# migrations are named like 003_posts_status_timestamp_index.sql
+_migration_regex = re.compile(r"^(\d+)_\w+\.sql$")
+
+
+def parse_statements(script: str) -> List[str]:
+    """Splits an SQL script into statements. Statements are separated by semicolons and comments start with '--'"""
+    lines = [line.split('--', 1)[0] for line in script.splitlines()]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def get_migrations(directory: Path) -> List[Tuple[int, str, List[str]]]:
+    """Returns all migrations from a directory as (version, name, statements), sorted by version"""
+    migrations = []
+
+    # a backend added after the last migration doesn't have any yet
+    if not directory.is_dir():
+        return migrations
+
+    for path in directory.iterdir():
+        if not (match := _migration_regex.match(path.name)):
+            continue
+
+        migrations.append((int(match.group(1)), path.stem, parse_statements(path.read_text())))
+
+    migrations.sort()
+    return migrations
+
+
+def migrate(db: DatabaseHelper, directory: Optional[Path] = None) -> int:
+    """
+    Applies all migrations newer than the database's schema and returns how many were applied
+
+    :param directory: Directory to take the migrations from, the backend's own by default
+    """
+    current_version = db.get_schema_version()
+    applied = 0
+
+    for version, name, statements in get_migrations(directory or db.migrations_dir):
+        if version <= current_version:
+            continue
+
+        logger.info(f"Applying migration {name}.")
+        db.apply_migration(version, statements)
+        applied += 1
+
+    return applied
@@ -0,0 +1,94 @@
+"""
+MySQL storage backend
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from typing import Tuple
+
+from mysql.connector import errors, pooling
+
+from .database_helper import DatabaseHelper, SQL_DIR, _BATCHABLE_WRITES
+
+# MySQL's error code for a table that doesn't exist
+_ER_NO_SUCH_TABLE = 1146
+
+
+class MySQLDatabaseHelper(DatabaseHelper):
+    """Keeps the bot's data in the ``WTWbot`` database on a MySQL server"""
+
+    # errors after which the connection can't be trusted anymore, like a server restart or hitting wait_timeout
+    _connection_errors = (errors.OperationalError, errors.InterfaceError)
+    _database_errors = (errors.Error,)
+    _batchable_writes = {
+        **_BATCHABLE_WRITES,
+        'stream': ('INSERT INTO streams (name, fullname) VALUES {} ON DUPLICATE KEY UPDATE fullname=VALUES(fullname);',
+                   '(?, ?)'),
+        'stream_coverage': ('INSERT INTO streams VALUES {} '
+                            'ON DUPLICATE KEY UPDATE fullname=VALUES(fullname), covered_since=VALUES(covered_since);',
+                            '(?, ?, ?)'),
+        'remove_notification': ('DELETE FROM notifications WHERE (id, name) IN ({});', '(?, ?)'),
+        'subscriber': ('INSERT IGNORE INTO subscribers (name, id) VALUES {};', '(?, ?)'),
+        'solved_comment': ('INSERT IGNORE INTO solved_comments VALUES {};', '(?, ?, UNIX_TIMESTAMP())'),
+    }
+    _insert_ignore = 'INSERT IGNORE'
+    migrations_dir = SQL_DIR / 'migrations'
+
+    def __init__(self, username, password, hostname, **kwargs):
+        """Takes the same keyword arguments as ``DatabaseHelper``"""
+        super().__init__(**kwargs)
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name="WTWbot",
+            pool_size=kwargs.get('pool_size', 5),
+            user=username,
+            password=password,
+            host=hostname,
+            database="WTWbot"
+        )
+
+    def _connect(self) -> pooling.PooledMySQLConnection:
+        # the pool pings the connection and reconnects it if it went stale in the meantime
+        return self._pool.get_connection()
+
+    def _cursor(self, cnx: pooling.PooledMySQLConnection):
+        return cnx.cursor(prepared=True)
+
+    def _release(self, cnx: pooling.PooledMySQLConnection) -> None:
+        # this doesn't close the connection, just gives it back to the pool
+        cnx.close()
+
+    def _execute_raw(self, statement: str) -> None:
+        self._cnx.cmd_query(statement)
+
+    def _is_missing_table(self, error: Exception) -> bool:
+        return isinstance(error, errors.ProgrammingError) and error.errno == _ER_NO_SUCH_TABLE
+
+    def _add_points(self, username: str, subreddit: str, difference: int) -> Tuple[int, int]:
+        # points are unsigned, so they're added as signed numbers and kept from going below 0. the update is atomic,
+        # and LAST_INSERT_ID(x) makes the server send x back with the statement's result, so we pack the amounts from
+        # before and after into it (both fit in 32 bits) instead of locking the row and reading it first. that'd take
+        # another round trip, and the gap lock taken for a user who isn't there yet deadlocks with concurrent inserts
+        self._cur.execute(
+            'INSERT INTO users (subreddit, name, points) VALUES (?, ?, LAST_INSERT_ID(GREATEST(?, 0))) '
+            'ON DUPLICATE KEY UPDATE '
+            'points=LAST_INSERT_ID(points << 32 | GREATEST(CAST(points AS SIGNED) + ?, 0)) & 4294967295;',
+            (subreddit, username, difference, difference))
+        amounts = self._cur.lastrowid
+        return amounts >> 32, amounts & 0xFFFFFFFF
@@ -0,0 +1,112 @@
+"""
+The post state machine, which is the only place posts change their status
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import logging
+from typing import Dict, FrozenSet, Optional, TYPE_CHECKING
+
+from praw import models
+
+from . import metrics_helper
+from .database_helper import DatabaseHelper
+
+if TYPE_CHECKING:
+    from .reddit_helper import RedditHelper
+
+logger = logging.getLogger(__name__)
+
+# stands for a status the caller didn't pass, as None is a post which isn't saved
+_UNKNOWN = object()
+
+# status -> statuses a post can move to from it. None is a post the bot hasn't saved yet, e.g. one made before it
+# started. mods can override any post, after which the bot leaves it alone
+TRANSITIONS: Dict[Optional[str], FrozenSet[str]] = {
+    None: frozenset({'unsolved', 'contested', 'solved', 'overridden'}),
+    'unsolved': frozenset({'contested', 'solved', 'abandoned', 'overridden'}),
+    'contested': frozenset({'solved', 'unknown', 'overridden'}),
+    'unknown': frozenset({'contested', 'solved', 'overridden'}),
+    'abandoned': frozenset({'contested', 'solved', 'overridden'}),
+    'solved': frozenset({'overridden'}),
+    'overridden': frozenset(),
+}
+
+_transitions = metrics_helper.counter('wtw_post_transitions_total', "Posts moved to a status, by the status",
+                                      ('status',))
+_skipped = metrics_helper.counter(
+    'wtw_post_transitions_skipped_total', "Transitions which didn't have to change anything or weren't allowed",
+    ('reason',))
+
+
+class PostStateMachine:
+    """Moves posts between statuses, keeping the DB, the post's flair and the post's history in step"""
+
+    def __init__(self, db: DatabaseHelper, rh: 'RedditHelper'):
+        self._db = db
+        self._rh = rh
+
+    def transition(self, submission: models.Submission, status: str, current: Optional[str] = _UNKNOWN,
+                   save_unflaired: bool = False) -> bool:
+        """
+        Moves a post to a status, flairing it to match, and returns whether anything had to be changed. A post which
+        already has the status and its flair costs neither a request nor a write. Transitions which aren't allowed are
+        refused.
+
+        The status is only saved once the flair is applied. If the flair can't be applied, nothing is saved and False
+        is returned, unless ``save_unflaired`` is set; errors from Reddit are passed on.
+
+        :param current: The post's saved status, if the caller has just read it. Otherwise, it's looked up
+        :param save_unflaired: Whether to save the status even if the flair can't be applied, for posts which
+                               nothing would look at again otherwise
+        """
+        if current is _UNKNOWN:
+            current = self._db.check_post(submission.id)
+
+        if status != current and status not in TRANSITIONS[current]:
+            logger.warning(f"Refused to move submission {submission.id} from {current} to {status}.")
+            _skipped.inc(reason='illegal')
+            return False
+
+        # overriding is what mods do with their own flairs, so those are left as they are
+        flair = None if status == 'overridden' else self._rh.config_for(submission).flairs[status]
+        flaired = flair is None or self._rh.check_flair(submission, flair_text=flair.text, flair_id=flair.id)
+
+        if status == current and flaired:
+            _skipped.inc(reason='current')
+            return False
+        elif not flaired and not self._rh.apply_flair(submission, text=flair.text, flair_id=flair.id):
+            _skipped.inc(reason='flair')
+            if not save_unflaired:
+                # the post keeps its status, so the next pass tries again
+                return False
+            logger.warning(f"Saving submission {submission.id} as {status} without its flair.")
+
+        if status != current:
+            sub_name = submission.subreddit.display_name
+            with self._db.batch():
+                self._db.save_post(submission.id, status, sub_name)
+                self._db.add_post_history(submission.id, sub_name, current, status)
+
+            # the aging sweeps find out when the post is due from here
+            self._rh.deadlines.schedule(submission.id, status, sub_name)
+        _transitions.inc(status=status)
+        logger.info(f"Marked submission {submission.id} as {status}.")
+        return True
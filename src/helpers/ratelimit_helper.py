@@ -0,0 +1,173 @@
+"""
+Rate limit budgeting for requests made to Reddit
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from contextlib import contextmanager
+from enum import IntEnum
+from functools import wraps
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+from prawcore import Requestor
+
+from . import metrics_helper
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+_request_duration = metrics_helper.histogram(
+    'wtw_reddit_request_duration_seconds', "How long requests to Reddit take, by endpoint", ('method', 'endpoint'))
+_responses = metrics_helper.counter(
+    'wtw_reddit_responses_total', "Responses from Reddit by endpoint and status code ('error' if there was none)",
+    ('endpoint', 'status'))
+_budget_wait = metrics_helper.histogram(
+    'wtw_ratelimit_wait_seconds', "How long requests waited for their turn in the rate limit budget", ('priority',))
+_budget_remaining = metrics_helper.gauge(
+    'wtw_ratelimit_remaining', "Requests left in the current rate limit window, as reported by Reddit")
+
+# parts of the path which would make every submission, user, etc. its own endpoint
+_path_parameters = (
+    (re.compile(r'/r/[^/]+'), '/r/{subreddit}'),
+    (re.compile(r'/(u|user)/[^/]+'), r'/\1/{user}'),
+    (re.compile(r'/comments/.*'), '/comments/{id}'),
+)
+
+
+def endpoint(url: str) -> str:
+    """Returns the endpoint a URL points to, e.g. /r/{subreddit}/new for https://oauth.reddit.com/r/WhatsTheWord/new"""
+    path = urlsplit(url).path.rstrip('/') or '/'
+    for pattern, replacement in _path_parameters:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class Priority(IntEnum):
+    """How important requests are. Lower values go first"""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+def current_priority() -> Priority:
+    """Returns the priority of requests made by the calling thread"""
+    return getattr(_local, 'priority', Priority.NORMAL)
+
+
+@contextmanager
+def priority(value: Priority):
+    """Sets the priority of requests made by the calling thread inside the block"""
+    previous = current_priority()
+    _local.priority = value
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def with_priority(value: Priority, routine: Callable) -> Callable:
+    """Wraps a routine, so all requests it makes have the specified priority"""
+    @wraps(routine)
+    def wrapper(*args, **kwargs):
+        with priority(value):
+            return routine(*args, **kwargs)
+    return wrapper
+
+
+class RequestBudget:
+    """
+    Keeps track of how many requests we can still make in the current rate limit window, based on the headers Reddit
+    sends back. Once there are only as many requests left as a priority's reserve, requests with that priority wait
+    for the next window, leaving the rest to more important ones.
+    """
+
+    def __init__(self, reserves: Mapping[Priority, int]):
+        """
+        :param reserves: Priority -> how many requests have to be left in the window for a request with this priority
+                         to be made right away
+        """
+        self._reserves: Dict[Priority, int] = {value: reserves.get(value, 0) for value in Priority}
+        self._condition = threading.Condition()
+        # None means we don't know, either because no request was made yet or because the window has just reset
+        self.remaining: Optional[float] = None
+        self.reset_at = 0.0
+
+    def acquire(self) -> None:
+        """Waits until a request with the calling thread's priority can be made and counts it in"""
+        reserve = self._reserves[current_priority()]
+        started = time.perf_counter()
+
+        with self._condition:
+            while self.remaining is not None and self.remaining <= reserve:
+                if (wait := self.reset_at - time.monotonic()) <= 0:
+                    self.remaining = None
+                    break
+
+                logger.debug(f"Holding a {current_priority().name} priority request back for {wait:.1f}s.")
+                self._condition.wait(timeout=wait)
+
+            if self.remaining is not None:
+                # counted up front, so requests made at the same time don't all squeeze into the last slot
+                self.remaining -= 1
+
+        _budget_wait.observe(time.perf_counter() - started, priority=current_priority().name.lower())
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Updates the budget from the rate limit headers of a response"""
+        if 'x-ratelimit-remaining' not in headers or 'x-ratelimit-reset' not in headers:
+            return
+
+        with self._condition:
+            self.remaining = float(headers['x-ratelimit-remaining'])
+            self.reset_at = time.monotonic() + float(headers['x-ratelimit-reset'])
+            self._condition.notify_all()
+
+        _budget_remaining.set(self.remaining)
+
+
+class BudgetedRequestor(Requestor):
+    """Requestor which makes every request to Reddit wait for its turn in a ``RequestBudget``.
+    Passed to PRAW with ``requestor_class``, along with ``requestor_kwargs={'budget': ...}``."""
+
+    def __init__(self, *args, budget: RequestBudget, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._budget = budget
+
+    def request(self, method, url, *args, **kwargs):
+        self._budget.acquire()
+
+        path = endpoint(url)
+        status = 'error'
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            status = str(response.status_code)
+        finally:
+            _request_duration.observe(time.perf_counter() - started, method=method.upper(), endpoint=path)
+            _responses.inc(endpoint=path, status=status)
+
+        self._budget.update(response.headers)
+        return response
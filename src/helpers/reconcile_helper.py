@@ -0,0 +1,298 @@
+"""
+Reconciliation of saved post statuses with the posts on Reddit
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import os
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from praw import Reddit, models
+from praw.exceptions import PRAWException
+from prawcore import PrawcoreException
+
+from . import ratelimit_helper
+from .config_helper import SolvedCrawlConfig
+from .database_helper import DatabaseHelper
+from .reddit_helper import RedditHelper
+
+logger = logging.getLogger(__name__)
+
+# statuses of the saved posts which are looked up; overridden posts are left to the mods
+CHECKED_STATUSES = ('unsolved', 'contested', 'unknown', 'abandoned', 'solved')
+# statuses (None being a post which was never saved) of the posts whose threads are read for a missed solve or reply
+_READ_THREADS = (None, 'unsolved', 'contested', 'unknown', 'abandoned')
+
+# (submission, saved status, status it should have, user who solved it if it was solved in a reply)
+Correction = Tuple[models.Submission, Optional[str], str, Optional[str]]
+
+
+class PostReconciler:
+    """
+    Compares posts made in a date range with what the database has on them and corrects the ones which drifted apart,
+    e.g. because the bot was down while they were posted, solved or replied to. Only what differs is changed, through
+    the same state machine the routines use.
+    """
+
+    def __init__(self, reddit: Reddit, db: DatabaseHelper, rh: RedditHelper, max_workers: int,
+                 batch_size: int = 100):
+        """
+        :param reddit: Reddit which gives every thread its own instance, like ``ThreadLocalReddit``, as the workers
+                       fetch the threads with it
+        :param max_workers: How many threads are read at once
+        :param batch_size: How many posts are looked up and corrected at a time. Reddit returns up to 100 per request
+        """
+        self._reddit = reddit
+        self._db = db
+        self._rh = rh
+        self._max_workers = max_workers
+        self._batch_size = batch_size
+
+    def batches(self, since: float, until: float,
+                skip: Iterable[str] = ()) -> Iterator[Tuple[List[str], List[models.Submission]]]:
+        """
+        Yields the posts created from ``since`` up to ``until`` (both UNIX timestamps) in batches, as (IDs of the posts
+        looked at, the ones which were made in the range). Posts in ``skip`` aren't looked at.
+
+        Reddit only lists the newest thousand or so posts, so older ones are only found if they were saved.
+        """
+        seen: Set[str] = set(skip)
+        batch = []
+
+        for submission in self._reddit.subreddit(self._rh.multireddit).new(limit=None):
+            if submission.created_utc < since:
+                break
+            elif submission.created_utc >= until or submission.id in seen:
+                continue
+
+            seen.add(submission.id)
+            batch.append(submission)
+            if len(batch) == self._batch_size:
+                yield [submission.id for submission in batch], batch
+                batch = []
+
+        if batch:
+            yield [submission.id for submission in batch], batch
+
+        # a post is saved after it's made, so every saved post made in the range was saved since its start
+        saved = list(dict.fromkeys(post_id for subreddit in self._rh.subreddits for status in CHECKED_STATUSES
+                                   for post_id, _ in self._db.get_post_timestamps(status, subreddit, since=since)
+                                   if post_id not in seen))
+
+        for start in range(0, len(saved), self._batch_size):
+            post_ids = saved[start:start + self._batch_size]
+            yield post_ids, [submission for submission in self._rh.get_submissions(post_ids)
+                             if since <= submission.created_utc < until]
+
+    def plan(self, submissions: List[models.Submission]) -> Tuple[List[Correction], List[str]]:
+        """Returns the corrections a batch of posts needs, without changing anything, along with the IDs of the posts
+        whose threads couldn't be read"""
+        statuses = self._db.check_posts(submission.id for submission in submissions)
+        to_read = [submission for submission in submissions
+                   if submission.author is not None and statuses[submission.id] in _READ_THREADS
+                   and submission.num_comments]
+
+        # the workers compare comment authors with the bot, so its name is fetched before they start
+        ignored = {'AutoModerator', self._rh.identity.bot_name}
+        # the priority is set per thread, so the workers have to take it over from us
+        request_priority = ratelimit_helper.current_priority()
+
+        # the submissions belong to this thread's Reddit, so the workers get what they need to fetch them with their own
+        tasks = [(submission.id, submission.author.name, self._rh.config_for(submission).solved_crawl)
+                 for submission in to_read]
+
+        def read(task):
+            with ratelimit_helper.priority(request_priority):
+                return self._read_thread(*task, ignored)
+
+        # every thread takes a request of its own, so they're read side by side
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            threads = dict(zip((post_id for post_id, _, _ in tasks), pool.map(read, tasks)))
+
+        corrections = []
+        unread = []
+        for submission in submissions:
+            if submission.id in threads and threads[submission.id] is None:
+                # the thread couldn't be read, so there's no telling what the post should be
+                unread.append(submission.id)
+                continue
+
+            status = statuses[submission.id]
+            target, solver = self._target(submission, status, threads.get(submission.id, (False, None, False)))
+            if target is not None:
+                corrections.append((submission, status, target, solver))
+
+        return corrections, unread
+
+    def _read_thread(self, post_id: str, op: str, crawl_config: SolvedCrawlConfig,
+                     ignored: Set[str]) -> Optional[Tuple[bool, Optional[str], bool]]:
+        """
+        Reads a thread as deep as the config allows and returns (whether OP said it's solved, the user OP replied to
+        when saying so, whether anyone other than the bot and AutoModerator commented), or None if it couldn't be read
+        """
+        solved, solver, replied = False, None, False
+        # comment fullname -> its author, so the user OP replied to doesn't have to be fetched
+        authors = {}
+
+        try:
+            # fetched with this thread's Reddit. the comments come with the submission, so it's still one request
+            submission = self._reddit.submission(id=post_id)
+            # noinspection PyTypeChecker
+            submission.comments.replace_more(limit=crawl_config.more_limit)
+
+            level = list(submission.comments)
+            for _ in range(crawl_config.max_depth):
+                replies = []
+
+                for comment in level:
+                    if isinstance(comment, models.MoreComments):
+                        continue
+
+                    author = comment.author.name if comment.author else None
+                    authors[comment.fullname] = author
+
+                    if author == op and not solved and self._rh.solved_in_comment(comment):
+                        solved = True
+                        # a reply's parent is always on the level above, so it's been seen already
+                        if (parent := authors.get(comment.parent_id)) != op:
+                            solver = parent
+                    elif author is not None and author not in ignored:
+                        replied = True
+
+                    replies.extend(comment.replies)
+
+                level = replies
+        except (PRAWException, PrawcoreException) as e:
+            logger.error(f"Couldn't read the comments of submission {post_id}. {e}")
+            return None
+
+        return solved, solver, replied
+
+    def _target(self, submission: models.Submission, status: Optional[str],
+                thread: Tuple[bool, Optional[str], bool]) -> Tuple[Optional[str], Optional[str]]:
+        """Returns the status a post should have (None if it's fine as it is) and the user who solved it"""
+        solved, solver, replied = thread
+
+        if submission.author is None or status == 'overridden':
+            # deleted posts aren't worth fixing, and overridden ones are the mods' business
+            return None, None
+        # made a typo earlier, leaving the 'overriden' for backwards compatibility
+        elif any(marker in (submission.link_flair_text or '') for marker in (':overriden:', ':overridden')):
+            return 'overridden', None
+        elif status is None and self._rh.identity.is_mod(submission.author, submission.subreddit.display_name):
+            # mod posts are left alone
+            return 'overridden', None
+        elif solved or (status != 'solved' and self._rh.already_solved(submission)):
+            return 'solved', solver if solved else None
+        elif status in (None, 'unsolved') and replied:
+            return 'contested', None
+        elif status is None:
+            return 'unsolved', None
+
+        flair = self._rh.config_for(submission).flairs[status]
+        if not self._rh.check_flair(submission, flair_text=flair.text, flair_id=flair.id):
+            # only the flair has to be fixed
+            return status, None
+
+        return None, None
+
+    def _apply(self, submission: models.Submission, old_status: Optional[str], status: str,
+               solver: Optional[str]) -> bool:
+        """Makes a single correction and returns whether anything was changed"""
+        if not self._rh.states.transition(submission, status, current=old_status):
+            return False
+        elif status != 'solved' or old_status == 'solved':
+            return True
+
+        sub_name = submission.subreddit.display_name
+        self._rh.notify_subscribers(post_id=submission.id, sub_name=sub_name, title=submission.title,
+                                    permalink=submission.permalink)
+        if solver:
+            points = self._db.modify_points(solver, sub_name, 1, post_id=submission.id)
+            self._rh.user_flairs.queue(solver, points, sub_name)
+        return True
+
+    def apply(self, corrections: List[Correction]) -> List[str]:
+        """Makes the corrections and returns the IDs of the posts which were corrected. Subscribers of posts which turn
+        out to be solved are notified, and the user who solved one gets their point"""
+        applied = []
+
+        for submission, old_status, status, solver in corrections:
+            try:
+                # every post is committed on its own, so one which failed doesn't take the others with it
+                with self._db.batch():
+                    if self._apply(submission, old_status, status, solver):
+                        applied.append(submission.id)
+            except (PRAWException, PrawcoreException) as e:
+                logger.error(f"Couldn't mark submission {submission.id} as {status}. {e}")
+
+        # users who solved several posts get their flair updated just once
+        self._rh.user_flairs.flush()
+        return applied
+
+
+class ReconcileCheckpoint:
+    """Remembers which posts of a date range were reconciled already, so a long run can be stopped and picked up
+    again"""
+
+    def __init__(self, path: str, since: float, until: Optional[float]):
+        """
+        :param path: File the checkpoint is kept in
+        :param since: Start of the range, as it was asked for
+        :param until: Last day of the range, as it was asked for, or None if it goes up to now
+        """
+        self._path = path
+        self._range = [since, until]
+        self.done: Set[str] = set()
+
+    def load(self) -> int:
+        """Takes the reconciled posts over from the file if it's for the same range and returns how many there are"""
+        try:
+            with open(self._path) as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return 0
+
+        if state['range'] != self._range:
+            logger.warning("The checkpoint is for another date range, starting over.")
+            return 0
+
+        self.done = set(state['done'])
+        return len(self.done)
+
+    def save(self, post_ids: Iterable[str]) -> None:
+        """Marks posts as reconciled"""
+        self.done.update(post_ids)
+
+        # written next to the file and swapped in, so stopping halfway through never leaves a broken checkpoint
+        temporary = self._path + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump({'range': self._range, 'done': sorted(self.done)}, file)
+        os.replace(temporary, self._path)
+
+    def clear(self) -> None:
+        """Removes the file once the whole range is reconciled"""
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
@@ -18,40 +18,155 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 ---
 
-Last modified by Xeoth on 18.12.2021
+Last modified by Xeoth on 18.10.2026
                  ^--------^ please change when modifying to comply with the license
 """
 
-from datetime import datetime, timezone
 import logging
+from queue import Empty, SimpleQueue
+import threading
+import weakref
+from . import config_helper
 from .database_helper import DatabaseHelper
-from typing import Tuple, Optional
+from .deadline_helper import DeadlineQueue
+from .flair_helper import UserFlairHelper
+from .identity_helper import IdentityCache
+from .lease_helper import WorkerCoordinator
+from .post_state_helper import PostStateMachine
+from typing import Callable, Iterable, List, Mapping, Optional
 from praw import models, exceptions, Reddit
 
 logger = logging.getLogger(__name__)
 
 
+class _ThreadInstance:
+    """Holds a thread's ``Reddit``, letting it go once the thread is done"""
+    __slots__ = ('reddit', '__weakref__')
+
+    def __init__(self, reddit: Reddit):
+        self.reddit = reddit
+
+
+class ThreadLocalReddit:
+    """
+    Stands in for a ``praw.Reddit``, giving every thread an instance of its own, as PRAW isn't thread-safe. Instances
+    of threads which have finished are handed to the next new thread, so short-lived workers don't each log in again.
+
+    Objects fetched through it (submissions, comments, etc.) keep using the instance of the thread which fetched them,
+    so other threads should be handed their IDs instead.
+    """
+
+    def __init__(self, factory: Callable[[], Reddit]):
+        """
+        :param factory: Creates a new ``Reddit``, e.g. one sharing a ``RequestBudget`` with the others
+        """
+        self._factory = factory
+        self._local = threading.local()
+        self._idle: SimpleQueue = SimpleQueue()
+
+    @property
+    def instance(self) -> Reddit:
+        """The calling thread's ``Reddit``"""
+        if (holder := getattr(self._local, 'holder', None)) is None:
+            try:
+                reddit = self._idle.get_nowait()
+            except Empty:
+                reddit = self._factory()
+
+            holder = self._local.holder = _ThreadInstance(reddit)
+            # the thread's locals are cleared when it finishes, which hands the instance back
+            weakref.finalize(holder, self._idle.put, reddit)
+
+        return holder.reddit
+
+    def __getattr__(self, name):
+        return getattr(self.instance, name)
+
+
 class RedditHelper:
     """Utility class made for working with posts"""
 
-    def __init__(self, db: DatabaseHelper, config, reddit: Reddit):
+    def __init__(self, db: DatabaseHelper, config: config_helper.ConfigStore, reddit: Reddit):
+        """
+        :param config: Holds the config, which can be reloaded while the bot runs
+        """
         self._db = db
         self._config = config
         self._reddit = reddit
+
+        startup_config = config.current
+        self.user_flairs = UserFlairHelper(reddit, config)
+        self.identity = IdentityCache(reddit, [sub_config.name for sub_config in startup_config.subreddits.values()],
+                                      ttl=startup_config.mods_refresh_interval)
+        # every status change goes through here
+        self.states = PostStateMachine(db, self)
+        # other bot processes sharing the database
+        self.workers = WorkerCoordinator(db, ttl=startup_config.workers.lease_ttl)
+        # when the posts waiting to age are due
+        self.deadlines = DeadlineQueue(config)
+        # creation time of the newest unread inbox item looked at, so the ones left unread (e.g. messages from people)
+        # aren't paged through again on every pass
+        self.inbox_checked_until = 0.0
+
+    @property
+    def config(self) -> config_helper.BotConfig:
+        """The current config"""
+        return self._config.current
+
+    @property
+    def subreddits(self) -> Mapping[str, config_helper.SubredditConfig]:
+        """Lower-cased name -> the subreddit's config, with its overrides applied"""
+        return self._config.current.subreddits
+
+    @property
+    def multireddit(self) -> str:
+        """All the subreddits as one listing, so every stream takes a single request no matter how many there are"""
+        return self._config.current.multireddit
+
+    def config_for(self, item) -> config_helper.SubredditConfig:
+        """Returns the config of the subreddit a submission or comment was posted in"""
+        return self._config.current.subreddits[item.subreddit.display_name.lower()]
     
-    def get_posts_with_old_timestamps(self, status=None, second_limit=86400) -> Optional[Tuple[str, ...]]:
+    def get_due_posts(self, status: str) -> List[str]:
         """
-        Fetches posts made before a set amount of seconds and returns them
-        
-        :param status: If provided, will return posts only with this status
-        :param second_limit: How old the posts have to be to get listed
-        :return: Tuple with post IDs
+        Returns IDs of posts which have had a status for long enough to age out of it, as tracked by the deadline
+        queue. When several bot processes share the database, only this process' share is returned; the rest is
+        checked again later, in case its owner stops.
         """
-        old_timestamp = datetime.now().replace(
-            tzinfo=timezone.utc).timestamp() - second_limit
-        
-        return self._db.get_old_posts(old_timestamp, status)
+        self.deadlines.sync(self._db, (status,))
+        due = self.deadlines.pop_due(status)
+        if not due:
+            return []
+
+        # other processes could've changed the posts in the meantime, so the cache can't be trusted here
+        statuses = self._db.check_posts(due)
+        owned = []
+
+        for post_id in due:
+            if statuses[post_id] != status:
+                continue
+            elif self.workers.owns(post_id):
+                owned.append(post_id)
+            else:
+                self.deadlines.postpone(post_id, status, delay=self._config.current.workers.lease_ttl * 2)
+
+        return owned
     
+    def get_submissions(self, post_ids: Iterable[str]) -> List[models.Submission]:
+        """
+        Fetches submissions with the specified IDs, 100 per request, and returns them in the same order.
+        Submissions that don't exist anymore are left out.
+        """
+        post_ids = list(post_ids)
+        # PRAW splits the fullnames into requests of 100 on its own
+        submissions = list(self._reddit.info(fullnames=[f"t3_{post_id}" for post_id in post_ids]))
+
+        if len(submissions) < len(post_ids):
+            found = {submission.id for submission in submissions}
+            logger.warning(f"Couldn't fetch submissions: {', '.join(i for i in post_ids if i not in found)}")
+
+        return submissions
+
     @staticmethod
     def check_flair(submission: models.Submission, flair_text: str, flair_id=None) -> bool:
         """Checks whether the submission has a specified flair"""
@@ -82,27 +197,59 @@ class RedditHelper:
         """Checks whether '!solved' is in the comment"""
         return "!solved" in comment.body.lower()
     
-    def solved_in_comments(self, submission: models.Submission) -> bool:
-        """Looks for comments containing 'solved' made by OP"""
-        # noinspection PyTypeChecker
-        submission.comments.replace_more(limit=None)
+    def solved_in_comments(self, submission: models.Submission, covered_since: Optional[int]) -> bool:
+        """
+        Checks whether OP has commented 'solved' under the submission
+
+        :param covered_since: Since when the comment stream has seen every comment, as returned by
+                              ``DatabaseHelper.get_stream_coverage('comments')``. It's the same for every post, so
+                              it's read once per pass
+        """
+        # OP's solved comments are recorded by check_comments as they come in
+        if self._db.has_solved_comment(submission.id):
+            return True
+
+        # if the comment stream has seen every comment since the submission was posted, there's nothing left to find
+        if covered_since is not None and submission.created_utc >= covered_since:
+            return False
+
+        return self._crawl_for_solved(submission)
+
+    def _crawl_for_solved(self, submission: models.Submission) -> bool:
+        """Looks for comments containing 'solved' made by OP, going only as deep into the thread as the config allows"""
+        if not submission or not submission.author:
+            return False
+
+        crawl_config = self.config_for(submission).solved_crawl
+
         # noinspection PyTypeChecker
-        for comment in submission.comments.list():
-            if not comment or not comment.author or not submission or not submission.author:
-                continue
-            if comment.author.name == submission.author.name and self.solved_in_comment(comment):
-                return True
+        submission.comments.replace_more(limit=crawl_config.more_limit)
+
+        level = list(submission.comments)
+        for _ in range(crawl_config.max_depth):
+            replies = []
+
+            for comment in level:
+                # anything that's still hidden behind a "load more comments" is past our limit
+                if isinstance(comment, models.MoreComments):
+                    continue
+                if comment.author and comment.author.name == submission.author.name and self.solved_in_comment(comment):
+                    return True
+                replies.extend(comment.replies)
+
+            level = replies
+
         return False
     
     def already_solved(self, submission: models.Submission):
         """Checks whether the post is already solved and returns a boolean"""
-        return self.check_flair(submission=submission, flair_text=self._config["flairs"]["solved"]["text"],
-                                flair_id=self._config["flairs"]["solved"]["id"])
+        flair = self.config_for(submission).flairs["solved"]
+        return self.check_flair(submission=submission, flair_text=flair.text, flair_id=flair.id)
 
     def already_contested(self, submission: models.Submission):
         """Checks whether the post is already contested and returns a boolean"""
-        return self.check_flair(submission=submission, flair_text=self._config["flairs"]["contested"]["text"],
-                                flair_id=self._config["flairs"]["contested"]["id"])
+        flair = self.config_for(submission).flairs["contested"]
+        return self.check_flair(submission=submission, flair_text=flair.text, flair_id=flair.id)
     
     def mod_overridden(self, submission: models.Submission) -> bool:
         """Checks whether the submission's flair has been overwritten by a mod and returns a boolean"""
@@ -118,28 +265,25 @@ class RedditHelper:
 
         # made a typo earlier, leaving the 'overriden' for backwards compatibility
         elif any(i in submission.link_flair_text for i in (':overriden:', ':overridden')):
-            self._db.save_post(submission.id, 'overridden')
+            self.states.transition(submission, 'overridden', current=database_status)
             return True
         else:
             return False
 
     def notify_subscribers(self, post_id: str, sub_name: str, title: str, permalink: str):
-        """Notifies post's subscribers that the post was solved."""
-        message = self._config["constants"]["solved_message"].format(
+        """Queues notifications for post's subscribers that the post was solved. They're sent by
+        ``dispatch_notifications``."""
+        constants = self.subreddits[sub_name.lower()].constants
+        message = constants.solved_message.format(
             f"r/{sub_name}",
             title,
             permalink
-        ) + self._config["constants"]["footer"].format(self._reddit.user.me().name)
+        ) + constants.footer.format(self.identity.bot_name)
 
-        subscribers = self._db.get_subscribers(post_id)
-    
-        if not subscribers:
-            return
-
-        for subscriber in subscribers:
-            self._reddit.redditor(subscriber).message(
-                subject="The post you subscribed to was solved!",
-                message=message
-            )
-    
-        self._db.remove_all_subs(post_id)
+        # the notifications are queued in the same transaction the subscribers are removed in
+        with self._db.batch():
+            queued = self._db.queue_notifications(post_id, message)
+            self._db.remove_all_subs(post_id)
+
+        if queued:
+            logger.info(f"Queued {queued} notifications about {post_id} being solved.")
@@ -0,0 +1,126 @@
+"""
+Routine scheduler
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import metrics_helper
+
+logger = logging.getLogger(__name__)
+
+_run_duration = metrics_helper.histogram('wtw_routine_duration_seconds', "How long routine runs take", ('routine',))
+_failures = metrics_helper.counter('wtw_routine_failures_total', "Routine runs which raised an exception",
+                                   ('routine',))
+
+
+class RoutineScheduler:
+    """Runs every routine in its own loop with its own interval, so a slow routine doesn't hold up the others.
+
+    Routines are regular (blocking) functions, so each run is handed off to a worker thread and the event loop only
+    takes care of the timing.
+    """
+
+    def __init__(self, max_concurrent: int = 0):
+        """
+        :param max_concurrent: How many routines can be running at the same time. 0 means there's no limit.
+        """
+        self._max_concurrent = max_concurrent
+        self._routines: List[Tuple[Callable, float, tuple, Optional[Callable[[], Optional[float]]]]] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # routine name -> event which cuts its wait short
+        self._wake_events: Dict[str, asyncio.Event] = {}
+
+    def add(self, routine: Callable, interval: float, *args,
+            next_due: Optional[Callable[[], Optional[float]]] = None) -> None:
+        """
+        Registers a routine which will be called with the provided arguments every ``interval`` seconds
+
+        :param next_due: Returns when (as a UNIX timestamp) the routine next has work to do, or None if it doesn't
+                         know. If that's before the interval is up, the routine runs right then
+        """
+        if interval < 0:
+            raise ValueError("Interval cannot be negative.")
+
+        self._routines.append((routine, interval, args, next_due))
+
+    def wake(self, name: str) -> None:
+        """Makes a routine recheck when it's due, e.g. after something earlier than it was waiting for came up. Can be
+        called from any thread"""
+        if self._loop is not None and (event := self._wake_events.get(name)) is not None:
+            self._loop.call_soon_threadsafe(event.set)
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Waits for a free slot if the amount of concurrently running routines is capped"""
+        if self._semaphore is None:
+            yield
+            return
+
+        async with self._semaphore:
+            yield
+
+    async def _run_routine(self, routine: Callable, interval: float, args: tuple,
+                           next_due: Optional[Callable[[], Optional[float]]]) -> None:
+        loop = asyncio.get_running_loop()
+        wake = self._wake_events[routine.__name__] = asyncio.Event()
+
+        while True:
+            started = loop.time()
+            failed = False
+
+            try:
+                async with self._slot():
+                    with _run_duration.time(routine=routine.__name__):
+                        await asyncio.to_thread(routine, *args)
+            except Exception as e:
+                # one routine failing shouldn't take the others down with it
+                logger.exception(f"{routine.__name__} failed. {e}")
+                _failures.inc(routine=routine.__name__)
+                failed = True
+
+            # waiting until either something wakes the routine up or it's due again, re-checking when it's due after
+            # every wake-up. a failed run waits for the whole interval, so it doesn't retry in a loop
+            while True:
+                wake.clear()
+                # the interval is counted from the start of the run, so a slow run doesn't push the next one back
+                delay = max(interval - (loop.time() - started), 0)
+                if next_due is not None and not failed and (due := next_due()) is not None:
+                    delay = min(delay, max(due - time.time(), 0))
+
+                try:
+                    await asyncio.wait_for(wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    break
+
+    async def run(self) -> None:
+        """Runs all registered routines until cancelled"""
+        if self._max_concurrent > 0:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        self._loop = asyncio.get_running_loop()
+
+        await asyncio.gather(*(self._run_routine(routine, interval, args, next_due)
+                               for routine, interval, args, next_due in self._routines))
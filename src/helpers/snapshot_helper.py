@@ -0,0 +1,130 @@
+"""
+Warm-start snapshot of the bot's in-memory state
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from .database_helper import DatabaseHelper
+from .reddit_helper import RedditHelper
+
+logger = logging.getLogger(__name__)
+
+# bumped whenever the layout changes, so an old snapshot is ignored instead of half-understood
+SNAPSHOT_VERSION = 1
+
+
+class WarmStartSnapshot:
+    """
+    Saves what the bot keeps in memory (the moderators, the cached post statuses, the posts waiting to age and the
+    queued flairs) to a file, so a restarted bot can pick up where it left off instead of fetching all of it from
+    Reddit and the database again. Stream positions aren't part of it, as they're saved in the database already.
+    """
+
+    def __init__(self, path: str, db: DatabaseHelper, rh: RedditHelper, interval: float):
+        """
+        :param path: File the snapshot is kept in. Without one, nothing is saved or loaded
+        :param interval: How often (in seconds) the snapshot is saved in the background
+        """
+        self._path = path
+        self._db = db
+        self._rh = rh
+        self._interval = interval
+        self._stopped = threading.Event()
+        # the background save and the one on shutdown could otherwise write the same temporary file at once
+        self._lock = threading.Lock()
+
+    def save(self) -> None:
+        """Writes the current state to the file"""
+        if not self._path:
+            return
+
+        state = {
+            'version': SNAPSHOT_VERSION,
+            'saved_at': time.time(),
+            'subreddits': list(self._rh.subreddits),
+            'identity': self._rh.identity.snapshot(),
+            'post_cache': self._db.snapshot_cache(),
+            'deadlines': self._rh.deadlines.snapshot(),
+            'user_flairs': self._rh.user_flairs.snapshot(),
+        }
+
+        # written next to the file and swapped in, so a crash halfway through never leaves a broken snapshot
+        temporary = self._path + '.tmp'
+        with self._lock:
+            with open(temporary, 'w') as file:
+                json.dump(state, file)
+            os.replace(temporary, self._path)
+
+    def load(self) -> bool:
+        """Takes the state over from the file and returns whether there was a usable snapshot"""
+        if not self._path:
+            return False
+
+        try:
+            with open(self._path) as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Couldn't read the snapshot, starting cold. {e}")
+            return False
+
+        if state.get('version') != SNAPSHOT_VERSION:
+            logger.info("The snapshot was saved by another version of the bot, starting cold.")
+            return False
+        elif state['subreddits'] != list(self._rh.subreddits):
+            logger.info("The snapshot was saved for other subreddits, starting cold.")
+            return False
+
+        self._rh.identity.restore(state['identity'])
+        cached = self._db.restore_cache(state['post_cache'])
+        deadlines = self._rh.deadlines.restore(state['deadlines'])
+        self._rh.user_flairs.restore(state['user_flairs'])
+
+        logger.info(f"Restored a snapshot from {time.time() - state['saved_at']:.0f} seconds ago with {cached} "
+                    f"cached posts and deadlines of {deadlines} posts.")
+        return True
+
+    def start(self) -> None:
+        """Starts saving the snapshot in the background every ``interval`` seconds"""
+        if self._path:
+            threading.Thread(target=self._save_loop, name="snapshot", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops saving in the background and saves the snapshot one last time"""
+        self._stopped.set()
+        self._try_save()
+
+    def _try_save(self) -> None:
+        try:
+            self.save()
+        except (OSError, TypeError, ValueError) as e:
+            # the last snapshot is still there, so the next start is only a bit colder
+            logger.error(f"Couldn't save the snapshot. {e}")
+
+    def _save_loop(self) -> None:
+        while not self._stopped.wait(self._interval):
+            self._try_save()
@@ -0,0 +1,145 @@
+"""
+SQLite storage backend
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import logging
+from queue import Empty, SimpleQueue
+import sqlite3
+import time
+from typing import Sequence, Tuple
+
+from .database_helper import DatabaseHelper, SQL_DIR, _BATCHABLE_WRITES, _connected
+
+logger = logging.getLogger(__name__)
+
+SQLITE_DIR = SQL_DIR / 'sqlite'
+
+# how long (in seconds) a statement waits for another connection to finish writing before giving up
+_BUSY_TIMEOUT = 30
+
+
+def _greatest(*values):
+    """MySQL's GREATEST(), which returns NULL if any of the values is NULL"""
+    return None if None in values else max(values)
+
+
+class SQLiteDatabaseHelper(DatabaseHelper):
+    """
+    Keeps the bot's data in a single SQLite file, for deployments running on a single machine. The database runs in
+    WAL mode, so readers don't wait for the writer. A new file gets the schema from ``sql/sqlite/schema.sql``.
+    """
+
+    _database_errors = (sqlite3.Error,)
+    # there's no connection to lose, but another connection can hold the write lock for longer than the busy timeout
+    _connection_errors = (sqlite3.OperationalError,)
+    _batchable_writes = {
+        **_BATCHABLE_WRITES,
+        'stream': ('INSERT INTO streams (name, fullname) VALUES {} '
+                   'ON CONFLICT (name) DO UPDATE SET fullname=excluded.fullname;', '(?, ?)'),
+        'stream_coverage': ('INSERT INTO streams VALUES {} '
+                            'ON CONFLICT (name) DO UPDATE SET fullname=excluded.fullname, '
+                            'covered_since=excluded.covered_since;', '(?, ?, ?)'),
+        'remove_notification': ('DELETE FROM notifications WHERE (id, name) IN (VALUES {});', '(?, ?)'),
+        'subscriber': ('INSERT OR IGNORE INTO subscribers (name, id) VALUES {};', '(?, ?)'),
+        'solved_comment': ('INSERT OR IGNORE INTO solved_comments VALUES {};', '(?, ?, UNIX_TIMESTAMP())'),
+    }
+    _insert_ignore = 'INSERT OR IGNORE'
+    migrations_dir = SQLITE_DIR / 'migrations'
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Takes the same keyword arguments as ``DatabaseHelper``
+
+        :param path: Path to the database file, which is created if it doesn't exist
+        """
+        super().__init__(**kwargs)
+        self._path = path
+        # idle connections. how many can be open at once is already limited by the pool size
+        self._idle: SimpleQueue = SimpleQueue()
+
+        self._create_schema()
+
+    def _open(self) -> sqlite3.Connection:
+        cnx = sqlite3.connect(self._path, timeout=_BUSY_TIMEOUT, check_same_thread=False)
+        cnx.execute('PRAGMA journal_mode=WAL;')
+        # in WAL mode, this only risks losing the last transactions on a power loss, not corrupting the database
+        cnx.execute('PRAGMA synchronous=NORMAL;')
+
+        # the queries are shared with MySQL, so SQLite gets the MySQL functions they use
+        cnx.create_function('UNIX_TIMESTAMP', 0, lambda: int(time.time()))
+        cnx.create_function('GREATEST', -1, _greatest, deterministic=True)
+        return cnx
+
+    def _create_schema(self) -> None:
+        """Creates the tables if the database is empty"""
+        cnx = self._open()
+        try:
+            if cnx.execute("SELECT 1 FROM sqlite_master WHERE type='table' LIMIT 1;").fetchone() is None:
+                logger.info(f"Creating the database in {self._path}.")
+                cnx.executescript((SQLITE_DIR / 'schema.sql').read_text())
+        finally:
+            cnx.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            return self._open()
+
+    def _cursor(self, cnx: sqlite3.Connection) -> sqlite3.Cursor:
+        return cnx.cursor()
+
+    def _release(self, cnx: sqlite3.Connection) -> None:
+        # a call which failed halfway could've left its transaction open, holding the write lock
+        if cnx.in_transaction:
+            cnx.rollback()
+        self._idle.put(cnx)
+
+    def _execute_raw(self, statement: str) -> None:
+        self._cnx.execute(statement)
+
+    def _is_missing_table(self, error: Exception) -> bool:
+        return isinstance(error, sqlite3.OperationalError) and str(error).startswith('no such table')
+
+    def _is_retryable(self, error: Exception) -> bool:
+        return str(error).startswith(('database is locked', 'database table is locked'))
+
+    def _add_points(self, username: str, subreddit: str, difference: int) -> Tuple[int, int]:
+        # taking the write lock before reading the amount, so no other connection can change it until we update it
+        if not self._cnx.in_transaction:
+            self._execute_raw('BEGIN IMMEDIATE;')
+        self._cur.execute('SELECT points FROM users WHERE subreddit=? AND name=?;', (subreddit, username))
+        old_points = (self._cur.fetchone() or (0,))[0]
+
+        self._cur.execute(
+            'INSERT INTO users (subreddit, name, points) VALUES (?, ?, GREATEST(?, 0)) '
+            'ON CONFLICT (subreddit, name) DO UPDATE SET points=GREATEST(points + ?, 0) RETURNING points;',
+            (subreddit, username, difference, difference))
+        return old_points, self._cur.fetchone()[0]
+
+    @_connected
+    def apply_migration(self, version: int, statements: Sequence[str]) -> None:
+        """Executes a migration's statements and marks it as applied. Unlike MySQL, SQLite can roll schema changes
+        back, so a migration failing halfway leaves the database as it was"""
+        # the driver only opens transactions before data changes on its own
+        self._execute_raw('BEGIN;')
+        super().apply_migration(version, statements)
@@ -0,0 +1,112 @@
+"""
+Helpers for reading Reddit listings as streams
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import logging
+from typing import Callable, Iterator
+
+from prawcore.exceptions import RequestException, ServerError, TooManyRequests
+
+from . import metrics_helper
+from .database_helper import DatabaseHelper
+
+logger = logging.getLogger(__name__)
+
+_items = metrics_helper.counter('wtw_stream_items_total', "Items processed from every stream", ('stream',))
+# errors which are likely gone by the next pass, like Reddit being down. a routine which gets one of them stops, so the
+# item is tried again; other errors (e.g. Reddit refusing a request) would come up again, so the item is skipped
+TRANSIENT_ERRORS = (RequestException, ServerError, TooManyRequests)
+
+# how many processed items the position is saved after, on top of once at the end of the pass. items processed since
+# the last save are processed again after a crash, which the routines take in their stride
+_SAVE_EVERY = 100
+
+_gaps = metrics_helper.counter(
+    'wtw_stream_gaps_total', "Passes which couldn't reach the last processed item, so items may have been missed",
+    ('stream',))
+
+
+def _id_value(fullname: str) -> int:
+    """Turns a fullname (or a bare ID) into a number which grows with the age of the item"""
+    return int(fullname.rsplit('_', 1)[-1], 36)
+
+
+def new_items(db: DatabaseHelper, stream: str, listing: Callable[..., Iterator], initial_limit: int) -> Iterator:
+    """
+    Yields items from a listing which were added since the last time the stream was processed, oldest first.
+    The stream's position is saved in the DB every ``_SAVE_EVERY`` processed items and once the generator is done, so
+    nothing is skipped, even across restarts, and at most the items processed since the last save are processed again
+    after a crash. If items were missed anyway (because it's the first time the stream is processed or more items came
+    in than Reddit lists), the stream's coverage is moved up to the oldest item we got.
+
+    An item counts as processed once the next one is asked for, so a routine which stops at an item (e.g. on one of
+    the ``TRANSIENT_ERRORS``) gets it again on the next pass, while one which carries on skips it for good. Close the
+    generator (e.g. with ``contextlib.closing``) when you stop early, so the position of the items processed before
+    gets saved. Writes made for an item aren't batched here, so a routine which wants them committed together (and
+    rolled back when it stops at the item) processes every item in a batch of its own.
+
+    :param db: Database helper used for storing stream positions
+    :param stream: Name of the stream, e.g. 'comments'
+    :param listing: A listing method which accepts ``limit``, like ``subreddit.comments``
+    :param initial_limit: How many items to process if the stream was never processed before
+    """
+    position = db.get_stream_position(stream)
+
+    if position is None:
+        # nothing to compare against yet, so we just pick up the most recent items
+        items = list(listing(limit=initial_limit))
+        missed_items = True
+    else:
+        # Reddit's IDs are sequential, so everything newer than our position has a bigger ID. listings go from the
+        # newest item, and PRAW fetches further pages only when we get that far
+        last_processed = _id_value(position)
+        items = []
+        missed_items = False
+
+        for item in listing(limit=None):
+            if _id_value(item.id) <= last_processed:
+                break
+            items.append(item)
+        else:
+            if items:
+                logger.warning(f"Couldn't reach the last processed item in {stream}; some items may have been missed.")
+                missed_items = True
+                _gaps.inc(stream=stream)
+
+    # we haven't seen anything older than the oldest item we got, so that's where our coverage starts
+    covered_since = int(items[-1].created_utc) if missed_items and items else None
+    # the newest processed item whose position isn't saved yet
+    unsaved = None
+
+    try:
+        for number, item in enumerate(reversed(items), start=1):
+            yield item
+            # only reached once the item was processed, so the position never moves past an item which wasn't
+            unsaved = item
+            _items.inc(stream=stream)
+
+            if number % _SAVE_EVERY == 0:
+                db.set_stream_position(stream, unsaved.fullname, covered_since)
+                covered_since = unsaved = None
+    finally:
+        if unsaved is not None:
+            db.set_stream_position(stream, unsaved.fullname, covered_since)
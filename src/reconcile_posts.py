@@ -0,0 +1,143 @@
+#  Copyright 2026 Xeoth
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  ---
+#
+#  Last modified by Xeoth on 18.10.2026
+#                   ^--------^ please change when modifying to comply with the license
+
+# Brings the database and the flairs back in line with the posts after the bot was down, e.g.:
+#   python3 reconcile_posts.py --since 2026-10-01 --until 2026-10-03 --dry-run
+
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+from functools import partial
+import logging
+from os import getenv
+import sys
+import time
+
+import praw
+from dotenv import load_dotenv
+
+from helpers import config_helper, database_helper, migration_helper, ratelimit_helper, reddit_helper
+from helpers.reconcile_helper import PostReconciler, ReconcileCheckpoint
+
+
+def _date(value: str) -> float:
+    """Turns a YYYY-MM-DD date into the UNIX timestamp of its start, in UTC"""
+    return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the posts made in a date range with the database and "
+                                                 "corrects the statuses and flairs which drifted apart.")
+    parser.add_argument('--since', type=_date, required=True, help="first day to reconcile (YYYY-MM-DD, UTC)")
+    parser.add_argument('--until', type=_date, default=None, help="last day to reconcile (YYYY-MM-DD, UTC); today "
+                                                                  "by default")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would be corrected")
+    parser.add_argument('--workers', type=int, default=4, help="threads read at once")
+    parser.add_argument('--batch-size', type=int, default=100, help="posts looked up and corrected at a time")
+    parser.add_argument('--batches', type=int, default=None,
+                        help="stop after this many batches; the next run picks up where this one stopped")
+    parser.add_argument('--checkpoint', default='reconcile_checkpoint.json',
+                        help="file the reconciled posts are remembered in")
+    parser.add_argument('--config', default='config.yaml')
+    args = parser.parse_args()
+
+    # the last day is reconciled as a whole
+    until = time.time() if args.until is None else args.until + 86400
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(module)s | %(levelname)s: %(message)s")
+
+    try:
+        config_store = config_helper.ConfigStore.from_file(args.config)
+    except config_helper.ConfigError as e:
+        sys.exit(f"The config is invalid. {e}")
+    config = config_store.current
+
+    # sharing the rate limit with the bot, if it's running, so it keeps the requests it reserves
+    request_budget = ratelimit_helper.RequestBudget(
+        reserves={ratelimit_helper.Priority[name.upper()]: reserve
+                  for name, reserve in config.rate_limit.reserves.items()}
+    )
+    # the threads are read by workers, and PRAW isn't thread-safe, so each of them gets its own instance
+    reddit = reddit_helper.ThreadLocalReddit(partial(
+        praw.Reddit, client_id=getenv('WTW_REDDIT_ID'), client_secret=getenv('WTW_REDDIT_SECRET'),
+        user_agent=f"{config.home_subreddit}'s WhatsTheWordBot", username=getenv('WTW_REDDIT_USERNAME'),
+        password=getenv('WTW_REDDIT_PASSWORD'), requestor_class=ratelimit_helper.BudgetedRequestor,
+        requestor_kwargs={"budget": request_budget}
+    ))
+
+    db = database_helper.from_config(config, username=getenv("WTW_DB_USERNAME"), password=getenv("WTW_DB_PASSWORD"),
+                                     hostname=getenv("WTW_DB_IP"))
+    migration_helper.migrate(db)
+
+    rh = reddit_helper.RedditHelper(db=db, config=config_store, reddit=reddit)
+    rh.identity.refresh()
+
+    reconciler = PostReconciler(reddit, db, rh, max_workers=args.workers, batch_size=args.batch_size)
+    # the range is remembered as it was asked for, as one which goes up to now ends at a different time on every run
+    checkpoint = ReconcileCheckpoint(args.checkpoint, args.since, args.until)
+    if skipped := checkpoint.load():
+        logging.info(f"Picking up after {skipped} posts reconciled by an earlier run.")
+
+    # (saved status, status it should have) -> how many posts
+    changes = Counter()
+    checked = corrected = 0
+    finished = False
+
+    try:
+        with ratelimit_helper.priority(ratelimit_helper.Priority.LOW):
+            batches = reconciler.batches(args.since, until, skip=checkpoint.done)
+
+            for number, (post_ids, submissions) in enumerate(batches):
+                if args.batches is not None and number >= args.batches:
+                    break
+
+                corrections, unread = reconciler.plan(submissions)
+                for submission, old_status, status, solver in corrections:
+                    change = 'flair only' if status == old_status else f"{old_status} -> {status}"
+                    print(f"{submission.id}  r/{submission.subreddit.display_name}  {change}"
+                          + (f"  (solved by {solver})" if solver else ''))
+                    changes[(old_status, status)] += 1
+
+                if not args.dry_run:
+                    applied = reconciler.apply(corrections)
+                    corrected += len(applied)
+                    # posts which couldn't be read or corrected are left for the next run, and so is everything after
+                    # a dry run
+                    left = set(unread) | {submission.id for submission, _, _, _ in corrections}
+                    checkpoint.save([post_id for post_id in post_ids if post_id not in left] + applied)
+                checked += len(submissions)
+            else:
+                finished = True
+    except KeyboardInterrupt:
+        logging.info("KeyboardInterrupt detected; run again to pick up where this run stopped.")
+
+    if args.dry_run:
+        print(f"\nwould correct {sum(changes.values())} of {checked} posts")
+    else:
+        print(f"\ncorrected {corrected} of {checked} posts")
+    for (old_status, status), count in changes.most_common():
+        print(f"  {old_status} -> {status}: {count}")
+
+    if finished and not args.dry_run:
+        checkpoint.clear()
+
+
+if __name__ == '__main__':
+    main()
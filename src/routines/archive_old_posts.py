@@ -0,0 +1,50 @@
+#  Copyright 2026 Xeoth
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  ---
+#
+#  Last modified by Xeoth on 18.10.2026
+#                   ^--------^ please change when modifying to comply with the license
+
+import logging
+
+import praw
+from helpers.reddit_helper import RedditHelper
+from helpers.database_helper import DatabaseHelper
+from helpers.config_helper import BotConfig
+from helpers import metrics_helper
+
+logger = logging.getLogger(__name__)
+
+# posts which are done changing. overridden ones stay, so a mod's override is never forgotten
+ARCHIVED_STATUSES = ('solved', 'abandoned', 'unknown')
+
+_archived = metrics_helper.counter('wtw_archived_posts_total', "Posts moved to the archive")
+
+
+def archive_old_posts(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config: BotConfig):
+    settings = config.retention
+    archived = 0
+
+    # one batch per transaction, so the bot's own writes get through in between
+    while moved := db.archive_posts(ARCHIVED_STATUSES, older_than=settings.days * 86400,
+                                    limit=settings.batch_size):
+        archived += moved
+        _archived.inc(moved)
+
+        if moved < settings.batch_size:
+            break
+
+    if archived:
+        logger.info(f"Archived {archived} posts older than {settings.days} days.")
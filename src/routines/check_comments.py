@@ -14,110 +14,130 @@
 #
 #  ---
 #
-#  Last modified by Xeoth on 23.02.2021
+#  Last modified by Xeoth on 18.10.2026
 #                   ^--------^ please change when modifying to comply with the license
 
+from contextlib import closing
 import logging
 import praw
-from praw import exceptions
+from praw import exceptions, models
+from prawcore import PrawcoreException
 from helpers.reddit_helper import RedditHelper
 from helpers.database_helper import DatabaseHelper
+from helpers.config_helper import BotConfig, SubredditConfig
+from helpers import stream_helper
 
 
-def check_comments(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config):
+def check_comments(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config: BotConfig):
     logger = logging.getLogger(__name__)
-    subreddit = reddit.subreddit(config["subreddit"])
+    # all the subreddits are read as one multireddit
+    subreddit = reddit.subreddit(rh.multireddit)
     
     # check if any new comments, update submissions accordingly
-    comment_stream = subreddit.comments(limit=50)
-    for comment in comment_stream:
-        # checking whether we have all necessary values, as the post could've been deleted + some prerequisites
-        try:
-            assert comment and comment.author and comment.submission and comment.submission.author
-        except AssertionError:
-            break
-        # much better than a big if!
-        
-        # we don't want to get in the way of mods
-        if comment.author.name == 'AutoModerator':
-            break
-        elif rh.mod_overridden(comment.submission):
-            break
+    with closing(stream_helper.new_items(db, 'comments', subreddit.comments, initial_limit=50)) as comment_stream:
+        for comment in comment_stream:
+            try:
+                # every comment is committed on its own, so a slow request doesn't keep the writes of the others
+                # waiting. most comments don't change anything, and their batches don't commit at all
+                with db.batch():
+                    try:
+                        # flairs and such can be set per subreddit
+                        _check_comment(comment, reddit, db, rh, rh.config_for(comment))
+                    except stream_helper.TRANSIENT_ERRORS:
+                        raise
+                    except (exceptions.PRAWException, PrawcoreException) as e:
+                        # what was written before the error is kept, e.g. a solved comment whose submission is gone
+                        logger.error(f"Couldn't process comment {comment.id}, skipping it. {e}")
+                    except Exception as e:
+                        # a bug hit by a single comment would hit it on every pass, so the stream mustn't get stuck on
+                        # it
+                        logger.exception(f"Unexpected error while processing comment {comment.id}, skipping it. {e}")
+            except stream_helper.TRANSIENT_ERRORS as e:
+                # stopping here rolls back everything written for the comment and leaves it for the next pass
+                logger.error(f"Couldn't process comment {comment.id}, stopping until the next pass. {e}")
+                break
 
-        # on new comments made by OP
-        if comment.author.name == comment.submission.author.name:
-            # if OP's comment is "solved", flair submission as "solved"
-            if not rh.already_solved(comment.submission) and rh.solved_in_comment(comment):
-                try:
-                    # marking post as solved and changing the status in the DB
-                    db.save_post(comment.submission.id, 'solved')
-                    rh.apply_flair(
-                        submission=comment.submission, text=config["flairs"]["solved"]["text"],
-                        flair_id=config["flairs"]["solved"]["id"])
-                    logger.info(f"Marked submission {comment.submission.id} as solved")
-                except exceptions.PRAWException:
-                    logger.error(
-                        f"Couldn't flair submission {comment.submission.id} as 'solved' following OP's new comment.")
+    # users who solved several posts during this pass get their flair updated just once
+    rh.user_flairs.flush()
 
-                # notifying the subscribers about the solve
-                rh.notify_subscribers(
-                    post_id=comment.submission.id,
-                    sub_name=comment.subreddit.display_name,
-                    title=comment.submission.title,
-                    permalink=comment.submission.permalink
-                )
 
-                # no need to store them any further
-                db.remove_all_subs(comment.submission.id)
+def _check_comment(comment: models.Comment, reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper,
+                   config: SubredditConfig):
+    logger = logging.getLogger(__name__)
 
-                # we don't want to assign points when OP replied to themselves (or their submission)
-                if not comment.parent_id.startswith('t3') and \
-                        (parent := reddit.comment(comment.parent_id[3:])).author.name != comment.submission.author.name:
-                    # adding a point to solver's balance
-                    points = db.modify_points(parent.author.name, 1)
-        
-                    # modifying the flair of the person who solved the query
-                    flair_index = 0  # index of the flair template ID on the template array
-    
-                    # if the user has more points than the highest bound, just apply the highest flair
-                    if points >= (flair_bounds := config["user_flairs"]["bounds"])[-1]:
-                        flair_index = len(flair_bounds)
+    if not comment or not comment.author:
+        return
+
+    # the aging sweeps look here before crawling the whole thread. the listing names the submission and its author, so
+    # this is recorded even if fetching the submission fails
+    if comment.author.name == comment.link_author and rh.solved_in_comment(comment):
+        db.add_solved_comment(comment.link_id[3:], comment.id)
+
+    # checking whether we have all necessary values, as the post could've been deleted + some prerequisites
+    try:
+        assert comment.submission and comment.submission.author
+    except AssertionError:
+        return
+    # much better than a big if!
     
-                    for index, bound in enumerate(flair_bounds):
-                        # if user's points are smaller than the bound, then user qualifies for the flair
-                        if points < bound:
-                            flair_index = index
-                            break
+    # we don't want to get in the way of mods, and the bot's own comments (like the subscription prompt) don't count as
+    # anyone answering
+    if comment.author.name == 'AutoModerator' or rh.identity.is_bot(comment.author):
+        return
+    elif rh.mod_overridden(comment.submission):
+        return
+
+    # on new comments made by OP
+    if comment.author.name == comment.submission.author.name:
+        # if OP's comment is "solved", flair submission as "solved"
+        if not rh.already_solved(comment.submission) and rh.solved_in_comment(comment):
+            # we don't want to assign points when OP replied to themselves (or their submission), or to a comment
+            # whose author is deleted. the solver is fetched before the post is flaired, so failing to fetch them
+            # leaves the whole solve for the next pass
+            solver = None
+            if not comment.parent_id.startswith('t3'):
+                parent = reddit.comment(comment.parent_id[3:])
+                if parent.author is not None and parent.author.name != comment.submission.author.name:
+                    solver = parent.author.name
+
+            try:
+                # marking post as solved and changing the status in the DB (the latter only if the former succeeds)
+                solved = rh.states.transition(comment.submission, 'solved')
+            except exceptions.PRAWException:
+                solved = False
+            if not solved:
+                # the aging sweeps find the solved comment and try again
+                logger.error(
+                    f"Couldn't flair submission {comment.submission.id} as 'solved' following OP's new comment.")
+                return
+
+            # notifying the subscribers about the solve, which also stops storing them
+            rh.notify_subscribers(
+                post_id=comment.submission.id,
+                sub_name=comment.subreddit.display_name,
+                title=comment.submission.title,
+                permalink=comment.submission.permalink
+            )
+
+            if solver is not None:
+                # adding a point to solver's balance
+                points = db.modify_points(solver, comment.subreddit.display_name, 1, post_id=comment.submission.id)
     
-                    reddit.subreddit(config["subreddit"]).flair.set(
-                        redditor=parent.author.name,
-                        text=config["user_flairs"]["text"].format(points),
-                        flair_template_id=config["user_flairs"][flair_index]
-                    )
+                # modifying the flair of the person who solved the query, once the whole pass is done
+                rh.user_flairs.queue(solver, points, comment.subreddit.display_name)
 
-            # if OP's comment is not "solved", flair submission as "contested"
-            elif not rh.already_contested(comment.submission) and not rh.already_solved(comment.submission):
-                db.save_post(comment.submission.id, 'contested')
-                rh.apply_flair(submission=comment.submission, text=config["flairs"]["contested"]["text"],
-                               flair_id=config["flairs"]["contested"]["id"])
-                logger.info(f"Marked submission {comment.submission.id} as contested")
+        # if OP's comment is not "solved", flair submission as "contested"
+        elif not rh.already_contested(comment.submission) and not rh.already_solved(comment.submission):
+            rh.states.transition(comment.submission, 'contested')
 
-        # otherwise, if new non-OP comment on an "unknown", "contested" or "unsolved" submission,
-        # flair submission as "contested"
-        else:
-            submission_entry_in_db = db.check_post(
-                comment.submission.id)
-            if (
-                    submission_entry_in_db in ['unknown', 'contested', 'unsolved'] and
-                    comment.submission.link_flair_template_id not in (
-                    config["flairs"]["solved"]["id"],
-                    config["flairs"]["unsolved"]["id"],
-                    config["flairs"]["contested"]["id"])
-            ):
-                db.save_post(comment.submission.id, 'contested')
-                rh.apply_flair(
-                    comment.submission,
-                    config["flairs"]["contested"]["text"],
-                    config["flairs"]["contested"]["id"],
-                )
-                logger.info(f"Marked submission {comment.submission.id} as contested.")
+    # otherwise, if new non-OP comment on an "unknown", "contested" or "unsolved" submission,
+    # flair submission as "contested"
+    else:
+        submission_entry_in_db = db.check_post(
+            comment.submission.id)
+        if (
+                submission_entry_in_db in ['unknown', 'contested', 'unsolved'] and
+                comment.submission.link_flair_template_id not in config.steady_flair_ids
+        ):
+            # a post which is already contested only gets its flair fixed
+            rh.states.transition(comment.submission, 'contested', current=submission_entry_in_db)
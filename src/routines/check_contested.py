@@ -14,52 +14,62 @@
 #
 #  ---
 #
-#  Last modified by Xeoth on 23.02.2021
+#  Last modified by Xeoth on 18.10.2026
 #                   ^--------^ please change when modifying to comply with the license
 
 import logging
 import praw
 from praw import exceptions
+from prawcore import PrawcoreException
 from helpers.reddit_helper import RedditHelper
 from helpers.database_helper import DatabaseHelper
+from helpers.config_helper import BotConfig
 
 
-def check_contested(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config):
+def check_contested(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config: BotConfig):
     logger = logging.getLogger(__name__)
-    old_contested_submissions = db.get_old_posts(status='contested', second_limit=config["contested_to_unknown"])
+    # posts which were contested for long enough, out of this process' share when several processes share the DB
+    old_contested_submissions = rh.get_due_posts('contested')
 
-    if old_contested_submissions is None:
+    if not old_contested_submissions:
         return
 
-    for submission_id in old_contested_submissions:
+    # fetching the submissions up front, up to 100 per request
+    try:
+        submissions = rh.get_submissions(old_contested_submissions)
+    except (exceptions.PRAWException, PrawcoreException) as e:
+        logger.error(f"Couldn't fetch old submissions, trying again later. {e}")
+        # they're out of the queue, so they have to be put back to be tried again
+        for post_id in old_contested_submissions:
+            rh.deadlines.postpone(post_id, 'contested', delay=config.aging.retry_delay)
+        return
+    # the same for every post, so it's read once
+    covered_since = db.get_stream_coverage('comments')
+
+    for submission in submissions:
+        submission_id = submission.id
+        sub_name = submission.subreddit.display_name
         try:
-            # get submission object from id
-            submission = reddit.submission(submission_id)
-        
-            # check comments one last time for potential solve
-            if rh.mod_overridden(submission):
-                break
-            elif rh.solved_in_comments(submission=submission):
-                db.save_post(submission_id, 'solved')
-                rh.apply_flair(
-                    submission=submission, text=config["flairs"]["solved"]["text"],
-                    flair_id=config["flairs"]["solved"]["id"])
-                logger.info(f"Marked submission {submission.id} as solved")
-    
-                rh.notify_subscribers(
-                    title=submission.title,
-                    sub_name=submission.subreddit.display_name,
-                    post_id=submission_id,
-                    permalink=submission.permalink
-                )
-    
-                db.remove_all_subs(submission_id)
-            else:
-                db.save_post(submission_id, 'unknown')
-                rh.apply_flair(
-                    submission=submission, text=config["flairs"]["unknown"]["text"],
-                    flair_id=config["flairs"]["unknown"]["id"])
-                logger.info(f"Marked submission {submission.id} as unknown.")
+            # every submission is committed on its own, and one which failed is rolled back
+            with db.batch():
+                # check comments one last time for potential solve
+                if rh.mod_overridden(submission):
+                    continue
+                elif rh.solved_in_comments(submission=submission, covered_since=covered_since):
+                    # the status was read when the post came due
+                    if not rh.states.transition(submission, 'solved', current='contested'):
+                        continue
+
+                    rh.notify_subscribers(
+                        title=submission.title,
+                        sub_name=sub_name,
+                        post_id=submission_id,
+                        permalink=submission.permalink
+                    )
+                else:
+                    rh.states.transition(submission, 'unknown', current='contested')
 
-        except exceptions.PRAWException as e:
+        except (exceptions.PRAWException, PrawcoreException) as e:
             logger.error(f"Couldn't check old submission {submission_id}. {e}")
+            # it's out of the queue, so it has to be put back to be tried again
+            rh.deadlines.postpone(submission_id, 'contested', delay=config.aging.retry_delay)
@@ -14,13 +14,13 @@
 #
 #  ---
 #
-#  Last modified by Xeoth on 22.02.2021
+#  Last modified by Xeoth on 18.10.2026
 #                   ^--------^ please change when modifying to comply with the license
 
 import praw
-from prawcore import exceptions
 from helpers.reddit_helper import RedditHelper
 from helpers.database_helper import DatabaseHelper
+from helpers.config_helper import BotConfig
 import logging
 import re
 
@@ -28,32 +28,53 @@ logger = logging.getLogger(__name__)
 id_regex = re.compile(r"^[a-z0-9]{6}$")
 
 
-def check_messages(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config):
-    # processing each message and adding subscriptions
-    for message in reddit.inbox.messages(limit=25):
-        # we only have one DM action
-        if message.subject != "subscribe":
+def check_messages(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config: BotConfig):
+    # only unread items are fetched, so the ones handled on earlier passes cost nothing. the newest come first, and
+    # everything older than what we looked at on earlier passes was either handled or left unread on purpose, so we
+    # stop there instead of paging through the items left unread again
+    unread = []
+    for item in reddit.inbox.unread(limit=None):
+        if item.created_utc < rh.inbox_checked_until:
+            break
+        unread.append(item)
+
+    # we only have one DM action. everything else (e.g. messages from people and comment replies) is left unread for
+    # whoever reads the bot's inbox
+    handled = [item for item in unread if item.subject == "subscribe"]
+    if not handled:
+        if unread:
+            rh.inbox_checked_until = unread[0].created_utc
+        return
+
+    # (post ID, username) of every subscription request, oldest first
+    requests = []
+    for item in reversed(handled):
+        if item.author is None or rh.identity.is_bot(item.author):
             continue
         # checking whether the ID makes sense
-        elif not id_regex.match(message.body.strip()):
-            continue
-        elif db.check_subscription(message.body, message.author.name):
-            # user already subscribed
+        elif not id_regex.match(post_id := item.body.strip()):
             continue
-        
-        author = message.author.name
-        
-        # catching 404 errors in case the post doesn't exist
-        submission = reddit.submission(id=message.body)
-        try:
-            if submission.subreddit.display_name != config["subreddit"]:
-                # wrong subreddit, continue
+
+        requests.append((post_id, item.author.name))
+
+    # fetching the submissions up front, up to 100 per request. ones that don't exist anymore are left out
+    submissions = {submission.id: submission
+                   for submission in rh.get_submissions(dict.fromkeys(post_id for post_id, _ in requests))}
+
+    # processing each request and adding subscriptions. a user who's already subscribed is skipped by the DB
+    with db.batch():
+        for post_id, author in requests:
+            submission = submissions.get(post_id)
+
+            if submission is None or submission.subreddit.display_name.lower() not in rh.subreddits:
+                # post doesn't exist or is in the wrong subreddit
                 continue
             elif rh.already_solved(submission):
                 continue
-        except exceptions.NotFound:
-            # post doesn't exist, continue
-            continue
-        
-        db.add_subscriber(submission.id, author)
-        logger.info(f"{author} subscribed to {submission.id}.")
+
+            db.add_subscriber(submission.id, author)
+            logger.info(f"{author} subscribed to {submission.id}.")
+
+    # marking the items read only once the subscriptions are saved, so a pass that failed is retried
+    reddit.inbox.mark_read(handled)
+    rh.inbox_checked_until = unread[0].created_utc
@@ -14,45 +14,76 @@
 #
 #  ---
 #
-#  Last modified by Xeoth on 22.02.2021
+#  Last modified by Xeoth on 18.10.2026
 #                   ^--------^ please change when modifying to comply with the license
-from os import getenv
-
+from contextlib import closing
 import praw
+from praw import exceptions, models
+from prawcore import PrawcoreException
 from helpers.reddit_helper import RedditHelper
 from helpers.database_helper import DatabaseHelper
+from helpers.config_helper import BotConfig
+from helpers import stream_helper
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def check_new(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config):
-    subreddit = reddit.subreddit(config["subreddit"])
+def check_new(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config: BotConfig):
+    # all the subreddits are read as one multireddit
+    subreddit = reddit.subreddit(rh.multireddit)
     
     # log new submissions to database, apply "unsolved" flair
-    submission_stream = subreddit.new(
-        limit=10)  # if you're getting more than 10 new submissions in two seconds, you have a problem
-    for submission in submission_stream:
-        if submission is None or submission.author is None:
-            break
-        elif submission.author in config["mods"]:
-            if db.check_post(submission.id) != 'overridden':
-                logger.info(f"{submission.id} is a mod post, so marking as overridden.")
-                db.save_post(submission.id, 'overridden')
-            break
-        elif rh.mod_overridden(submission):
-            break
-        elif db.check_post(submission.id) is not None:
-            break
-        elif not rh.check_flair(submission=submission, flair_text=config["flairs"]["unsolved"]["text"],
-                                flair_id=config["flairs"]["unsolved"]["id"]):
-            db.save_post(submission.id, 'unsolved')
-            rh.apply_flair(submission, text=config["flairs"]["unsolved"]["text"],
-                           flair_id=config["flairs"]["unsolved"]["id"])
-            logger.info(f"Marked submission {submission.id} as unsolved.")
-
-        # adding the subscription prompt comment
-        message = config["constants"]["sub_comment"]
-        reply = submission.reply(message.format(getenv('WTW_REDDIT_USERNAME'), submission.id))
+    with closing(stream_helper.new_items(db, 'new', subreddit.new, initial_limit=10)) as submission_stream:
+        for submission in submission_stream:
+            try:
+                # every submission is committed on its own, so a slow request doesn't keep the writes of the others
+                # waiting. submissions which don't change anything don't commit at all
+                with db.batch():
+                    try:
+                        _check_submission(submission, db, rh)
+                    except stream_helper.TRANSIENT_ERRORS:
+                        raise
+                    except (exceptions.PRAWException, PrawcoreException) as e:
+                        logger.error(f"Couldn't process new submission {submission.id}, skipping it. {e}")
+                    except Exception as e:
+                        # a bug hit by a single submission would hit it on every pass, so the stream mustn't get
+                        # stuck on it
+                        logger.exception(
+                            f"Unexpected error while processing new submission {submission.id}, skipping it. {e}")
+            except stream_helper.TRANSIENT_ERRORS as e:
+                # stopping here rolls back everything written for the submission and leaves it for the next pass
+                logger.error(f"Couldn't process new submission {submission.id}, stopping until the next pass. {e}")
+                break
+
+
+def _check_submission(submission: models.Submission, db: DatabaseHelper, rh: RedditHelper):
+    if submission is None or submission.author is None:
+        return
+
+    sub_name = submission.subreddit.display_name
+    sub_config = rh.config_for(submission)
+
+    if rh.identity.is_mod(submission.author, sub_name):
+        # mod posts are left alone
+        rh.states.transition(submission, 'overridden')
+        return
+    elif rh.mod_overridden(submission):
+        return
+    elif db.check_post(submission.id) is not None:
+        return
+
+    # a post which already has the flair (e.g. from AutoModerator) is only saved. the stream moves past the post either
+    # way, so it's saved even if flairing it fails, as nothing would look at it again otherwise
+    if not rh.states.transition(submission, 'unsolved', current=None, save_unflaired=True):
+        return
+
+    # adding the subscription prompt comment. the post is flaired already, so the prompt isn't retried, as it could
+    # end up posted twice
+    try:
+        message = sub_config.constants.sub_comment
+        reply = submission.reply(message.format(rh.identity.bot_name, submission.id))
         reply.mod.distinguish(how='yes', sticky=True)
         reply.mod.lock()
+    except (exceptions.PRAWException, PrawcoreException) as e:
+        logger.error(f"Couldn't add the subscription prompt to submission {submission.id}. {e}")
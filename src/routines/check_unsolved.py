@@ -14,52 +14,69 @@
 #
 #  ---
 #
-#  Last modified by Xeoth on 23.02.2021
+#  Last modified by Xeoth on 18.10.2026
 #                   ^--------^ please change when modifying to comply with the license
 
 import praw
+from praw import exceptions, models
+from prawcore import PrawcoreException
 import logging
+from typing import Optional
 from helpers.reddit_helper import RedditHelper
 from helpers.database_helper import DatabaseHelper
+from helpers.config_helper import BotConfig, SubredditConfig
 
 
-def check_unsolved(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config):
+def check_unsolved(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config: BotConfig):
     logger = logging.getLogger(__name__)
-    old_unsolved_submissions = db.get_old_posts(status='unsolved',
-                                                second_limit=config["unsolved_to_abandoned"])
-    
-    if old_unsolved_submissions is None:
+    # posts which were unsolved for long enough, out of this process' share when several processes share the DB
+    old_unsolved_submissions = rh.get_due_posts('unsolved')
+
+    if not old_unsolved_submissions:
+        return
+
+    # fetching the submissions up front, up to 100 per request
+    try:
+        submissions = rh.get_submissions(old_unsolved_submissions)
+    except (exceptions.PRAWException, PrawcoreException) as e:
+        logger.error(f"Couldn't fetch old submissions, trying again later. {e}")
+        # they're out of the queue, so they have to be put back to be tried again
+        for post_id in old_unsolved_submissions:
+            rh.deadlines.postpone(post_id, 'unsolved', delay=config.aging.retry_delay)
+        return
+    # the same for every post, so it's read once
+    covered_since = db.get_stream_coverage('comments')
+
+    for submission in submissions:
+        try:
+            # every submission is committed on its own, and one which failed is rolled back
+            with db.batch():
+                _check_unsolved_submission(submission, db, rh, rh.config_for(submission), covered_since)
+        except (exceptions.PRAWException, PrawcoreException) as e:
+            logger.error(f"Couldn't check old submission {submission.id}. {e}")
+            # it's out of the queue, so it has to be put back to be tried again
+            rh.deadlines.postpone(submission.id, 'unsolved', delay=config.aging.retry_delay)
+
+
+def _check_unsolved_submission(submission: models.Submission, db: DatabaseHelper, rh: RedditHelper,
+                               config: SubredditConfig, covered_since: Optional[int]):
+    # check comments one last time for potential solve
+    if rh.mod_overridden(submission):
         return
 
-    for entry in old_unsolved_submissions:
-        # get submission object from id
-        submission = reddit.submission(id=entry)
-        # check comments one last time for potential solve
-    
-        if rh.mod_overridden(submission):
-            continue
+    if rh.solved_in_comments(submission=submission, covered_since=covered_since) or \
+            rh.check_flair(submission=submission, flair_text=config.flairs["solved"].text,
+                           flair_id=config.flairs["solved"].id):
+        # the status was read when the post came due
+        if not rh.states.transition(submission, 'solved', current='unsolved'):
+            return
 
-        if rh.solved_in_comments(submission=submission) or \
-                rh.check_flair(submission=submission, flair_text=config["flairs"]["solved"]["text"],
-                               flair_id=config["flairs"]["solved"]["id"]):
-            db.save_post(post_id=entry, status='solved')
-            rh.apply_flair(
-                submission=submission, text=config["flairs"]["solved"]["text"],
-                flair_id=config["flairs"]["solved"]["id"])
-            logger.info(f"Marked submission {entry} as solved.")
-    
-            rh.notify_subscribers(
-                title=submission.title,
-                sub_name=submission.subreddit.display_name,
-                post_id=submission.id,
-                permalink=submission.permalink
-            )
-    
-            db.remove_all_subs(submission.id)
+        rh.notify_subscribers(
+            title=submission.title,
+            sub_name=submission.subreddit.display_name,
+            post_id=submission.id,
+            permalink=submission.permalink
+        )
 
-        else:
-            db.save_post(post_id=entry, status='abandoned')
-            rh.apply_flair(
-                submission=submission, text=config["flairs"]["abandoned"]["text"],
-                flair_id=config["flairs"]["abandoned"]["id"])
-            logger.info(f"Marked submission {entry} as abandoned.")
+    else:
+        rh.states.transition(submission, 'abandoned', current='unsolved')
@@ -0,0 +1,115 @@
+#  Copyright 2026 Xeoth
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  ---
+#
+#  Last modified by Xeoth on 18.10.2026
+#                   ^--------^ please change when modifying to comply with the license
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import re
+from typing import Optional, Tuple
+
+import praw
+from praw import exceptions
+from prawcore import PrawcoreException
+from helpers.reddit_helper import RedditHelper
+from helpers.database_helper import DatabaseHelper
+from helpers.config_helper import BotConfig
+from helpers import metrics_helper, ratelimit_helper
+
+logger = logging.getLogger(__name__)
+
+SUBJECT = "The post you subscribed to was solved!"
+
+_due = metrics_helper.gauge('wtw_notifications_due', "Notifications picked up by the last pass")
+_results = metrics_helper.counter('wtw_notifications_total', "Notification attempts by their result", ('result',))
+
+# Reddit says how long its rate limit lasts in the error's message, e.g. "Take a break for 9 minutes before trying
+# again."
+_RATELIMIT_WAIT = re.compile(r'([0-9]+) (millisecond|second|minute)s?')
+_UNIT_SECONDS = {'millisecond': 0, 'second': 1, 'minute': 60}
+# how long to wait if the message doesn't say
+_DEFAULT_RATELIMIT_WAIT = 600
+
+
+def _ratelimit_wait(error: exceptions.RedditAPIException) -> Optional[int]:
+    """Returns how many seconds Reddit wants us to wait for if it refused a request because of its rate limit"""
+    for item in error.items:
+        if item.error_type == 'RATELIMIT':
+            match = _RATELIMIT_WAIT.search(item.message or '')
+            return int(match[1]) * _UNIT_SECONDS[match[2]] + 1 if match else _DEFAULT_RATELIMIT_WAIT
+    return None
+
+
+def _send(reddit: praw.Reddit, username: str, message: str) -> Tuple[str, int]:
+    """
+    Sends a message and returns 'sent', 'retry' if sending should be retried later, 'ratelimited' if it should be
+    retried once Reddit's rate limit is over or 'failed' if it shouldn't be retried, along with how many seconds
+    Reddit wants us to wait for (0 unless it's 'ratelimited')
+    """
+    try:
+        reddit.redditor(username).message(subject=SUBJECT, message=message)
+        return 'sent', 0
+    except exceptions.RedditAPIException as e:
+        if (wait := _ratelimit_wait(e)) is not None:
+            logger.warning(f"Reached Reddit's rate limit while notifying {username}, retrying in {wait}s.")
+            return 'ratelimited', wait
+
+        # Reddit refused the message (the user doesn't exist, doesn't accept messages, etc.), so trying again won't help
+        logger.error(f"Reddit refused to deliver a notification to {username}. {e}")
+        return 'failed', 0
+    except (exceptions.PRAWException, PrawcoreException) as e:
+        logger.warning(f"Couldn't send a notification to {username}. {e}")
+        return 'retry', 0
+
+
+def dispatch_notifications(reddit: praw.Reddit, db: DatabaseHelper, rh: RedditHelper, config: BotConfig):
+    settings = config.notifications
+    due = db.get_due_notifications(limit=settings.batch_size)
+    _due.set(len(due))
+
+    if not due:
+        return
+
+    # the priority is set per thread, so the workers have to take it over from us
+    request_priority = ratelimit_helper.current_priority()
+
+    def send(notification):
+        with ratelimit_helper.priority(request_priority):
+            return _send(reddit, notification[1], notification[2])
+
+    with ThreadPoolExecutor(max_workers=settings.max_workers) as pool:
+        results = list(pool.map(send, due))
+
+    with db.batch():
+        for (post_id, username, _, attempts), (result, wait) in zip(due, results):
+            _results.inc(result=result)
+
+            if result == 'ratelimited':
+                # the message itself is fine, so it's sent no matter how many attempts it took
+                db.postpone_notification(post_id, username, delay=wait)
+                continue
+            elif result == 'retry' and attempts + 1 < settings.max_attempts:
+                # waiting twice as long after every failed attempt
+                db.postpone_notification(post_id, username, delay=settings.retry_delay * 2 ** attempts)
+                continue
+            elif result == 'retry':
+                logger.error(f"Giving up on notifying {username} about {post_id}.")
+
+            db.remove_notification(post_id, username)
+
+    sent = sum(result == 'sent' for result, _ in results)
+    logger.info(f"Sent {sent} out of {len(due)} notifications.")
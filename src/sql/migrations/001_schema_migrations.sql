@@ -0,0 +1,6 @@
+-- keeps track of applied migrations
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version INT UNSIGNED,
+  applied_at INT UNSIGNED NOT NULL,
+  PRIMARY KEY (version)
+);
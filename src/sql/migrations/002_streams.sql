@@ -0,0 +1,8 @@
+-- last processed item of every listing the bot polls (new submissions, comments, messages)
+-- the table was added to schema.sql before the migrations existed, so databases which were upgraded then had to get it
+-- by hand. IF NOT EXISTS leaves those as they are
+CREATE TABLE IF NOT EXISTS streams (
+  name VARCHAR(32),
+  fullname VARCHAR(16) NOT NULL,
+  PRIMARY KEY (name)
+);
@@ -0,0 +1,2 @@
+-- lets the aging sweeps find old posts with a given status without scanning the whole table
+ALTER TABLE posts ADD INDEX status_timestamp (status, timestamp);
@@ -0,0 +1,9 @@
+-- lets the aging sweeps find out whether a post was solved without crawling its comments
+ALTER TABLE streams ADD COLUMN covered_since INT UNSIGNED;
+
+CREATE TABLE IF NOT EXISTS solved_comments (
+  id VARCHAR(7) NOT NULL,
+  comment_id VARCHAR(10) NOT NULL,
+  timestamp INT UNSIGNED NOT NULL,
+  PRIMARY KEY (id, comment_id)
+);
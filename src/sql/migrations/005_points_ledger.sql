@@ -0,0 +1,14 @@
+-- records every change of users' points
+CREATE TABLE IF NOT EXISTS points_ledger (
+  entry_id INT UNSIGNED AUTO_INCREMENT,
+  name VARCHAR(20) NOT NULL,
+  id VARCHAR(7),
+  difference INT NOT NULL,
+  timestamp INT UNSIGNED NOT NULL,
+  PRIMARY KEY (entry_id),
+  INDEX name (name),
+  INDEX id (id)
+);
+
+-- points given out before the ledger existed are carried over as opening balances, so the ledger adds up
+INSERT INTO points_ledger (name, id, difference, timestamp) SELECT name, NULL, points, UNIX_TIMESTAMP() FROM users;
@@ -0,0 +1,10 @@
+-- outbox for messages to subscribers
+CREATE TABLE IF NOT EXISTS notifications (
+  id VARCHAR(7) NOT NULL,
+  name VARCHAR(20) NOT NULL,
+  message TEXT NOT NULL,
+  attempts TINYINT UNSIGNED NOT NULL,
+  next_attempt INT UNSIGNED NOT NULL,
+  PRIMARY KEY (id, name),
+  INDEX next_attempt (next_attempt)
+);
@@ -0,0 +1,14 @@
+-- the bot can run in several subreddits, so posts and points belong to one. rows from before that have an empty
+-- subreddit until the bot assigns them to the first configured one on startup
+ALTER TABLE posts ADD COLUMN subreddit VARCHAR(21) NOT NULL DEFAULT '' AFTER id,
+  DROP INDEX status_timestamp,
+  ADD INDEX subreddit_status_timestamp (subreddit, status, timestamp);
+
+-- every subreddit has its own points
+ALTER TABLE users ADD COLUMN subreddit VARCHAR(21) NOT NULL DEFAULT '' FIRST,
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (subreddit, name);
+
+ALTER TABLE points_ledger ADD COLUMN subreddit VARCHAR(21) NOT NULL DEFAULT '' AFTER entry_id,
+  DROP INDEX name,
+  ADD INDEX subreddit_name (subreddit, name);
@@ -0,0 +1,8 @@
+-- lets several bot processes share the database: the leader holds the 'leader' lease and every running process holds
+-- a 'worker:<id>' one, which the others split the aging sweeps by
+CREATE TABLE IF NOT EXISTS leases (
+  name VARCHAR(64) NOT NULL,
+  holder VARCHAR(64) NOT NULL,
+  expires INT UNSIGNED NOT NULL,
+  PRIMARY KEY (name)
+);
@@ -0,0 +1,11 @@
+-- every status change of a post, as made by the post state machine
+CREATE TABLE IF NOT EXISTS post_history (
+  entry_id INT UNSIGNED AUTO_INCREMENT,
+  id VARCHAR(7) NOT NULL,
+  subreddit VARCHAR(21) NOT NULL,
+  old_status VARCHAR(10),
+  new_status VARCHAR(10) NOT NULL,
+  timestamp INT UNSIGNED NOT NULL,
+  PRIMARY KEY (entry_id),
+  INDEX id (id)
+);
@@ -0,0 +1,9 @@
+-- old posts moved out of the posts table by the maintenance routine, so the table the bot works with stays small
+CREATE TABLE IF NOT EXISTS posts_archive (
+  id VARCHAR(7),
+  subreddit VARCHAR(21) NOT NULL,
+  status VARCHAR(10) NOT NULL,
+  timestamp INT UNSIGNED NOT NULL,
+  archived_at INT UNSIGNED NOT NULL,
+  PRIMARY KEY (id)
+);
@@ -0,0 +1,5 @@
+-- a user can subscribe to a post only once, which also lets lookups by post use the key instead of scanning the table.
+-- duplicates from before are dropped first, keeping the oldest subscription
+DELETE newer FROM subscribers newer
+  JOIN subscribers older ON older.id = newer.id AND older.name = newer.name AND older.internal_id < newer.internal_id;
+ALTER TABLE subscribers ADD UNIQUE KEY id_name (id, name);
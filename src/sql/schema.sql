@@ -16,12 +16,13 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 ---
 
-Last modified by Xeoth on 18.12.2021
+Last modified by Xeoth on 18.10.2026
                  ^--------^ please change when modifying to comply with the license
 */
 
 CREATE TABLE posts (
   id VARCHAR(7),
+  subreddit VARCHAR(21) NOT NULL, -- subreddit the post was made in
   status ENUM (
     'unsolved',
     'abandoned',
@@ -31,13 +32,51 @@ CREATE TABLE posts (
     'solved'
   ) NOT NULL,
   timestamp INT UNSIGNED NOT NULL, -- so that we can wipe old records
+  PRIMARY KEY (id),
+  INDEX subreddit_status_timestamp (subreddit, status, timestamp) -- used when looking for posts due a status change
+);
+
+-- old posts moved out of the posts table by the maintenance routine
+CREATE TABLE posts_archive (
+  id VARCHAR(7),
+  subreddit VARCHAR(21) NOT NULL,
+  status VARCHAR(10) NOT NULL,
+  timestamp INT UNSIGNED NOT NULL, -- when the post was last saved
+  archived_at INT UNSIGNED NOT NULL,
   PRIMARY KEY (id)
 );
 
+-- users' points, which are separate for every subreddit
 CREATE TABLE users (
+  subreddit VARCHAR(21) NOT NULL,
   name VARCHAR(20),
   points INT UNSIGNED NOT NULL,
-  PRIMARY KEY (name)
+  PRIMARY KEY (subreddit, name)
+);
+
+-- every change of users' points. users' points should always add up to the sum of their entries
+CREATE TABLE points_ledger (
+  entry_id INT UNSIGNED AUTO_INCREMENT,
+  subreddit VARCHAR(21) NOT NULL,
+  name VARCHAR(20) NOT NULL, -- username
+  id VARCHAR(7), -- ID of the post the points were awarded for, NULL for manual changes
+  difference INT NOT NULL,
+  timestamp INT UNSIGNED NOT NULL,
+  PRIMARY KEY (entry_id),
+  INDEX subreddit_name (subreddit, name),
+  INDEX id (id)
+);
+
+-- every status change of a post, as made by the post state machine
+CREATE TABLE post_history (
+  entry_id INT UNSIGNED AUTO_INCREMENT,
+  id VARCHAR(7) NOT NULL, -- post ID
+  subreddit VARCHAR(21) NOT NULL,
+  old_status VARCHAR(10), -- NULL when the bot saw the post for the first time
+  new_status VARCHAR(10) NOT NULL,
+  timestamp INT UNSIGNED NOT NULL,
+  PRIMARY KEY (entry_id),
+  INDEX id (id)
 );
 
 -- this one will be used for storing members who subscribe to a thread
@@ -45,5 +84,52 @@ CREATE TABLE subscribers (
   name VARCHAR(20) NOT NULL, -- subscriber username
   id VARCHAR(7) NOT NULL, -- post ID
   internal_id INT UNSIGNED AUTO_INCREMENT, -- internal ID uniquely identifying every record and used for DB maintenance purposes. this should not be accessed from code too often, if at all.
-  PRIMARY KEY (internal_id)
-);
\ No newline at end of file
+  PRIMARY KEY (internal_id),
+  UNIQUE KEY id_name (id, name) -- a user can subscribe to a post only once
+);
+
+-- messages to subscribers waiting to be sent
+CREATE TABLE notifications (
+  id VARCHAR(7) NOT NULL, -- post ID
+  name VARCHAR(20) NOT NULL, -- subscriber username
+  message TEXT NOT NULL,
+  attempts TINYINT UNSIGNED NOT NULL, -- failed attempts at sending the message so far
+  next_attempt INT UNSIGNED NOT NULL, -- the message won't be sent before this time
+  PRIMARY KEY (id, name),
+  INDEX next_attempt (next_attempt)
+);
+
+-- last processed item of every listing the bot polls (new submissions, comments, messages)
+CREATE TABLE streams (
+  name VARCHAR(32), -- stream name
+  fullname VARCHAR(16) NOT NULL, -- fullname (e.g. t1_gx4mc2l) of the newest processed item
+  covered_since INT UNSIGNED, -- creation time of the oldest item after which the stream hasn't missed anything
+  PRIMARY KEY (name)
+);
+
+-- OP comments containing the solved keyword, recorded as they come in through the comment stream
+CREATE TABLE solved_comments (
+  id VARCHAR(7) NOT NULL, -- post ID
+  comment_id VARCHAR(10) NOT NULL,
+  timestamp INT UNSIGNED NOT NULL,
+  PRIMARY KEY (id, comment_id)
+);
+
+-- leases held by the bot's processes. the leader holds 'leader' and every running process holds 'worker:<its ID>'
+CREATE TABLE leases (
+  name VARCHAR(64) NOT NULL,
+  holder VARCHAR(64) NOT NULL, -- ID of the process holding the lease
+  expires INT UNSIGNED NOT NULL, -- the lease can be taken over by another process after this time
+  PRIMARY KEY (name)
+);
+
+-- migrations (from sql/migrations) which were already applied. a fresh database has all of them baked in
+CREATE TABLE schema_migrations (
+  version INT UNSIGNED,
+  applied_at INT UNSIGNED NOT NULL,
+  PRIMARY KEY (version)
+);
+
+INSERT INTO schema_migrations VALUES (1, UNIX_TIMESTAMP()), (2, UNIX_TIMESTAMP()), (3, UNIX_TIMESTAMP()),
+  (4, UNIX_TIMESTAMP()), (5, UNIX_TIMESTAMP()), (6, UNIX_TIMESTAMP()), (7, UNIX_TIMESTAMP()),
+  (8, UNIX_TIMESTAMP()), (9, UNIX_TIMESTAMP()), (10, UNIX_TIMESTAMP()), (11, UNIX_TIMESTAMP());
@@ -0,0 +1,21 @@
+-- the bot can run in several subreddits, so posts and points belong to one. rows from before that have an empty
+-- subreddit until the bot assigns them to the first configured one on startup. like on MySQL, subreddit names are
+-- compared without regard to case
+ALTER TABLE posts ADD COLUMN subreddit VARCHAR(21) NOT NULL DEFAULT '' COLLATE NOCASE;
+DROP INDEX posts_status_timestamp;
+CREATE INDEX posts_subreddit_status_timestamp ON posts (subreddit, status, timestamp);
+
+-- every subreddit has its own points. SQLite can't change a primary key, so the table is rebuilt
+CREATE TABLE users_scoped (
+  subreddit VARCHAR(21) NOT NULL DEFAULT '' COLLATE NOCASE,
+  name VARCHAR(20) NOT NULL,
+  points INTEGER NOT NULL CHECK (points >= 0),
+  PRIMARY KEY (subreddit, name)
+);
+INSERT INTO users_scoped (name, points) SELECT name, points FROM users;
+DROP TABLE users;
+ALTER TABLE users_scoped RENAME TO users;
+
+ALTER TABLE points_ledger ADD COLUMN subreddit VARCHAR(21) NOT NULL DEFAULT '' COLLATE NOCASE;
+DROP INDEX points_ledger_name;
+CREATE INDEX points_ledger_subreddit_name ON points_ledger (subreddit, name);
@@ -0,0 +1,10 @@
+-- every status change of a post, as made by the post state machine
+CREATE TABLE IF NOT EXISTS post_history (
+  entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  id VARCHAR(7) NOT NULL,
+  subreddit VARCHAR(21) NOT NULL COLLATE NOCASE,
+  old_status VARCHAR(10),
+  new_status VARCHAR(10) NOT NULL,
+  timestamp INTEGER NOT NULL
+);
+CREATE INDEX post_history_id ON post_history (id);
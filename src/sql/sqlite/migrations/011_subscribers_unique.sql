@@ -0,0 +1,4 @@
+-- a user can subscribe to a post only once, which also lets lookups by post use the index instead of scanning the
+-- table. duplicates from before are dropped first, keeping the oldest subscription
+DELETE FROM subscribers WHERE internal_id NOT IN (SELECT MIN(internal_id) FROM subscribers GROUP BY id, name);
+CREATE UNIQUE INDEX subscribers_id_name ON subscribers (id, name);
@@ -0,0 +1,133 @@
+/*
+r/WTW Bot's Database Schema for SQLite
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+*/
+
+-- mirrors sql/schema.sql. SQLite doesn't have unsigned or enum types, so those are checked with constraints. index
+-- names are shared by the whole database, so they're prefixed with their table's name
+
+PRAGMA journal_mode=WAL;
+
+CREATE TABLE posts (
+  id VARCHAR(7),
+  subreddit VARCHAR(21) NOT NULL COLLATE NOCASE, -- subreddit the post was made in
+  status TEXT NOT NULL CHECK (status IN ('unsolved', 'abandoned', 'contested', 'unknown', 'overridden', 'solved')),
+  timestamp INTEGER NOT NULL CHECK (timestamp >= 0), -- so that we can wipe old records
+  PRIMARY KEY (id)
+);
+-- used when looking for posts that need to change their status
+CREATE INDEX posts_subreddit_status_timestamp ON posts (subreddit, status, timestamp);
+
+-- old posts moved out of the posts table by the maintenance routine
+CREATE TABLE posts_archive (
+  id VARCHAR(7),
+  subreddit VARCHAR(21) NOT NULL COLLATE NOCASE,
+  status VARCHAR(10) NOT NULL,
+  timestamp INTEGER NOT NULL, -- when the post was last saved
+  archived_at INTEGER NOT NULL,
+  PRIMARY KEY (id)
+);
+
+-- users' points, which are separate for every subreddit
+CREATE TABLE users (
+  subreddit VARCHAR(21) NOT NULL COLLATE NOCASE,
+  name VARCHAR(20) NOT NULL,
+  points INTEGER NOT NULL CHECK (points >= 0),
+  PRIMARY KEY (subreddit, name)
+);
+
+-- every change of users' points. users' points should always add up to the sum of their entries
+CREATE TABLE points_ledger (
+  entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  subreddit VARCHAR(21) NOT NULL COLLATE NOCASE,
+  name VARCHAR(20) NOT NULL, -- username
+  id VARCHAR(7), -- ID of the post the points were awarded for, NULL for manual changes
+  difference INTEGER NOT NULL,
+  timestamp INTEGER NOT NULL
+);
+CREATE INDEX points_ledger_subreddit_name ON points_ledger (subreddit, name);
+CREATE INDEX points_ledger_id ON points_ledger (id);
+
+-- every status change of a post, as made by the post state machine
+CREATE TABLE post_history (
+  entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  id VARCHAR(7) NOT NULL, -- post ID
+  subreddit VARCHAR(21) NOT NULL COLLATE NOCASE,
+  old_status VARCHAR(10), -- NULL when the bot saw the post for the first time
+  new_status VARCHAR(10) NOT NULL,
+  timestamp INTEGER NOT NULL
+);
+CREATE INDEX post_history_id ON post_history (id);
+
+-- this one will be used for storing members who subscribe to a thread
+CREATE TABLE subscribers (
+  name VARCHAR(20) NOT NULL, -- subscriber username
+  id VARCHAR(7) NOT NULL, -- post ID
+  internal_id INTEGER PRIMARY KEY AUTOINCREMENT -- internal ID uniquely identifying every record
+);
+-- a user can subscribe to a post only once
+CREATE UNIQUE INDEX subscribers_id_name ON subscribers (id, name);
+
+-- messages to subscribers waiting to be sent
+CREATE TABLE notifications (
+  id VARCHAR(7) NOT NULL, -- post ID
+  name VARCHAR(20) NOT NULL, -- subscriber username
+  message TEXT NOT NULL,
+  attempts INTEGER NOT NULL, -- failed attempts at sending the message so far
+  next_attempt INTEGER NOT NULL, -- the message won't be sent before this time
+  PRIMARY KEY (id, name)
+);
+CREATE INDEX notifications_next_attempt ON notifications (next_attempt);
+
+-- last processed item of every listing the bot polls (new submissions, comments, messages)
+CREATE TABLE streams (
+  name VARCHAR(32), -- stream name
+  fullname VARCHAR(16) NOT NULL, -- fullname (e.g. t1_gx4mc2l) of the newest processed item
+  covered_since INTEGER, -- creation time of the oldest item after which the stream hasn't missed anything
+  PRIMARY KEY (name)
+);
+
+-- OP comments containing the solved keyword, recorded as they come in through the comment stream
+CREATE TABLE solved_comments (
+  id VARCHAR(7) NOT NULL, -- post ID
+  comment_id VARCHAR(10) NOT NULL,
+  timestamp INTEGER NOT NULL,
+  PRIMARY KEY (id, comment_id)
+);
+
+-- leases held by the bot's processes. the leader holds 'leader' and every running process holds 'worker:<its ID>'
+CREATE TABLE leases (
+  name VARCHAR(64) NOT NULL,
+  holder VARCHAR(64) NOT NULL, -- ID of the process holding the lease
+  expires INTEGER NOT NULL, -- the lease can be taken over by another process after this time
+  PRIMARY KEY (name)
+);
+
+-- migrations (from sql/sqlite/migrations) which were already applied. a fresh database has all of them baked in
+CREATE TABLE schema_migrations (
+  version INTEGER,
+  applied_at INTEGER NOT NULL,
+  PRIMARY KEY (version)
+);
+
+INSERT INTO schema_migrations VALUES (1, strftime('%s', 'now')), (2, strftime('%s', 'now')),
+  (3, strftime('%s', 'now')), (4, strftime('%s', 'now')), (5, strftime('%s', 'now')), (6, strftime('%s', 'now')),
+  (7, strftime('%s', 'now')), (8, strftime('%s', 'now')), (9, strftime('%s', 'now')),
+  (10, strftime('%s', 'now')), (11, strftime('%s', 'now'));
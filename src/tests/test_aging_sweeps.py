@@ -0,0 +1,52 @@
+"""
+Tests of the aging sweeps
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import time
+
+from prawcore.exceptions import ServerError
+import pytest
+
+from routines.check_contested import check_contested
+from routines.check_unsolved import check_unsolved
+
+from benchmarks.bench_routines import CONFIG, SUBREDDIT
+
+
+class _Response:
+    status_code = 503
+
+
+@pytest.mark.parametrize('sweep, status', [(check_unsolved, 'unsolved'), (check_contested, 'contested')])
+def test_posts_are_put_back_when_fetching_them_fails(db, rh, reddit, monkeypatch, sweep, status):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    db.save_post(submission.id, status, SUBREDDIT)
+
+    def info(fullnames=None):
+        raise ServerError(_Response())
+
+    with monkeypatch.context() as patch:
+        patch.setattr(reddit, 'info', info)
+        sweep(reddit, db, rh, CONFIG)
+
+    assert db.check_post(submission.id) == status
+    assert rh.deadlines.next_deadline(status) >= time.time() + CONFIG.aging.retry_delay - 60
@@ -0,0 +1,115 @@
+"""
+Tests of the check_comments routine
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from praw.exceptions import ClientException
+from prawcore.exceptions import ServerError
+import pytest
+
+from routines.check_comments import check_comments
+
+from benchmarks.bench_routines import CONFIG, SUBREDDIT
+from benchmarks.fake_reddit import FakeComment, FakeRedditor
+
+
+class _Response:
+    status_code = 503
+
+
+@pytest.fixture
+def solve(db, reddit):
+    """A saved post, with a stream which stops just before OP says it's solved"""
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    db.save_post(submission.id, 'unsolved', SUBREDDIT)
+    answer = reddit.add_comment(submission, FakeRedditor(reddit, "solver"), "It's this one")
+    db.set_stream_position('comments', answer.fullname)
+
+    reddit.add_comment(submission, FakeRedditor(reddit, "op"), "!solved", parent=answer)
+    return submission
+
+
+def fail_fetching_submissions(monkeypatch, error):
+    def submission(self):
+        raise error
+
+    monkeypatch.setattr(FakeComment, 'submission', property(submission))
+
+
+def test_solve_is_recorded(db, rh, reddit, solve):
+    check_comments(reddit, db, rh, CONFIG)
+
+    assert db.check_post(solve.id) == 'solved'
+    assert db.check_points('solver', SUBREDDIT) == 1
+
+
+def test_solve_of_a_deleted_comment_gives_no_points(db, rh, reddit, solve):
+    reddit.comments_in(SUBREDDIT)[-1].author = None
+    check_comments(reddit, db, rh, CONFIG)
+
+    assert db.check_post(solve.id) == 'solved'
+    assert db.check_points('solver', SUBREDDIT) == 0
+
+
+def test_comment_is_skipped_after_an_unexpected_error(db, rh, reddit, solve, monkeypatch):
+    # a bug would come up again on every pass, so the stream carries on
+    fail_fetching_submissions(monkeypatch, AttributeError("Broken"))
+    check_comments(reddit, db, rh, CONFIG)
+
+    assert db.get_stream_position('comments') == reddit.comments_in(SUBREDDIT)[0].fullname
+
+
+def test_solved_comment_is_recorded_without_the_submission(db, rh, reddit, solve, monkeypatch):
+    # Reddit refusing the request would happen again, so the comment is skipped, but the solve isn't lost
+    fail_fetching_submissions(monkeypatch, ClientException("Refused"))
+    check_comments(reddit, db, rh, CONFIG)
+
+    assert db.has_solved_comment(solve.id)
+    assert rh.solved_in_comments(solve, db.get_stream_coverage('comments'))
+
+
+def test_comment_is_retried_after_a_transient_error(db, rh, reddit, solve, monkeypatch):
+    position = db.get_stream_position('comments')
+
+    with monkeypatch.context() as patch:
+        fail_fetching_submissions(patch, ServerError(_Response()))
+        check_comments(reddit, db, rh, CONFIG)
+
+    assert db.get_stream_position('comments') == position
+    assert not db.has_solved_comment(solve.id)
+
+    check_comments(reddit, db, rh, CONFIG)
+    assert db.check_post(solve.id) == 'solved'
+    assert db.check_points('solver', SUBREDDIT) == 1
+
+
+def test_bot_comments_are_skipped(db, rh, reddit):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    db.save_post(submission.id, 'unsolved', SUBREDDIT)
+    anchor = reddit.add_comment(submission, FakeRedditor(reddit, "a_mod"), "Pinned")
+    db.set_stream_position('comments', anchor.fullname)
+
+    # the subscription prompt
+    submission.reply("Subscribe here")
+    check_comments(reddit, db, rh, CONFIG)
+
+    assert db.check_post(submission.id) == 'unsolved'
+    assert db.get_stream_position('comments') != anchor.fullname
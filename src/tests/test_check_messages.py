@@ -0,0 +1,64 @@
+"""
+Tests of the check_messages routine
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from routines.check_messages import check_messages
+
+from benchmarks.bench_routines import CONFIG, SUBREDDIT
+
+
+def test_only_subscription_requests_are_marked_read(db, rh, reddit):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    request = reddit.add_message("subscriber", "subscribe", submission.id)
+    invalid = reddit.add_message("subscriber", "subscribe", "not an ID")
+    question = reddit.add_message("someone", "Question", "How does this bot work?")
+
+    check_messages(reddit, db, rh, CONFIG)
+
+    assert db.get_subscribers(submission.id) == ("subscriber",)
+    assert not request.new and not invalid.new
+    # left for the people reading the bot's inbox
+    assert question.new
+
+
+def test_requests_from_the_bot_are_skipped(db, rh, reddit):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    reddit.add_message(reddit.user.name, "subscribe", submission.id)
+
+    check_messages(reddit, db, rh, CONFIG)
+    assert db.get_subscribers(submission.id) is None
+
+
+def test_items_left_unread_are_not_listed_again(db, rh, reddit):
+    # more than a page of them
+    for number in range(150):
+        reddit.add_message(f"someone{number}", "Question", "How does this bot work?")
+    check_messages(reddit, db, rh, CONFIG)
+
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    reddit.add_message("subscriber", "subscribe", submission.id)
+    reddit.calls.clear()
+    check_messages(reddit, db, rh, CONFIG)
+
+    assert db.get_subscribers(submission.id) == ("subscriber",)
+    # the questions are older than the request, so the listing isn't read past its first page
+    assert reddit.calls['unread'] == 1
@@ -0,0 +1,76 @@
+"""
+Tests of the config validation
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from helpers import config_helper
+
+EXAMPLE = Path(__file__).resolve().parents[2] / 'config.example.yaml'
+
+
+@pytest.fixture
+def config():
+    with open(EXAMPLE) as file:
+        return yaml.safe_load(file)
+
+
+def test_example_is_valid(config):
+    assert config_helper.from_dict(config).database.backend in config_helper.BACKENDS
+
+
+def test_routine_without_an_interval_is_rejected(config):
+    del config['scheduler']['intervals']['archive_old_posts']
+
+    with pytest.raises(config_helper.ConfigError, match='scheduler.intervals is missing archive_old_posts'):
+        config_helper.from_dict(config)
+
+
+def test_unknown_routine_is_rejected(config):
+    config['rate_limit']['priorities']['check_news'] = 'high'
+
+    with pytest.raises(config_helper.ConfigError, match='check_news'):
+        config_helper.from_dict(config)
+
+
+def test_unknown_priority_is_rejected(config):
+    config['rate_limit']['priorities']['check_new'] = 'urgent'
+
+    with pytest.raises(config_helper.ConfigError, match='rate_limit.priorities.check_new'):
+        config_helper.from_dict(config)
+
+
+def test_reserve_of_an_unknown_priority_is_rejected(config):
+    config['rate_limit']['reserves']['urgent'] = 0
+
+    with pytest.raises(config_helper.ConfigError, match='rate_limit.reserves'):
+        config_helper.from_dict(config)
+
+
+def test_unknown_backend_is_rejected(config):
+    config['database']['backend'] = 'postgres'
+
+    with pytest.raises(config_helper.ConfigError, match='database.backend'):
+        config_helper.from_dict(config)
@@ -0,0 +1,228 @@
+"""
+Tests of the DatabaseHelper's connection pool and reconnecting
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from helpers import database_helper, sqlite_helper
+from helpers.sqlite_helper import SQLiteDatabaseHelper
+
+
+class _Cursor:
+    """Cursor which fails like one on a lost connection once its connection is marked as lost"""
+
+    def __init__(self, cur, db, cnx):
+        self._cur = cur
+        self._db = db
+        self._cnx = cnx
+
+    def execute(self, *args):
+        if self._cnx in self._db.lost:
+            raise ConnectionError("Lost connection to the database")
+        return self._cur.execute(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class FlakyDatabase(SQLiteDatabaseHelper):
+    """SQLite helper whose connections can be lost and which fails to connect a given number of times"""
+
+    _connection_errors = (ConnectionError, *SQLiteDatabaseHelper._connection_errors)
+
+    def __init__(self, path: str, failures: int = 0, **kwargs):
+        self.failures = failures
+        self.opened = 0
+        self.lost = set()
+        super().__init__(path, **kwargs)
+
+    def _open(self):
+        self.opened += 1
+        return super()._open()
+
+    def _connect(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Can't connect to the database")
+        return super()._connect()
+
+    def _is_retryable(self, error):
+        return isinstance(error, ConnectionError) or super()._is_retryable(error)
+
+    def _cursor(self, cnx):
+        return _Cursor(super()._cursor(cnx), self, cnx)
+
+    def _release(self, cnx):
+        # like a pool, a lost connection is thrown away instead of being reused
+        if cnx in self.lost:
+            self.lost.discard(cnx)
+            cnx.close()
+        else:
+            super()._release(cnx)
+
+    def lose_connections(self):
+        """Marks the idle connections as lost"""
+        idle = []
+        while not self._idle.empty():
+            idle.append(self._idle.get_nowait())
+
+        for cnx in idle:
+            self.lost.add(cnx)
+            self._idle.put(cnx)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Delays the helper would've waited before retrying, without waiting"""
+    delays = []
+    monkeypatch.setattr(database_helper.time, 'sleep', delays.append)
+    return delays
+
+
+def test_connection_is_returned_after_a_call(tmp_path):
+    db = FlakyDatabase(str(tmp_path / 'bot.db'))
+
+    db.save_post('abc', 'unsolved', 'Sub')
+    assert db._state.cnx is None and db._state.cur is None
+    assert db._idle.qsize() == 1
+
+    assert db.check_post('abc') == 'unsolved'
+    # one connection to check the schema and one which both calls used
+    assert db.opened == 2
+    assert db._idle.qsize() == 1
+
+
+def test_batch_holds_one_connection(tmp_path):
+    db = FlakyDatabase(str(tmp_path / 'bot.db'))
+
+    with db.batch():
+        cnx = db._state.cnx
+        db.save_post('abc', 'unsolved', 'Sub')
+        assert db.check_post('abc') == 'unsolved'
+        assert db._state.cnx is cnx
+
+    assert db._state.cnx is None
+    assert db._idle.get_nowait() is cnx
+
+
+def test_pool_size_limits_open_connections(tmp_path):
+    db = FlakyDatabase(str(tmp_path / 'bot.db'), pool_size=1)
+    holding, release = threading.Event(), threading.Event()
+    results = []
+
+    def hold():
+        with db.batch():
+            holding.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    holding.wait(5)
+
+    waiter = threading.Thread(target=lambda: results.append(db.check_post('abc')))
+    waiter.start()
+    waiter.join(0.2)
+    # the only connection is held by the batch
+    assert waiter.is_alive() and not results
+
+    release.set()
+    holder.join(5)
+    waiter.join(5)
+    assert results == [None]
+
+
+def test_connecting_is_retried_with_backoff(tmp_path, sleeps):
+    db = FlakyDatabase(str(tmp_path / 'bot.db'), failures=3, retries=5)
+
+    db.save_post('abc', 'unsolved', 'Sub')
+    assert sleeps == [1, 2, 4]
+    assert db.check_post('abc') == 'unsolved'
+
+
+def test_retries_are_limited(tmp_path, sleeps):
+    db = FlakyDatabase(str(tmp_path / 'bot.db'), failures=10, retries=7)
+
+    with pytest.raises(ConnectionError):
+        db.check_post('abc')
+    # the backoff doesn't grow past the limit
+    assert sleeps == [1, 2, 4, 8, 16, 30, 30]
+    assert db._available.acquire(blocking=False)
+
+
+def test_lost_connection_is_replaced(tmp_path, sleeps):
+    db = FlakyDatabase(str(tmp_path / 'bot.db'))
+    db.save_post('abc', 'unsolved', 'Sub')
+    opened = db.opened
+
+    db.lose_connections()
+    assert db.check_post('abc') == 'unsolved'
+    assert sleeps == [1]
+    assert db.opened == opened + 1
+    assert not db.lost
+
+
+def test_lost_connection_inside_a_batch_is_not_retried(tmp_path, sleeps):
+    db = FlakyDatabase(str(tmp_path / 'bot.db'))
+
+    with pytest.raises(ConnectionError):
+        with db.batch():
+            db.save_post('abc', 'unsolved', 'Sub')
+            db.lost.add(db._state.cnx)
+            db.check_post('abc')
+
+    assert sleeps == []
+    # the writes queued before the connection was lost are gone with it
+    assert db.check_post('abc') is None
+
+
+def test_locked_database_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_helper, '_BUSY_TIMEOUT', 0.05)
+    path = str(tmp_path / 'bot.db')
+    db = SQLiteDatabaseHelper(path)
+
+    # another writer, e.g. a routine in the middle of a batch, holding the write lock
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute('BEGIN IMMEDIATE;')
+    delays = []
+
+    def finish_writing(delay):
+        delays.append(delay)
+        writer.execute('COMMIT;')
+
+    monkeypatch.setattr(database_helper.time, 'sleep', finish_writing)
+
+    db.save_post('abc', 'unsolved', 'Sub')
+    assert delays == [1]
+    assert db.check_post('abc') == 'unsolved'
+
+
+def test_other_errors_are_not_retried(tmp_path, sleeps):
+    path = str(tmp_path / 'bot.db')
+    db = SQLiteDatabaseHelper(path)
+    sqlite3.connect(path).execute('DROP TABLE posts;')
+
+    with pytest.raises(sqlite3.OperationalError):
+        db.check_post('abc')
+    assert sleeps == []
@@ -0,0 +1,82 @@
+"""
+Tests of the dispatch_notifications routine
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from praw.exceptions import RedditAPIException
+import pytest
+
+from routines.dispatch_notifications import dispatch_notifications
+
+from benchmarks.bench_routines import CONFIG, SUBREDDIT
+from benchmarks.fake_reddit import FakeReddit, FakeRedditor
+
+
+@pytest.fixture
+def notification(db):
+    db.save_post('abc', 'solved', SUBREDDIT)
+    db.add_subscriber('abc', "subscriber")
+    db.queue_notifications('abc', "Solved!")
+
+
+@pytest.fixture
+def postponed(db, monkeypatch):
+    """Delays the notifications were postponed by"""
+    delays = []
+    postpone = db.postpone_notification
+
+    def postpone_notification(post_id, username, delay):
+        delays.append(delay)
+        postpone(post_id, username, delay)
+
+    monkeypatch.setattr(db, 'postpone_notification', postpone_notification)
+    return delays
+
+
+def refuse_messages(monkeypatch, error_type, reason):
+    def refuse(self, subject, message):
+        raise RedditAPIException([[error_type, reason, None]])
+
+    monkeypatch.setattr(FakeRedditor, 'message', refuse)
+
+
+def test_notification_is_retried_after_the_rate_limit(db, notification, postponed, monkeypatch):
+    refuse_messages(monkeypatch, 'RATELIMIT', "Take a break for 3 minutes before trying again.")
+    dispatch_notifications(FakeReddit(), db, None, CONFIG)
+
+    assert postponed == [181]
+    assert not db.get_due_notifications(limit=10)
+
+
+def test_refused_notification_is_dropped(db, notification, postponed, monkeypatch):
+    refuse_messages(monkeypatch, 'USER_DOESNT_EXIST', "That user doesn't exist")
+    dispatch_notifications(FakeReddit(), db, None, CONFIG)
+
+    assert not postponed
+    assert not db.get_due_notifications(limit=10)
+
+
+def test_notification_is_sent(db, notification):
+    reddit = FakeReddit()
+    dispatch_notifications(reddit, db, None, CONFIG)
+
+    assert reddit.sent_messages == [("subscriber", "The post you subscribed to was solved!", "Solved!")]
+    assert not db.get_due_notifications(limit=10)
@@ -0,0 +1,64 @@
+"""
+Tests of the points kept by the DatabaseHelper
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+
+def ledger(db):
+    with db.batch():
+        db._cur.execute('SELECT difference FROM points_ledger ORDER BY timestamp, difference;')
+        return [difference for difference, in db._cur.fetchall()]
+
+
+def test_modify_points(db):
+    assert db.modify_points('solver', 'Sub', 2, post_id='abc') == 2
+    assert db.modify_points('solver', 'Sub', 1) == 3
+    assert db.check_points('solver', 'Sub') == 3
+    assert db.get_awarded_posts('solver', 'Sub') == ('abc',)
+
+
+def test_ledger_records_the_clamped_difference(db):
+    # the points can't go below 0, so taking 3 away from 0 changes nothing
+    assert db.modify_points('solver', 'Sub', -3) == 0
+    assert db.modify_points('solver', 'Sub', 1) == 1
+    assert 0 in ledger(db)
+
+    db.recalculate_points('solver', 'Sub')
+    assert db.check_points('solver', 'Sub') == 1
+
+
+def test_recalculating_after_setting_points(db):
+    db.modify_points('solver', 'Sub', -5)
+    db.modify_points('solver', 'Sub', 2)
+    db.set_points('solver', 'Sub', 7)
+
+    db.recalculate_points()
+    assert db.check_points('solver', 'Sub') == 7
+
+
+def test_modifying_points_inside_a_batch(db):
+    with db.batch():
+        db.modify_points('solver', 'Sub', -2)
+        assert db.modify_points('solver', 'Sub', 4) == 4
+
+    assert ledger(db) == [0, 4]
+    db.recalculate_points()
+    assert db.check_points('solver', 'Sub') == 4
@@ -0,0 +1,74 @@
+"""
+Tests of moving posts between statuses
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import pytest
+
+from benchmarks.bench_routines import SUBREDDIT
+
+
+def test_transition_saves_and_flairs(db, rh, reddit):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+
+    assert rh.states.transition(submission, 'unsolved')
+    assert db.check_post(submission.id) == 'unsolved'
+    assert submission.link_flair_template_id == 'unsolved-template'
+    assert [(old, new) for old, new, _ in db.get_post_history(submission.id)] == [(None, 'unsolved')]
+
+    # nothing left to change
+    assert not rh.states.transition(submission, 'unsolved')
+    assert reddit.calls['flair'] == 1
+
+
+def test_status_is_not_saved_if_flairing_fails(db, rh, reddit, monkeypatch):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    monkeypatch.setattr(rh, 'apply_flair', lambda *args, **kwargs: False)
+
+    assert not rh.states.transition(submission, 'unsolved')
+    assert db.check_post(submission.id) is None
+    assert db.get_post_history(submission.id) == ()
+
+
+def test_status_can_be_saved_without_the_flair(db, rh, reddit, monkeypatch):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    monkeypatch.setattr(rh, 'apply_flair', lambda *args, **kwargs: False)
+
+    assert rh.states.transition(submission, 'unsolved', current=None, save_unflaired=True)
+    assert db.check_post(submission.id) == 'unsolved'
+
+
+def test_transition_takes_the_status_from_the_caller(db, rh, reddit, monkeypatch):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    db.save_post(submission.id, 'unsolved', SUBREDDIT)
+    monkeypatch.setattr(db, 'check_post', lambda post_id: pytest.fail("the status was looked up"))
+
+    assert rh.states.transition(submission, 'contested', current='unsolved')
+    assert [(old, new) for old, new, _ in db.get_post_history(submission.id)] == [('unsolved', 'contested')]
+
+
+def test_illegal_transition_is_refused(db, rh, reddit):
+    submission = reddit.add_submission(SUBREDDIT, "op")
+    db.save_post(submission.id, 'solved', SUBREDDIT)
+
+    assert not rh.states.transition(submission, 'unsolved')
+    assert db.check_post(submission.id) == 'solved'
+    assert not reddit.calls['flair']
@@ -0,0 +1,76 @@
+"""
+Tests of the helpers for working with Reddit
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+import gc
+import threading
+
+from helpers.reddit_helper import ThreadLocalReddit
+
+from benchmarks.fake_reddit import FakeReddit
+
+
+def in_thread(function):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(function()))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_every_thread_gets_its_own_instance():
+    created = []
+    reddit = ThreadLocalReddit(lambda: created.append(FakeReddit()) or created[-1])
+
+    main = reddit.instance
+    assert reddit.instance is main
+    # attributes come from the calling thread's instance
+    assert reddit.user is main.user
+
+    holding, release = threading.Event(), threading.Event()
+
+    def hold():
+        instance = reddit.instance
+        holding.set()
+        release.wait(5)
+        return instance
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    holding.wait(5)
+    # the other thread still has its instance, so this one needs a new one too
+    other = in_thread(lambda: reddit.instance)
+    release.set()
+    holder.join()
+
+    assert len({id(instance) for instance in created}) == 3
+    assert main is not other and other in created
+
+
+def test_instances_of_finished_threads_are_reused():
+    created = []
+    reddit = ThreadLocalReddit(lambda: created.append(FakeReddit()) or created[-1])
+
+    first = in_thread(lambda: reddit.instance)
+    gc.collect()
+    assert in_thread(lambda: reddit.instance) is first
+    assert len(created) == 1
@@ -0,0 +1,107 @@
+"""
+Tests of reading Reddit listings as streams
+
+Copyright 2026 Xeoth
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation version 3.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+---
+
+Last modified by Xeoth on 18.10.2026
+                 ^--------^ please change when modifying to comply with the license
+"""
+
+from contextlib import closing
+
+from helpers import stream_helper
+
+
+class Item:
+    def __init__(self, number: int):
+        self.id = f"{number:06}"
+        self.fullname = f"t1_{self.id}"
+        self.created_utc = 1_700_000_000 + number
+
+
+def listing(items):
+    """Listing method over items, newest first"""
+    return lambda limit=None: iter(items if limit is None else items[:limit])
+
+
+def read(db, items, stop_at=None):
+    """Processes a pass of the stream, saving a post for every item in a batch of its own, and returns the items it
+    got"""
+    seen = []
+    with closing(stream_helper.new_items(db, 'test', listing(items), initial_limit=10)) as stream:
+        for item in stream:
+            seen.append(item.id)
+            try:
+                with db.batch():
+                    db.save_post(item.id, 'unsolved', 'Sub')
+                    if item.id == stop_at:
+                        raise RuntimeError("Stopping")
+            except RuntimeError:
+                break
+    return seen
+
+
+def test_items_since_the_position_are_read_oldest_first(db):
+    items = [Item(number) for number in (4, 3, 2, 1)]
+    db.set_stream_position('test', items[-1].fullname)
+
+    assert read(db, items) == ['000002', '000003', '000004']
+    assert db.get_stream_position('test') == items[0].fullname
+    # the first pass had read everything, so the coverage wasn't moved
+    assert db.get_stream_coverage('test') is None
+    assert read(db, items) == []
+
+
+def test_stopping_at_an_item_leaves_it_for_the_next_pass(db):
+    items = [Item(number) for number in (4, 3, 2, 1)]
+    db.set_stream_position('test', items[-1].fullname)
+
+    assert read(db, items, stop_at='000003') == ['000002', '000003']
+    assert db.get_stream_position('test') == Item(2).fullname
+    # what was written for the item it stopped at is rolled back with its batch
+    assert db.check_post('000002') == 'unsolved'
+    assert db.check_post('000003') is None
+
+    assert read(db, items) == ['000003', '000004']
+
+
+def test_first_pass_moves_the_coverage(db):
+    items = [Item(number) for number in (4, 3, 2, 1)]
+
+    assert read(db, items, stop_at='000001') == ['000001']
+    # the item it stopped at would've started the coverage
+    assert db.get_stream_coverage('test') is None
+
+    assert read(db, items) == ['000001', '000002', '000003', '000004']
+    assert db.get_stream_coverage('test') == Item(1).created_utc
+
+
+def test_position_is_saved_every_few_items(db, monkeypatch):
+    monkeypatch.setattr(stream_helper, '_SAVE_EVERY', 2)
+    items = [Item(number) for number in (5, 4, 3, 2, 1)]
+    db.set_stream_position('test', items[-1].fullname)
+    positions = []
+    set_stream_position = db.set_stream_position
+
+    def record(stream, fullname, covered_since=None):
+        positions.append(fullname)
+        set_stream_position(stream, fullname, covered_since)
+
+    monkeypatch.setattr(db, 'set_stream_position', record)
+    read(db, items)
+
+    assert positions == [Item(3).fullname, Item(5).fullname]
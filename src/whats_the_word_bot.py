@@ -16,24 +16,35 @@
 #
 # ---
 #
-# Last modified by Xeoth on 22.02.2021
+# Last modified by Xeoth on 18.10.2026
 #                  ^--------^ please change when modifying to comply with the license
 
+import asyncio
+from functools import partial
 import logging
 from os import getenv
+import signal
 import sys
 
 import praw
-import yaml
 from dotenv import load_dotenv
 
-from helpers import database_helper, reddit_helper
-from routines import check_new, check_comments, check_contested, check_unsolved, check_messages
+from helpers import (config_helper, database_helper, metrics_helper, migration_helper, ratelimit_helper,
+                     reddit_helper, scheduler_helper, snapshot_helper)
+from routines import (check_new, check_comments, check_contested, check_unsolved, check_messages, dispatch_notifications,
+                      archive_old_posts)
 
 load_dotenv()
 
-with open('config.yaml') as file:
-    config = yaml.safe_load(file)
+# the config is checked as a whole on startup, so a missing setting doesn't surface in the middle of a routine
+try:
+    config_store = config_helper.ConfigStore.from_file('config.yaml')
+except config_helper.ConfigError as e:
+    sys.exit(f"The config is invalid. {e}")
+config = config_store.current
+
+# the first subreddit is the bot's "home", which names it and gets rows from before it ran in several subreddits
+home_subreddit = config.home_subreddit
 
 REDDIT_CLIENT_ID = getenv('WTW_REDDIT_ID')
 REDDIT_CLIENT_SECRET = getenv('WTW_REDDIT_SECRET')
@@ -43,9 +54,19 @@ REDDIT_PASSWORD = getenv('WTW_REDDIT_PASSWORD')
 logging.basicConfig(level=logging.INFO,
                     format="[%(asctime)s] %(module)s | %(levelname)s: %(message)s")
 
-reddit = praw.Reddit(client_id=REDDIT_CLIENT_ID, client_secret=REDDIT_CLIENT_SECRET,
-                     user_agent=f"{config['subreddit']}'s WhatsTheWordBot",
-                     username=REDDIT_USERNAME, password=REDDIT_PASSWORD)
+# every request waits for its turn, so sweeps and notifications don't eat up the requests new posts need
+request_budget = ratelimit_helper.RequestBudget(
+    reserves={ratelimit_helper.Priority[name.upper()]: reserve
+              for name, reserve in config.rate_limit.reserves.items()}
+)
+
+# the routines run in threads of their own and PRAW isn't thread-safe, so every thread gets its own instance. they
+# all share the budget, as Reddit counts the requests per account
+reddit = reddit_helper.ThreadLocalReddit(partial(
+    praw.Reddit, client_id=REDDIT_CLIENT_ID, client_secret=REDDIT_CLIENT_SECRET,
+    user_agent=f"{home_subreddit}'s WhatsTheWordBot", username=REDDIT_USERNAME, password=REDDIT_PASSWORD,
+    requestor_class=ratelimit_helper.BudgetedRequestor, requestor_kwargs={"budget": request_budget}
+))
 
 if sentry_key := getenv('SENTRY_KEY'):
     # we only want to use sentry if we have a key
@@ -67,27 +88,93 @@ if __name__ == "__main__":
     # After 24 hours, "unsolved" -> "abandoned" (check if solved first) (unsolved means no new comments; otherwise would be "contested")
     # After 48 hours, "contested" -> "unknown" (check if solved first) (contested means someone has commented)
     
-    db = database_helper.DatabaseHelper(
+    # MySQL or SQLite, depending on the config
+    db = database_helper.from_config(
+        config,
         username=getenv("WTW_DB_USERNAME"),
         password=getenv("WTW_DB_PASSWORD"),
         hostname=getenv("WTW_DB_IP")
     )
+    logging.info(f"Applied {migration_helper.migrate(db)} schema migrations.")
+    if assigned := db.assign_subreddit(home_subreddit):
+        logging.info(f"Assigned {assigned} rows from before multi-subreddit support to r/{home_subreddit}.")
+    logging.info(f"Preloaded {db.preload_posts()} posts into the cache.")
     
     rh = reddit_helper.RedditHelper(
         db=db,
-        config=config,
+        config=config_store,
         reddit=reddit
     )
     
-    config["mods"] = [mod.name for mod in reddit.subreddit(config["subreddit"]).moderator()]
-
-    while True:
-        try:
-            check_unsolved.check_unsolved(reddit, db, rh, config)
-            check_new.check_new(reddit, db, rh, config)
-            check_contested.check_contested(reddit, db, rh, config)
-            check_comments.check_comments(reddit, db, rh, config)
-            check_messages.check_messages(reddit, db, rh, config)
-        except KeyboardInterrupt:
-            logging.info("KeyboardInterrupt detected; quitting.")
-            sys.exit(0)
+    # a restart picks up the moderators, cached posts, deadlines and flairs from the last run instead of fetching
+    # them all again
+    snapshot = snapshot_helper.WarmStartSnapshot(config.snapshot.path, db, rh, config.snapshot.interval)
+    snapshot.load()
+
+    # moderators are fetched again in the background, so new ones are recognised without a restart
+    if rh.identity.stale:
+        rh.identity.refresh()
+    rh.identity.start()
+
+    # other processes can share the database; only the leader follows the streams and sends notifications, while
+    # the aging sweeps are split between all of them
+    rh.workers.renew()
+    rh.workers.start()
+
+    # the aging sweeps wake up when the next post is due, instead of scanning the posts table. after a warm start,
+    # only the posts saved since the snapshot are loaded
+    rh.deadlines.sync(db)
+    logging.info(f"Loaded deadlines of {len(rh.deadlines)} posts waiting to age.")
+
+    if config.metrics.port:
+        metrics_helper.serve(config.metrics.host, config.metrics.port)
+
+    # every routine runs on its own interval, so slow sweeps don't hold up flairing new posts and comments
+    scheduler = scheduler_helper.RoutineScheduler(max_concurrent=config.scheduler.max_concurrent)
+    intervals = config.scheduler.intervals
+
+    # routine -> status of the posts it ages, for the aging sweeps, which are split between the processes instead of
+    # running on the leader only
+    aging = {check_unsolved.check_unsolved: 'unsolved', check_contested.check_contested: 'contested'}
+
+    for routine in (check_new.check_new, check_comments.check_comments, check_messages.check_messages,
+                    check_unsolved.check_unsolved, check_contested.check_contested,
+                    dispatch_notifications.dispatch_notifications, archive_old_posts.archive_old_posts):
+        priority = ratelimit_helper.Priority[config.rate_limit.priorities[routine.__name__].upper()]
+        # every run gets the config current when it starts, so a reload takes effect from the next one
+        scheduled = ratelimit_helper.with_priority(priority, config_store.passing_current(routine))
+
+        if routine in aging:
+            scheduler.add(scheduled, intervals[routine.__name__], reddit, db, rh,
+                          next_due=partial(rh.deadlines.next_deadline, aging[routine]))
+        else:
+            scheduler.add(rh.workers.leader_only(scheduled), intervals[routine.__name__], reddit, db, rh)
+
+    # a post due sooner than the one a sweep is waiting for (e.g. from a subreddit with a shorter time) wakes it up
+    sweeps = {status: routine.__name__ for routine, status in aging.items()}
+    rh.deadlines.on_earlier = lambda status: scheduler.wake(sweeps[status])
+
+    def on_reload(old: config_helper.BotConfig, new: config_helper.BotConfig) -> None:
+        # posts already waiting to age get deadlines following the new aging times
+        if any(sub_config.aging != old.subreddits[name].aging for name, sub_config in new.subreddits.items()):
+            rh.deadlines.resync()
+            for routine_name in sweeps.values():
+                scheduler.wake(routine_name)
+
+    # the config is reloaded on SIGHUP or when the file changes, while the routines keep running
+    config_store.on_reload = on_reload
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, config_store.request_reload)
+    config_store.start()
+
+    # SIGTERM (e.g. from systemd or Docker) shuts down like Ctrl+C, so the snapshot gets saved
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    snapshot.start()
+
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        logging.info("KeyboardInterrupt detected; quitting.")
+        rh.workers.stop()
+        snapshot.stop()
+        sys.exit(0)